@@ -0,0 +1,190 @@
+"""
+Opt-in per-request instrumentation for the hatchery project.
+
+RequestMetricsMiddleware records, for every request, the SQL query count, total
+DB time, template render time, wall time and response size, keyed by the
+resolved URL name. Samples are kept in a rolling window per URL name in the
+Django cache so the staff JSON endpoint and the ``request_metrics`` management
+command report the same numbers. With the default local-memory cache each worker
+process keeps its own window; point REQUEST_METRICS_CACHE at a shared cache to
+aggregate across workers.
+
+Settings:
+    REQUEST_METRICS_ENABLED       turn the middleware on (off by default)
+    REQUEST_METRICS_WINDOW        samples kept per URL name
+    REQUEST_METRICS_CACHE         cache alias used for the rolling window
+    REQUEST_QUERY_BUDGETS         {url_name: max queries per request}
+    REQUEST_QUERY_BUDGET_STRICT   raise QueryBudgetExceeded instead of logging
+"""
+
+import contextvars
+import logging
+import math
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Template
+
+logger = logging.getLogger(__name__)
+
+UNRESOLVED = "<unresolved>"
+PERCENTILES = (50, 95, 99)
+METRIC_FIELDS = ("queries", "db_ms", "template_ms", "total_ms", "bytes")
+
+_CACHE_PREFIX = "request_metrics:"
+_INDEX_KEY = _CACHE_PREFIX + "__index__"
+
+_current = contextvars.ContextVar("request_metrics", default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode when a view issues more queries than its budget."""
+
+
+class _RequestSample:
+    """Counters for the request currently being handled."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # Installed with connection.execute_wrapper() for the request's lifetime.
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - started
+
+
+_original_template_render = None
+
+
+def _install_template_timer():
+    """Wrap Template.render once so top-level renders are timed per request.
+
+    Nested renders ({% include %}, {% extends %}) run inside the outer render and
+    are not counted twice.
+    """
+    global _original_template_render
+    if _original_template_render is not None:
+        return
+    _original_template_render = Template.render
+
+    def timed_render(self, context):
+        sample = _current.get()
+        if sample is None or sample.template_depth:
+            return _original_template_render(self, context)
+        sample.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return _original_template_render(self, context)
+        finally:
+            sample.template_depth -= 1
+            sample.template_time += time.perf_counter() - started
+
+    Template.render = timed_render
+
+
+def _cache():
+    return caches[getattr(settings, "REQUEST_METRICS_CACHE", "default")]
+
+
+def record_sample(url_name, sample):
+    """Append a sample dict to the rolling window for url_name."""
+    cache = _cache()
+    window = getattr(settings, "REQUEST_METRICS_WINDOW", 500)
+    key = _CACHE_PREFIX + url_name
+    samples = cache.get(key) or []
+    samples.append(sample)
+    cache.set(key, samples[-window:], None)
+    names = cache.get(_INDEX_KEY) or []
+    if url_name not in names:
+        names.append(url_name)
+        cache.set(_INDEX_KEY, names, None)
+
+
+def reset_samples():
+    cache = _cache()
+    names = cache.get(_INDEX_KEY) or []
+    cache.delete_many([_CACHE_PREFIX + name for name in names] + [_INDEX_KEY])
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize():
+    """Return per-URL p50/p95/p99 for every metric, slowest p95 wall time first."""
+    cache = _cache()
+    rows = []
+    for name in cache.get(_INDEX_KEY) or []:
+        samples = cache.get(_CACHE_PREFIX + name) or []
+        if not samples:
+            continue
+        row = {"url_name": name, "count": len(samples)}
+        for field in METRIC_FIELDS:
+            values = sorted(s[field] for s in samples if s.get(field) is not None)
+            if not values:
+                row[field] = None
+                continue
+            row[field] = {f"p{pct}": _percentile(values, pct) for pct in PERCENTILES}
+        row["query_budget"] = getattr(settings, "REQUEST_QUERY_BUDGETS", {}).get(name)
+        rows.append(row)
+    rows.sort(key=lambda row: row["total_ms"]["p95"] if row["total_ms"] else 0, reverse=True)
+    return rows
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_METRICS_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        _install_template_timer()
+
+    def __call__(self, request):
+        sample = _RequestSample()
+        token = _current.set(sample)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(sample))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total_time = time.perf_counter() - started
+
+        match = getattr(request, "resolver_match", None)
+        url_name = (match.view_name if match else None) or UNRESOLVED
+        size = None if response.streaming else len(response.content)
+        record_sample(url_name, {
+            "queries": sample.queries,
+            "db_ms": round(sample.db_time * 1000, 3),
+            "template_ms": round(sample.template_time * 1000, 3),
+            "total_ms": round(total_time * 1000, 3),
+            "bytes": size,
+        })
+        self._check_budget(request, url_name, sample.queries)
+        return response
+
+    def _check_budget(self, request, url_name, queries):
+        budget = getattr(settings, "REQUEST_QUERY_BUDGETS", {}).get(url_name)
+        if budget is None or queries <= budget:
+            return
+        message = (
+            f"{request.method} {request.path} ({url_name}) issued {queries} queries; "
+            f"budget is {budget}."
+        )
+        if getattr(settings, "REQUEST_QUERY_BUDGET_STRICT", False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -48,11 +48,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'hatchery.request_metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'pct.auth.ProfileMiddleware',
+    'pct.bans.BanMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'allauth.account.middleware.AccountMiddleware',
@@ -62,10 +65,83 @@ MIDDLEWARE = [
 
 SITE_ID = 1
 
+# Each worker keeps its own in-memory cache, so reading a cached snapshot costs
+# no query. Set REDIS_URL (with redis-py installed) to share one cache across
+# workers instead, which makes invalidation immediate everywhere.
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Per-request query/timing instrumentation (hatchery/request_metrics.py).
+# Off unless REQUEST_METRICS=1; the middleware removes itself when disabled.
+REQUEST_METRICS_ENABLED = os.getenv("REQUEST_METRICS") == "1"
+REQUEST_METRICS_WINDOW = 500
+REQUEST_METRICS_CACHE = "default"
+
+# Maximum SQL queries per request, keyed by URL name. Exceeding a budget logs a
+# warning, or raises QueryBudgetExceeded when REQUEST_QUERY_BUDGET_STRICT is set.
+REQUEST_QUERY_BUDGETS = {
+    "home": 15,
+    "training-list": 12,
+    "schedule-builder": 30,
+    "events": 15,
+}
+REQUEST_QUERY_BUDGET_STRICT = False
+
+# Cached snapshots. Saves and deletes invalidate each one through signals
+# (pct/signals.py), but only in the worker that handled the write unless the
+# cache is shared; the short timeouts bound how long other workers serve a
+# stale copy.
+
+# Active semesters, open hours and holidays (pct/semester_calendar.py).
+SEMESTER_CALENDAR_CACHE = "default"
+SEMESTER_CALENDAR_TIMEOUT = 60
+
+# Certification catalog for the staff search (pct/certification_catalog.py).
+CERTIFICATION_CATALOG_CACHE = "default"
+CERTIFICATION_CATALOG_TIMEOUT = 60
+
+# Active room auto-approval rules (pct/auto_approval.py), read on every room request.
+AUTO_APPROVAL_RULES_CACHE = "default"
+AUTO_APPROVAL_RULES_TIMEOUT = 60
+
+# Staff user search (pct/user_search.py). None picks the backend for the database:
+# a GIN tsvector index on PostgreSQL, an FTS5 table on SQLite, icontains otherwise.
+USER_SEARCH_BACKEND = None
+
+# Buffered ActivityLog writes (pct/activity.py). Entries are queued on commit and
+# bulk-inserted at the end of each request. A FLUSH_INTERVAL above 0 moves the
+# insert to a background thread that runs every FLUSH_INTERVAL seconds or once
+# BATCH_SIZE are waiting, at the price of losing what is queued when a worker
+# is killed. Past MAX_BUFFER queued entries, writes fall back to synchronous.
+ACTIVITY_LOG_BUFFERED = os.getenv("ACTIVITY_LOG_BUFFERED", "1") == "1"
+ACTIVITY_LOG_BATCH_SIZE = 100
+ACTIVITY_LOG_FLUSH_INTERVAL = float(os.getenv("ACTIVITY_LOG_FLUSH_INTERVAL", "0"))
+ACTIVITY_LOG_MAX_BUFFER = 5000
+
+# `manage.py archive_activity_log` moves entries older than RETENTION_DAYS into
+# gzip JSONL files (one per month) under ARCHIVE_DIR and deletes them. There is
+# no default: the rows are gone once archived, so ARCHIVE_DIR must be durable
+# storage (the app's own filesystem on Render is reset on every deploy), and
+# the command refuses to run until it is set.
+ACTIVITY_LOG_RETENTION_DAYS = 365
+ACTIVITY_LOG_ARCHIVE_DIR = os.getenv("ACTIVITY_LOG_ARCHIVE_DIR")
+
 
 AUTHENTICATION_BACKENDS = [
-    "django.contrib.auth.backends.ModelBackend",  # default
-    "allauth.account.auth_backends.AuthenticationBackend",
+    # The stock ModelBackend and allauth backend, loading the profile with the user
+    "pct.auth.ModelBackend",
+    "pct.auth.AuthenticationBackend",
 ]
      
 LOGIN_REDIRECT_URL = "/home/"
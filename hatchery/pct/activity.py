@@ -0,0 +1,260 @@
+"""
+Buffered ActivityLog writes.
+
+record() stamps an entry with the current time and queues it once the
+surrounding transaction commits, so a rolled-back booking or grant leaves no
+log row behind. Queued entries are written with bulk_create:
+
+* at the end of each request, after the response is sent, when
+  ACTIVITY_LOG_FLUSH_INTERVAL is 0 (the default);
+* otherwise by a background flusher thread every ACTIVITY_LOG_FLUSH_INTERVAL
+  seconds, or as soon as ACTIVITY_LOG_BATCH_SIZE entries are waiting;
+* at interpreter exit.
+
+If a batch insert fails the entries are retried one at a time, and if the
+buffer grows past ACTIVITY_LOG_MAX_BUFFER because flushes keep failing or
+falling behind, new entries are written synchronously instead of queued.
+With a flusher thread, entries still waiting are lost if the process is
+killed, so it is opt-in. ACTIVITY_LOG_BUFFERED = False writes every entry
+immediately. A forked child drops the buffer it inherits; those entries are
+the parent's to write.
+
+feed() pages through the log newest first with a (created_at, id) keyset
+cursor, so every page is an index range scan however deep it is.
+archive_before() moves old rows into gzip JSONL files, one per month, in
+bounded batches (see the archive_activity_log command).
+"""
+
+import atexit
+import base64
+import gzip
+import json
+import logging
+import os
+import threading
+from datetime import datetime, time, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import DatabaseError, connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_buffer = []
+_buffer_pid = os.getpid()
+_flusher = None
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def record(user, action, description):
+    """Log action for user once the current transaction commits."""
+    entry = ActivityLog(user_id=user.pk, action=action, description=description, created_at=timezone.now())
+    if not _setting("ACTIVITY_LOG_BUFFERED", True):
+        _write_each([entry])
+        return
+    transaction.on_commit(lambda: _enqueue(entry))
+
+
+def _enqueue(entry):
+    flusher = _ensure_flusher()
+    with _lock:
+        overflowing = len(_buffer) >= _setting("ACTIVITY_LOG_MAX_BUFFER", 5000)
+        if not overflowing:
+            _buffer.append(entry)
+            queued = len(_buffer)
+    if overflowing:
+        _write_each([entry])
+        return
+    if flusher and queued >= _setting("ACTIVITY_LOG_BATCH_SIZE", 100):
+        flusher.wake.set()
+
+
+def _claim_buffer():
+    """Drop entries inherited from the parent process after a fork."""
+    global _buffer_pid
+    pid = os.getpid()
+    if _buffer_pid != pid:
+        with _lock:
+            if _buffer_pid != pid:
+                del _buffer[:]
+                _buffer_pid = pid
+
+
+def pending():
+    """Number of entries waiting to be written."""
+    with _lock:
+        return len(_buffer)
+
+
+def flush():
+    """Write every queued entry now. Returns how many rows were written."""
+    _claim_buffer()
+    with _lock:
+        entries = _buffer[:]
+        del _buffer[:]
+    if not entries:
+        return 0
+    try:
+        ActivityLog.objects.bulk_create(entries, batch_size=_setting("ACTIVITY_LOG_BATCH_SIZE", 100))
+        return len(entries)
+    except DatabaseError:
+        logger.warning("Batch insert of %s activity log entries failed; writing them one by one", len(entries))
+        return _write_each(entries)
+
+
+def _write_each(entries):
+    written = 0
+    for entry in entries:
+        try:
+            entry.save(force_insert=True)
+            written += 1
+        except DatabaseError:
+            logger.exception("Dropping activity log entry for user %s (%s)", entry.user_id, entry.action)
+    return written
+
+
+class _Flusher(threading.Thread):
+    def __init__(self, interval):
+        super().__init__(name="activity-log-flusher", daemon=True)
+        self.interval = interval
+        self.pid = os.getpid()
+        self.wake = threading.Event()
+
+    def run(self):
+        while True:
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            try:
+                flush()
+            except Exception:
+                logger.exception("Activity log flush failed")
+            finally:
+                # This thread's connection; the request threads keep their own.
+                connections.close_all()
+
+
+def _ensure_flusher():
+    """Start the flusher thread for this process, or return None if it is disabled."""
+    global _flusher
+    _claim_buffer()
+    interval = _setting("ACTIVITY_LOG_FLUSH_INTERVAL", 0)
+    if not interval:
+        return None
+    # A thread started before a fork doesn't exist in the child.
+    if _flusher is None or _flusher.pid != os.getpid() or not _flusher.is_alive():
+        with _lock:
+            if _flusher is None or _flusher.pid != os.getpid() or not _flusher.is_alive():
+                _flusher = _Flusher(interval)
+                _flusher.start()
+    return _flusher
+
+
+def _flush_after_request(sender, **kwargs):
+    if _setting("ACTIVITY_LOG_FLUSH_INTERVAL", 0) or not pending():
+        return
+    flush()
+
+
+request_finished.connect(_flush_after_request, dispatch_uid="pct.activity.flush_after_request")
+atexit.register(flush)
+
+
+def encode_cursor(entry):
+    raw = f"{entry.created_at.isoformat()}|{entry.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Return (created_at, id) from a cursor, or None if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, pk = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def feed(user_id=None, action=None, date_from=None, date_to=None, cursor=None, limit=50):
+    """Return (entries, next_cursor) for one page of the log, newest first.
+
+    date_from and date_to are inclusive local dates. next_cursor is None on
+    the last page.
+    """
+    entries = ActivityLog.objects.select_related("user").order_by("-created_at", "-id")
+    if user_id is not None:
+        entries = entries.filter(user_id=user_id)
+    if action:
+        entries = entries.filter(action=action)
+    if date_from:
+        entries = entries.filter(created_at__gte=timezone.make_aware(datetime.combine(date_from, time.min)))
+    if date_to:
+        entries = entries.filter(
+            created_at__lt=timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min))
+        )
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        created_at, pk = position
+        entries = entries.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+    page = list(entries[: limit + 1])
+    if len(page) > limit:
+        return page[:limit], encode_cursor(page[limit - 1])
+    return page, None
+
+
+def archive_path(directory, month):
+    return Path(directory) / f"activity-log-{month}.jsonl.gz"
+
+
+def archive_before(cutoff, directory, batch_size=1000, max_batches=None):
+    """Move entries older than cutoff into per-month gzip JSONL files.
+
+    Each batch is appended to its month's file (as a new gzip member) and
+    fsynced before the rows are deleted, so a crash between the two can only
+    leave duplicates in the archive, never lose rows. Returns the number of
+    rows archived.
+    """
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    archived = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        rows = list(
+            ActivityLog.objects.filter(created_at__lt=cutoff)
+            .order_by("created_at", "id")
+            .values("id", "user_id", "user__username", "action", "description", "created_at")[:batch_size]
+        )
+        if not rows:
+            break
+        by_month = {}
+        for row in rows:
+            created_at = timezone.localtime(row["created_at"])
+            by_month.setdefault(created_at.strftime("%Y-%m"), []).append(
+                {
+                    "id": row["id"],
+                    "user_id": row["user_id"],
+                    "username": row["user__username"],
+                    "action": row["action"],
+                    "description": row["description"],
+                    "created_at": created_at.isoformat(),
+                }
+            )
+        for month, records in by_month.items():
+            with open(archive_path(directory, month), "ab") as handle:
+                with gzip.GzipFile(fileobj=handle, mode="wb") as archive:
+                    for record in records:
+                        archive.write(json.dumps(record).encode() + b"\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+        with transaction.atomic():
+            ActivityLog.objects.filter(id__in=[row["id"] for row in rows]).delete()
+        archived += len(rows)
+        batches += 1
+    return archived
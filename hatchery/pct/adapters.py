@@ -1,6 +1,5 @@
 from django.core.exceptions import ValidationError
 from allauth.socialaccount.adapter import DefaultSocialAccountAdapter
-from .models import Profile
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,12 +17,9 @@ class BCOnlySocialAccountAdapter(DefaultSocialAccountAdapter):
         return email
     
     def save_user(self, request, sociallogin, form=None):
-        """Override to ensure Profile is created properly after user is saved."""
+        """Log failures to save a new Google user; pct.signals gives it a Profile."""
         try:
-            user = super().save_user(request, sociallogin, form)
-            # Ensure Profile exists for the user
-            Profile.objects.get_or_create(user=user)
-            return user
+            return super().save_user(request, sociallogin, form)
         except Exception as e:
             logger.error(f"Error saving user in social account adapter: {e}", exc_info=True)
             raise
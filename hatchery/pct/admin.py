@@ -1,12 +1,19 @@
 from django.contrib import admin
+from django.core.exceptions import ValidationError
+from django.forms import BaseInlineFormSet
+from . import booking
 from .models import (
     Profile,
     Certification,
+    CertificationTemplate,
     CertificationType,
     CertificationLevel,
     Training,
+    TrainingSeat,
     TrainingCancellationRequest,
     RoomReservation,
+    RoomReservationSeries,
+    AutoApprovalRule,
     ScheduleWeek,
     Availability,
     Shift,
@@ -24,12 +31,20 @@ class ProfileAdmin(admin.ModelAdmin):
     list_filter = ['role']
     search_fields = ['user__username', 'first_name', 'last_name', 'email']
 
-@admin.register(Certification)
-class CertificationAdmin(admin.ModelAdmin):
+@admin.register(CertificationTemplate)
+class CertificationTemplateAdmin(admin.ModelAdmin):
     list_display = ['type', 'level', 'created_at']
     list_filter = ['type', 'level']
     search_fields = ['type__name']
 
+@admin.register(Certification)
+class CertificationAdmin(admin.ModelAdmin):
+    list_display = ['profile', 'type', 'level', 'created_at']
+    list_filter = ['type', 'level']
+    list_select_related = ['profile__user', 'type', 'level']
+    search_fields = ['type__name', 'profile__user__username']
+    autocomplete_fields = ['profile']
+
 @admin.register(CertificationType)
 class CertificationTypeAdmin(admin.ModelAdmin):
     list_display = ['name', 'description']
@@ -40,18 +55,42 @@ class CertificationLevelAdmin(admin.ModelAdmin):
     list_display = ['level']
     search_fields = ['level']
 
+class TrainingSeatFormSet(BaseInlineFormSet):
+    def clean(self):
+        super().clean()
+        kept = [
+            form for form in self.forms
+            if form.cleaned_data and not form.cleaned_data.get("DELETE")
+        ]
+        if len(kept) > self.instance.capacity:
+            raise ValidationError(f"This training only has {self.instance.capacity} seat(s).")
+
+
+class TrainingSeatInline(admin.TabularInline):
+    model = TrainingSeat
+    formset = TrainingSeatFormSet
+    extra = 0
+    autocomplete_fields = ("profile",)
+    readonly_fields = ("created_at",)
+
+
 @admin.register(Training)
 class TrainingAdmin(admin.ModelAdmin):
-    list_display = ("name", "machine", "level", "staff", "student")
-    search_fields = ("name", "machine", "staff__user__username", "student__user__username")
-    autocomplete_fields = ("staff", "student")
+    list_display = ("name", "machine", "level", "staff", "capacity", "seats_taken", "seats_held")
+    search_fields = ("name", "machine", "staff__user__username", "seats__profile__user__username")
+    autocomplete_fields = ("staff",)
+    readonly_fields = ("seats_taken", "seats_held")
+    inlines = [TrainingSeatInline]
+
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
         if db_field.name == "staff":
             kwargs["queryset"] = Profile.objects.filter(role="staff")
-        elif db_field.name == "student":
-            kwargs["queryset"] = Profile.objects.filter(role__in=Profile.USER_ROLES)
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        booking.recount_seats(form.instance)
+
 
 @admin.register(TrainingCancellationRequest)
 class TrainingCancellationRequestAdmin(admin.ModelAdmin):
@@ -80,6 +119,41 @@ class RoomReservationAdmin(admin.ModelAdmin):
         "affiliation",
     )
     autocomplete_fields = ("requester", "reviewed_by")
+    raw_id_fields = ("series",)
+
+
+@admin.register(RoomReservationSeries)
+class RoomReservationSeriesAdmin(admin.ModelAdmin):
+    list_display = (
+        "room",
+        "weekdays",
+        "start_time",
+        "end_time",
+        "first_date",
+        "last_date",
+        "requester",
+        "status",
+    )
+    list_filter = ("room", "status", "semester")
+    search_fields = (
+        "requester__user__username",
+        "affiliation",
+    )
+    autocomplete_fields = ("requester", "reviewed_by")
+
+
+@admin.register(AutoApprovalRule)
+class AutoApprovalRuleAdmin(admin.ModelAdmin):
+    list_display = (
+        "name",
+        "room",
+        "max_duration",
+        "requester_role",
+        "allow_exclusive",
+        "require_open_hours",
+        "is_active",
+    )
+    list_filter = ("is_active", "room", "requester_role")
 
 
 @admin.register(ScheduleWeek)
@@ -0,0 +1,93 @@
+"""
+Load the signed-in user's Profile with the user, once per request.
+
+The backends below fetch the session's user with select_related("profile"),
+so request.user.profile costs no query of its own however many times a view,
+its decorators and its templates read it. ProfileMiddleware points sessions
+created under the stock backends at these ones, so nobody is logged out by
+the switch.
+
+role_required() replaces the login_required + user_passes_test pairs that
+gated views on profile.role.
+"""
+
+from functools import wraps
+
+from allauth.account import auth_backends as allauth_backends
+from django.contrib import auth
+from django.contrib.auth import backends as django_backends
+from django.contrib.auth.views import redirect_to_login
+from django.utils.functional import SimpleLazyObject
+
+from .models import Profile
+
+# Session backend paths written before these backends existed.
+_LEGACY_BACKENDS = {
+    "django.contrib.auth.backends.ModelBackend": "pct.auth.ModelBackend",
+    "allauth.account.auth_backends.AuthenticationBackend": "pct.auth.AuthenticationBackend",
+}
+
+
+class ProfileBackendMixin:
+    def get_user(self, user_id):
+        user = (
+            django_backends.UserModel._default_manager.select_related("profile").filter(pk=user_id).first()
+        )
+        return user if user is not None and self.user_can_authenticate(user) else None
+
+
+class ModelBackend(ProfileBackendMixin, django_backends.ModelBackend):
+    pass
+
+
+class AuthenticationBackend(ProfileBackendMixin, allauth_backends.AuthenticationBackend):
+    pass
+
+
+def _get_user(request):
+    legacy = _LEGACY_BACKENDS.get(request.session.get(auth.BACKEND_SESSION_KEY))
+    if legacy:
+        request.session[auth.BACKEND_SESSION_KEY] = legacy
+    return auth.get_user(request)
+
+
+class ProfileMiddleware:
+    """Resolve request.user through the profile-joining backends.
+
+    Goes right after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.user = SimpleLazyObject(lambda: _get_user(request))
+        return self.get_response(request)
+
+
+def profile_for(request):
+    """The signed-in user's Profile, created if the user somehow has none."""
+    try:
+        return request.user.profile
+    except Profile.DoesNotExist:
+        profile, _ = Profile.objects.get_or_create(user=request.user)
+        request.user.profile = profile
+        return profile
+
+
+def role_required(*roles):
+    """Only let signed-in users whose profile role is one of roles reach the view.
+
+    Everyone else is sent to the login page, as user_passes_test did.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapped(request, *args, **kwargs):
+            if request.user.is_authenticated and profile_for(request).role in roles:
+                return view_func(request, *args, **kwargs)
+            return redirect_to_login(request.get_full_path())
+
+        return wrapped
+
+    return decorator
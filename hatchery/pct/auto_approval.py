@@ -0,0 +1,141 @@
+"""
+Automatic approval of uncontroversial room requests.
+
+An active AutoApprovalRule approves a request that matches all of its
+conditions: its room (or any), at most max_duration long, a requester with its
+role (or any), non-exclusive unless the rule allows exclusive use, and inside
+the semester's open hours on a non-holiday unless the rule waives that. No
+rule approves a request that conflicts with anything on the room's timeline
+(see pct.room_timeline).
+
+The rules are kept in each worker's cache next to the semester calendar, so
+matching a request costs no queries; only the conflict check reads the
+database. apply() runs at submission time, and skips that check when the
+form's validation (RoomReservation.clean) has just run it; reevaluate_pending() re-checks the
+whole pending queue (after a rule change, say) with one batched conflict check
+and approves what now qualifies in one transaction. Weekly series are left to
+staff, who approve them as a whole.
+
+Saving or deleting an AutoApprovalRule invalidates the cached rules (see
+pct.signals).
+"""
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+
+from . import room_timeline, semester_calendar
+from .models import AutoApprovalRule, RoomReservation
+
+CACHE_KEY = "pct:auto_approval_rules"
+
+
+def _cache():
+    return caches[getattr(settings, "AUTO_APPROVAL_RULES_CACHE", "default")]
+
+
+def get_rules():
+    """Return the active rules, loading them if they aren't cached."""
+    rules = _cache().get(CACHE_KEY)
+    if rules is None:
+        rules = list(AutoApprovalRule.objects.filter(is_active=True).order_by("pk"))
+        _cache().set(CACHE_KEY, rules, getattr(settings, "AUTO_APPROVAL_RULES_TIMEOUT", 60))
+    return rules
+
+
+def invalidate():
+    """Drop the cached rules now and again once the current transaction commits."""
+    _cache().delete(CACHE_KEY)
+    transaction.on_commit(lambda: _cache().delete(CACHE_KEY))
+
+
+def _within_open_hours(reservation, calendar):
+    start = timezone.localtime(reservation.start_time)
+    end = timezone.localtime(reservation.end_time)
+    semester = calendar.semester_for_date(start.date())
+    return (
+        semester is not None
+        and not calendar.is_holiday(semester, start.date())
+        and calendar.within_open_hours(semester, start, end)
+    )
+
+
+def matching_rule(reservation, role, rules=None, calendar=None):
+    """Return the first rule whose conditions reservation meets, ignoring overlaps, or None."""
+    rules = get_rules() if rules is None else rules
+    if not rules:
+        return None
+    calendar = calendar or semester_calendar.get_calendar()
+    duration = reservation.end_time - reservation.start_time
+    role = (role or "").lower()
+    open_hours = None
+    for rule in rules:
+        if rule.room and rule.room != reservation.room:
+            continue
+        if duration > rule.max_duration:
+            continue
+        if rule.requester_role and rule.requester_role != role:
+            continue
+        if reservation.is_exclusive_request and not rule.allow_exclusive:
+            continue
+        if rule.require_open_hours:
+            if open_hours is None:
+                open_hours = _within_open_hours(reservation, calendar)
+            if not open_hours:
+                continue
+        return rule
+    return None
+
+
+def apply(reservation, role, conflicts_checked=False):
+    """Approve an unsaved reservation in place if a rule covers it; return the rule or None.
+
+    Pass conflicts_checked=True when reservation has just passed full_clean(),
+    which ran the same room timeline check.
+    """
+    rule = matching_rule(reservation, role)
+    if rule is None:
+        return None
+    if not conflicts_checked and room_timeline.conflicts_for(room_timeline.reservation_slot(reservation)):
+        return None
+    reservation.status = RoomReservation.StatusChoices.APPROVED
+    reservation.approval_rule = rule
+    reservation.reviewed_at = timezone.now()
+    return rule
+
+
+def reevaluate_pending():
+    """Approve every pending reservation a rule now covers, in one transaction; return how many."""
+    rules = get_rules()
+    if not rules:
+        return 0
+    calendar = semester_calendar.get_calendar()
+    with transaction.atomic():
+        pending = list(
+            RoomReservation.objects.select_for_update(of=("self",))
+            .filter(status=RoomReservation.StatusChoices.PENDING, series__isnull=True)
+            .select_related("requester")
+            .order_by("start_time", "pk")
+        )
+        conflicts = room_timeline.find_conflicts([room_timeline.reservation_slot(reservation) for reservation in pending])
+        approved = defaultdict(list)
+        for reservation, clashes in zip(pending, conflicts):
+            if clashes:
+                continue
+            rule = matching_rule(reservation, reservation.requester.role, rules=rules, calendar=calendar)
+            if rule is not None:
+                approved[rule].append(reservation.pk)
+
+        now = timezone.now()
+        count = 0
+        for rule, ids in approved.items():
+            count += RoomReservation.objects.filter(pk__in=ids).update(
+                status=RoomReservation.StatusChoices.APPROVED,
+                approval_rule=rule,
+                reviewed_at=now,
+                updated_at=now,
+            )
+    return count
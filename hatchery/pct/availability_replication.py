@@ -0,0 +1,148 @@
+"""
+Copy, replace or remove an availability slot across the rest of a semester.
+
+All target slots are computed in memory from the cached semester calendar,
+then written with a fixed number of queries however many weeks remain:
+missing ScheduleWeeks are bulk-created, existing slots are read once for
+de-duplication, and the new Availability rows and their skill rows are
+bulk-inserted, all in one transaction.
+
+Modes:
+    "add"      copy the slot into every future week where it doesn't overlap
+               the profile's existing availability.
+    "replace"  delete the profile's future slots that overlap the copies, then copy.
+    "remove"   delete the copies of the slot from every future week.
+
+Weeks whose copy would fall on a holiday or outside open hours are skipped;
+the result counts those apart from the copies "add" skips for overlapping.
+"""
+
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import semester_calendar
+from .models import Availability, ScheduleWeek
+
+MODE_ADD = "add"
+MODE_REPLACE = "replace"
+MODE_REMOVE = "remove"
+MODES = (MODE_ADD, MODE_REPLACE, MODE_REMOVE)
+
+
+@dataclass
+class ReplicationResult:
+    created: int = 0
+    removed: int = 0
+    # Weeks left out for a holiday or closed hours.
+    skipped_closed: int = 0
+    # Copies "add" left out because they overlap existing availability.
+    skipped_overlapping: int = 0
+
+
+def target_slots(source, semester, calendar=None):
+    """Plan copies of source into each later week of semester.
+
+    Returns (slots, skipped): (week_start, start, end) for every week the slot
+    can be copied to, and how many weeks were skipped for holidays or closed
+    hours. Copies keep the slot's local wall-clock time across DST changes.
+    """
+    calendar = calendar or semester_calendar.get_calendar()
+    start = timezone.localtime(source.start)
+    end = timezone.localtime(source.end)
+    source_week = start.date() - timedelta(days=start.weekday())
+
+    slots = []
+    skipped = 0
+    weeks = 1
+    while True:
+        future_start = start + timedelta(weeks=weeks)
+        future_end = end + timedelta(weeks=weeks)
+        if future_start.date() > semester.end_date:
+            break
+        if calendar.is_holiday(semester, future_start.date()) or not calendar.within_open_hours(
+            semester, future_start, future_end
+        ):
+            skipped += 1
+        else:
+            slots.append((source_week + timedelta(weeks=weeks), future_start, future_end))
+        weeks += 1
+    return slots, skipped
+
+
+def _ensure_weeks(week_starts, creator):
+    ScheduleWeek.objects.bulk_create(
+        [ScheduleWeek(week_start=week_start, created_by=creator) for week_start in week_starts],
+        ignore_conflicts=True,
+    )
+    return dict(ScheduleWeek.objects.filter(week_start__in=week_starts).values_list("week_start", "id"))
+
+
+def _overlapping(profile, slots):
+    condition = Q()
+    for _, start, end in slots:
+        condition |= Q(start__lt=end, end__gt=start)
+    return Availability.objects.filter(condition, profile=profile)
+
+
+def _delete(queryset):
+    _, per_model = queryset.delete()
+    return per_model.get(Availability._meta.label, 0)
+
+
+def replicate(source, semester, mode=MODE_ADD, creator=None):
+    """Apply mode to copies of source in the future weeks of semester.
+
+    creator is recorded on any ScheduleWeek that has to be created.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown replication mode: {mode}")
+    slots, skipped = target_slots(source, semester)
+    result = ReplicationResult(skipped_closed=skipped)
+    if not slots:
+        return result
+
+    with transaction.atomic():
+        if mode == MODE_REMOVE:
+            exact = Q()
+            for _, start, end in slots:
+                exact |= Q(start=start, end=end)
+            result.removed = _delete(
+                Availability.objects.filter(exact, profile=source.profile).exclude(pk=source.pk)
+            )
+            return result
+
+        if mode == MODE_REPLACE:
+            result.removed = _delete(_overlapping(source.profile, slots).exclude(pk=source.pk))
+            existing = []
+        else:
+            existing = list(_overlapping(source.profile, slots).values_list("start", "end"))
+
+        week_ids = _ensure_weeks(sorted({week_start for week_start, _, _ in slots}), creator)
+        new_slots = [
+            Availability(
+                profile=source.profile,
+                week_id=week_ids[week_start],
+                start=start,
+                end=end,
+                note=source.note,
+            )
+            for week_start, start, end in slots
+            if not any(start < taken_end and taken_start < end for taken_start, taken_end in existing)
+        ]
+        result.skipped_overlapping = len(slots) - len(new_slots)
+        created = Availability.objects.bulk_create(new_slots)
+        result.created = len(created)
+
+        skill_ids = list(source.skills.values_list("pk", flat=True))
+        if skill_ids and created:
+            Through = Availability.skills.through
+            Through.objects.bulk_create(
+                Through(availability_id=availability.pk, certificationtype_id=skill_id)
+                for availability in created
+                for skill_id in skill_ids
+            )
+    return result
@@ -0,0 +1,70 @@
+"""
+Ban enforcement for every signed-in request.
+
+BanMiddleware reads the session user's ban state from request.user.profile,
+which the pct.auth backends load with the user, so enforcing costs no extra
+query and a ban or unban takes effect on the user's next request in every
+worker. While a ban is in force it logs the user out and sends them to the
+ban error page. A temporary ban lapses on time because the check compares
+its expiry with the current time.
+
+clear_expired() resets lapsed temporary bans in one UPDATE (the
+clear_expired_bans command).
+"""
+
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY, logout
+from django.shortcuts import redirect
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Profile
+
+
+def ban_state(profile):
+    """Return the ban in force for profile as a dict, or {} if there is none."""
+    if profile is None or not profile.is_currently_banned():
+        return {}
+    return {
+        "type": profile.ban_type or "permanent",
+        "expires_at": profile.ban_expires_at if profile.ban_type == "temporary" else None,
+        "reason": profile.ban_reason or "",
+    }
+
+
+def clear_expired(now=None):
+    """Lift every temporary ban whose expiry has passed. Returns how many were lifted."""
+    return Profile.objects.filter(
+        is_banned=True, ban_type="temporary", ban_expires_at__lte=now or timezone.now()
+    ).update(is_banned=False, ban_type=None, ban_expires_at=None, banned_at=None, ban_reason=None)
+
+
+def ban_error_redirect(state):
+    params = {"ban_type": state["type"], "ban_reason": state["reason"]}
+    if state["expires_at"]:
+        params["ban_expires_at"] = state["expires_at"].isoformat()
+    return redirect(f"{reverse('ban_error')}?{urlencode(params)}")
+
+
+def _profile(request):
+    return getattr(request.user, "profile", None)
+
+
+class BanMiddleware:
+    """Sign banned users out wherever they are. Goes after ProfileMiddleware."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.session.get(SESSION_KEY) is not None and not self._exempt(request.path):
+            state = ban_state(_profile(request))
+            if state:
+                logout(request)
+                return ban_error_redirect(state)
+        return self.get_response(request)
+
+    def _exempt(self, path):
+        return path.startswith(settings.STATIC_URL) or path in (reverse("ban_error"), reverse("account_logout"))
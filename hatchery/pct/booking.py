@@ -0,0 +1,203 @@
+"""
+Training bookings and waitlist promotion.
+
+A training has ``capacity`` seats. Booked seats are TrainingSeat rows; seats
+held for outstanding waitlist invitations are waitlist entries with status
+"invited". Training.seats_taken and Training.seats_held mirror those two
+counts so list pages can tell whether a training is full without reading
+either table.
+
+Every write to seats, invitations and the two counters goes through this
+module. Each operation runs in a transaction that first locks the Training row
+(SELECT ... FOR UPDATE), so concurrent signups, cancellations and invitation
+responses for the same training are serialized and the counters move in step
+with the rows. The pct_training_seats_within_capacity check constraint backs
+the capacity check in the database.
+"""
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import Training, TrainingSeat, TrainingWaitlist
+
+
+class BookingError(Exception):
+    """A booking was refused; the message is safe to show to the user."""
+
+
+def _lock_training(training_id):
+    return Training.objects.select_for_update().get(pk=training_id)
+
+
+def _adjust_counts(locked, taken=0, held=0):
+    Training.objects.filter(pk=locked.pk).update(
+        seats_taken=F("seats_taken") + taken,
+        seats_held=F("seats_held") + held,
+    )
+    locked.seats_taken += taken
+    locked.seats_held += held
+
+
+def _copy_counts(training, locked):
+    training.seats_taken = locked.seats_taken
+    training.seats_held = locked.seats_held
+
+
+def _fill_open_seats(locked):
+    """Invite waiting entries, oldest first, until every open seat is held.
+
+    The caller must hold the training lock. Returns the entries invited.
+    """
+    open_seats = locked.open_seats
+    if not open_seats:
+        return []
+    entries = list(locked.waitlist.filter(status="waiting").order_by("created_at")[:open_seats])
+    if entries:
+        TrainingWaitlist.objects.filter(pk__in=[entry.pk for entry in entries]).update(status="invited")
+        for entry in entries:
+            entry.status = "invited"
+        _adjust_counts(locked, held=len(entries))
+    return entries
+
+
+def _claim(locked, profile):
+    if locked.seats.filter(profile=profile).exists():
+        raise BookingError("You are already registered for this training.")
+    entry = locked.waitlist.filter(profile=profile).first()
+    if entry and entry.status == "invited":
+        held = -1
+    elif locked.open_seats:
+        held = 0
+    elif locked.seats_held:
+        raise BookingError(
+            "The remaining seats are reserved for students invited from the waitlist."
+        )
+    else:
+        raise BookingError("That training is full.")
+    TrainingSeat.objects.create(training=locked, profile=profile)
+    _adjust_counts(locked, taken=1, held=held)
+    if entry and entry.status != "accepted":
+        entry.status = "accepted"
+        entry.save(update_fields=["status"])
+
+
+def claim_training(training, profile):
+    """Book profile into a seat on training.
+
+    A profile holding a waitlist invitation takes the seat held for it; anyone
+    else needs an open seat. The profile's waitlist entry, if any, is marked
+    accepted.
+    """
+    with transaction.atomic():
+        locked = _lock_training(training.pk)
+        _claim(locked, profile)
+    _copy_counts(training, locked)
+
+
+def assign_seats(training, profiles):
+    """Book each of profiles into training, skipping those already seated.
+
+    Used when staff reserve seats for named students. Either every profile
+    gets a seat or none do.
+    """
+    with transaction.atomic():
+        locked = _lock_training(training.pk)
+        seated = set(locked.seats.values_list("profile_id", flat=True))
+        for profile in profiles:
+            if profile.pk not in seated:
+                _claim(locked, profile)
+    _copy_counts(training, locked)
+
+
+def release_training(training, profile):
+    """Give up profile's seat on training and invite waitlisted people into it.
+
+    Returns the waitlist entries that were invited; empty when profile had no
+    seat.
+    """
+    with transaction.atomic():
+        locked = _lock_training(training.pk)
+        removed, _ = locked.seats.filter(profile=profile).delete()
+        if not removed:
+            return []
+        _adjust_counts(locked, taken=-1)
+        invited = _fill_open_seats(locked)
+    _copy_counts(training, locked)
+    return invited
+
+
+def fill_open_seats(training):
+    """Invite as many waiting people as training has open seats."""
+    with transaction.atomic():
+        locked = _lock_training(training.pk)
+        invited = _fill_open_seats(locked)
+    _copy_counts(training, locked)
+    return invited
+
+
+def recount_seats(training):
+    """Recompute training's counters from its seat and waitlist rows.
+
+    For edits made outside this module, e.g. seat rows changed in the admin.
+    Open seats are then offered to the waitlist.
+    """
+    with transaction.atomic():
+        locked = _lock_training(training.pk)
+        locked.seats_taken = locked.seats.count()
+        locked.seats_held = locked.waitlist.filter(status="invited").count()
+        locked.save(update_fields=["seats_taken", "seats_held"])
+        invited = _fill_open_seats(locked)
+    _copy_counts(training, locked)
+    return invited
+
+
+def respond_to_invitation(entry, accept):
+    """Accept or decline a waitlist invitation.
+
+    Accepting books the invitee into the held seat; declining offers it to the
+    next person waiting. Returns the entries invited as a result.
+    """
+    with transaction.atomic():
+        locked = _lock_training(entry.training_id)
+        current = TrainingWaitlist.objects.select_for_update().get(pk=entry.pk)
+        if current.status != "invited":
+            raise BookingError("This invitation is no longer available.")
+        if accept:
+            if locked.seats.filter(profile_id=current.profile_id).exists():
+                # Booked some other way meanwhile; the held seat goes to the next person waiting.
+                _adjust_counts(locked, held=-1)
+                invited = _fill_open_seats(locked)
+            else:
+                TrainingSeat.objects.create(training=locked, profile_id=current.profile_id)
+                _adjust_counts(locked, taken=1, held=-1)
+                invited = []
+            current.status = "accepted"
+            current.save(update_fields=["status"])
+        else:
+            current.status = "declined"
+            current.save(update_fields=["status"])
+            _adjust_counts(locked, held=-1)
+            invited = _fill_open_seats(locked)
+    entry.status = current.status
+    _copy_counts(entry.training, locked)
+    return invited
+
+
+def leave_waitlist(training, profile):
+    """Remove profile from training's waitlist, passing on a held invitation.
+
+    Returns (left, invited): whether an entry was removed, and the entries
+    invited in its place.
+    """
+    with transaction.atomic():
+        locked = _lock_training(training.pk)
+        entry = locked.waitlist.filter(profile=profile).first()
+        if not entry:
+            return False, []
+        entry.delete()
+        if entry.status != "invited":
+            return True, []
+        _adjust_counts(locked, held=-1)
+        invited = _fill_open_seats(locked)
+    _copy_counts(training, locked)
+    return True, invited
@@ -0,0 +1,78 @@
+"""
+Cached snapshot of the certification catalog: every CertificationTemplate
+with its type and level.
+
+The staff certification search asks for it on every keystroke and it changes
+only when staff create or edit a certification, so get_catalog() loads it in
+one query, keeps it in the Django cache and the search filters it in memory.
+
+The catalog's version is a digest of its contents, so every worker computes
+the same one and the search endpoint can use it as an ETag. Saving or
+deleting a CertificationTemplate, CertificationType or CertificationLevel
+invalidates the snapshot (see pct.signals); call invalidate() after queryset
+.update() calls, which bypass signals. With the default per-process locmem
+cache, other workers only see a change once CERTIFICATION_CATALOG_TIMEOUT
+expires.
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .models import CertificationTemplate
+
+CACHE_KEY = "pct:certification_catalog"
+
+
+class CertificationCatalog:
+    def __init__(self, entries):
+        self.entries = entries
+        self.version = hashlib.sha1(json.dumps(entries, sort_keys=True).encode()).hexdigest()[:16]
+        # Lowercased text each entry is matched against, in entry order.
+        self._haystacks = [
+            "\n".join([entry["name"], entry["description"], str(entry["level"])]).lower() for entry in entries
+        ]
+
+    @classmethod
+    def load(cls):
+        entries = [
+            {
+                "id": cert.id,
+                "name": cert.type.name,
+                "description": cert.type.description or "",
+                "icon": cert.type.icon or "fa-solid fa-certificate",
+                "level": cert.level.level,
+            }
+            for cert in CertificationTemplate.objects.select_related("type", "level").order_by("pk")
+        ]
+        return cls(entries)
+
+    def search(self, query, limit=50):
+        """Entries whose name, description or level contains query (case-insensitively)."""
+        query = (query or "").lower()
+        matches = [
+            entry for entry, haystack in zip(self.entries, self._haystacks) if query in haystack
+        ]
+        return matches[:limit]
+
+
+def _cache():
+    return caches[getattr(settings, "CERTIFICATION_CATALOG_CACHE", "default")]
+
+
+def get_catalog():
+    """Return the current CertificationCatalog, loading it if it isn't cached."""
+    catalog = _cache().get(CACHE_KEY)
+    if catalog is None:
+        catalog = CertificationCatalog.load()
+        _cache().set(CACHE_KEY, catalog, getattr(settings, "CERTIFICATION_CATALOG_TIMEOUT", 60))
+    return catalog
+
+
+def invalidate():
+    """Drop the cached catalog now and again once the current transaction commits."""
+    _cache().delete(CACHE_KEY)
+    transaction.on_commit(lambda: _cache().delete(CACHE_KEY))
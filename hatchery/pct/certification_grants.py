@@ -0,0 +1,76 @@
+"""
+Grant template certifications to many users at once.
+
+grant() gives every profile a copy of every template's (type, level) in a
+fixed number of queries: with the profiles locked, the copies they already
+hold are read, the rest are bulk-inserted, and a second read tells which
+rows the insert actually added. Each profile gets one ActivityLog entry
+listing what it received. The (profile, type, level) unique constraint makes
+a concurrent grant of the same certification a no-op rather than a duplicate.
+"""
+
+from dataclasses import dataclass, field
+
+from django.db import transaction
+
+from . import activity
+from .models import Certification, Profile
+
+
+@dataclass
+class GrantResult:
+    # Labels ("3D Printer - Level 1") per profile id.
+    added: dict = field(default_factory=dict)
+    already_had: dict = field(default_factory=dict)
+
+    @property
+    def created(self):
+        return sum(len(labels) for labels in self.added.values())
+
+
+def label(certification):
+    return f"{certification.type.name} - Level {certification.level.level}"
+
+
+def grant(profiles, templates):
+    """Give each profile (with its user loaded) each CertificationTemplate's type and level."""
+    templates = list({(t.type_id, t.level_id): t for t in templates}.values())
+    result = GrantResult()
+    if not profiles or not templates:
+        return result
+
+    keys = {(profile.pk, template.type_id, template.level_id) for profile in profiles for template in templates}
+    with transaction.atomic():
+        # Grants to the same profiles wait for each other here, so the rows that
+        # appear between the two reads below are the ones this call inserted.
+        list(Profile.objects.select_for_update().filter(pk__in=[p.pk for p in profiles]).order_by("pk").values_list("pk"))
+        held = _held(profiles, templates)
+        new = [
+            Certification(profile=profile, type_id=template.type_id, level_id=template.level_id)
+            for profile in profiles
+            for template in templates
+            if (profile.pk, template.type_id, template.level_id) not in held
+        ]
+        # bulk_create skips post_save, so the per-row activity signal doesn't fire.
+        Certification.objects.bulk_create(new, batch_size=500, ignore_conflicts=True)
+        inserted = (_held(profiles, templates) - held) & keys if new else set()
+
+        for profile in profiles:
+            for template in templates:
+                key = (profile.pk, template.type_id, template.level_id)
+                target = result.added if key in inserted else result.already_had
+                target.setdefault(profile.pk, []).append(label(template))
+            if profile.pk in result.added:
+                labels = result.added[profile.pk]
+                activity.record(profile.user, "certification", f"Added certifications: {', '.join(labels)}")
+    return result
+
+
+def _held(profiles, templates):
+    return set(
+        Certification.objects.filter(
+            profile__in=profiles,
+            type_id__in={t.type_id for t in templates},
+            level_id__in={t.level_id for t in templates},
+        ).values_list("profile_id", "type_id", "level_id")
+    )
@@ -0,0 +1,180 @@
+"""
+Which people's availability covers which shifts in a schedule week, and how
+well each hour of the week is staffed.
+
+Each person's availability is merged into sorted, non-overlapping windows.
+Shift candidates then come from one sweep over the windows and shifts in
+start order: windows that have started are kept sorted by end, windows that
+ended before the current shift are dropped, and the people covering a shift
+are the suffix whose window ends at or after the shift's end. That costs
+O((A + S) log A) plus the size of the answer, instead of comparing every
+availability with every shift.
+
+The hourly heatmap counts required staff (min_staffing), assigned staff and
+available people per local wall-clock hour, using difference arrays so each
+interval is touched twice however long it is.
+"""
+
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import Availability, Certification, Shift
+
+HOURS_PER_WEEK = 7 * 24
+
+
+def merge_windows(windows):
+    """Merge overlapping or back-to-back (start, end) windows."""
+    merged = []
+    for start, end in sorted(windows):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def covering_profiles(windows_by_profile, shifts):
+    """Return {shift pk: [profile id, ...]} for the people whose windows fully cover each shift.
+
+    windows_by_profile maps profile ids to merged windows, as returned by
+    merge_windows. Candidates are ordered by when their window ends.
+    """
+    windows = sorted(
+        (start, end, profile_id) for profile_id, merged in windows_by_profile.items() for start, end in merged
+    )
+    started = []  # (end, profile_id) of windows that began at or before the current shift
+    position = 0
+    candidates = {}
+    for shift in sorted(shifts, key=lambda shift: shift.start):
+        while position < len(windows) and windows[position][0] <= shift.start:
+            start, end, profile_id = windows[position]
+            insort(started, (end, profile_id))
+            position += 1
+        # Shifts are visited in start order, so a window that ended before
+        # this one started can't cover any later shift either.
+        del started[: bisect_left(started, (shift.start,))]
+        candidates[shift.pk] = [profile_id for _, profile_id in started[bisect_left(started, (shift.end,)) :]]
+    return candidates
+
+
+@dataclass
+class Heatmap:
+    """Per-hour counts for the week; index 0 is Monday 00:00 local time."""
+
+    required: list
+    assigned: list
+    available: list
+
+    def days(self, week_start):
+        return [
+            {
+                "date": (week_start + timedelta(days=day)).isoformat(),
+                "required": self.required[day * 24 : (day + 1) * 24],
+                "assigned": self.assigned[day * 24 : (day + 1) * 24],
+                "available": self.available[day * 24 : (day + 1) * 24],
+            }
+            for day in range(7)
+        ]
+
+
+class _HourCounter:
+    def __init__(self, week_start):
+        self.week_start = week_start
+        self.deltas = [0] * (HOURS_PER_WEEK + 1)
+
+    def _hour(self, moment, round_up=False):
+        local = timezone.localtime(moment)
+        hour = (local.date() - self.week_start).days * 24 + local.hour
+        if round_up and (local.minute or local.second or local.microsecond):
+            hour += 1
+        return min(max(hour, 0), HOURS_PER_WEEK)
+
+    def add(self, start, end, amount=1):
+        first, last = self._hour(start), self._hour(end, round_up=True)
+        if first < last:
+            self.deltas[first] += amount
+            self.deltas[last] -= amount
+
+    def totals(self):
+        running, totals = 0, []
+        for delta in self.deltas[:HOURS_PER_WEEK]:
+            running += delta
+            totals.append(running)
+        return totals
+
+
+class WeekCoverage:
+    """Coverage of one ScheduleWeek, loaded in three queries.
+
+    Pass shifts to reuse a queryset the caller already evaluated with
+    required_certifications prefetched.
+    """
+
+    def __init__(self, schedule_week, shifts=None):
+        self.schedule_week = schedule_week
+        if shifts is None:
+            shifts = Shift.objects.filter(schedule_week=schedule_week).prefetch_related("required_certifications")
+        self.shifts = sorted(shifts, key=lambda shift: (shift.start, shift.pk))
+        availabilities = list(
+            Availability.objects.filter(week__week_start=schedule_week.week_start).select_related("profile__user")
+        )
+        self.profiles = {}
+        raw_windows = {}
+        for slot in availabilities:
+            self.profiles[slot.profile_id] = slot.profile
+            raw_windows.setdefault(slot.profile_id, []).append((slot.start, slot.end))
+        self.windows = {profile_id: merge_windows(windows) for profile_id, windows in raw_windows.items()}
+
+        self.certifications = {}
+        for profile_id, type_id in Certification.objects.filter(profile_id__in=self.profiles).values_list(
+            "profile_id", "type_id"
+        ):
+            self.certifications.setdefault(profile_id, set()).add(type_id)
+        self.candidates = covering_profiles(self.windows, self.shifts)
+
+    def candidates_for(self, shift):
+        """Profiles whose availability covers shift, with whether they hold its certifications."""
+        required = {cert.pk for cert in shift.required_certifications.all()}
+        return [
+            (self.profiles[profile_id], required <= self.certifications.get(profile_id, set()))
+            for profile_id in self.candidates.get(shift.pk, [])
+        ]
+
+    def heatmap(self):
+        week_start = self.schedule_week.week_start
+        required, assigned, available = (_HourCounter(week_start) for _ in range(3))
+        for shift in self.shifts:
+            required.add(shift.start, shift.end, shift.min_staffing)
+            if shift.assigned_to_id:
+                assigned.add(shift.start, shift.end)
+        for merged in self.windows.values():
+            for start, end in merged:
+                available.add(start, end)
+        return Heatmap(required.totals(), assigned.totals(), available.totals())
+
+    def as_dict(self):
+        shifts = []
+        for shift in self.shifts:
+            shifts.append(
+                {
+                    "id": shift.pk,
+                    "title": shift.title,
+                    "start": shift.start.isoformat(),
+                    "end": shift.end.isoformat(),
+                    "min_staffing": shift.min_staffing,
+                    "assigned_to": shift.assigned_to_id,
+                    "candidates": [
+                        {"id": profile.pk, "name": profile.get_full_name(), "certified": certified}
+                        for profile, certified in self.candidates_for(shift)
+                    ],
+                }
+            )
+        return {
+            "week_start": self.schedule_week.week_start.isoformat(),
+            "shifts": shifts,
+            "heatmap": self.heatmap().days(self.schedule_week.week_start),
+        }
@@ -1,5 +1,6 @@
 from django import forms
 from datetime import datetime, timedelta
+from . import booking, room_timeline, semester_calendar
 from .models import (
     Training,
     Profile,
@@ -40,39 +41,6 @@ ROOM_CHOICES = [
 ]
 
 
-def _active_semester_for_date(target_date):
-    if not target_date:
-        return None
-    return (
-        Semester.objects.filter(
-            start_date__lte=target_date,
-            end_date__gte=target_date,
-            is_active=True,
-        )
-        .order_by("-start_date")
-        .first()
-    )
-
-
-def _within_open_hours(semester, start_dt, end_dt):
-    """Return True if the start/end fall within configured open hours for the weekday."""
-    if not semester:
-        return True
-    weekday = start_dt.weekday()
-    hours = semester.open_hours.filter(weekday=weekday)
-    if not hours.exists():
-        return False
-    for window in hours:
-        if window.open_time <= start_dt.time() and window.close_time >= end_dt.time():
-            return True
-    return False
-
-
-def _is_holiday(semester, target_date):
-    if not semester:
-        return False
-    return semester.holidays.filter(date=target_date).exists()
-
 class TrainingForm(forms.ModelForm):
     machine = forms.ChoiceField(
         choices=[("", "Select a machine")] + MACHINE_CHOICES,
@@ -96,25 +64,34 @@ class TrainingForm(forms.ModelForm):
         required=False,
         help_text="Use local time; leave blank if the training time is still TBD.",
     )
+    students = forms.ModelMultipleChoiceField(
+        queryset=Profile.objects.none(),
+        required=False,
+        label="Add students",
+        help_text="Book these students now; anyone already booked keeps their seat. Leave blank to allow students to sign up later.",
+    )
 
     class Meta:
         model = Training
-        fields = ("name", "machine", "certification_type", "level", "student", "staff")
+        fields = ("name", "machine", "certification_type", "level", "capacity", "staff", "room", "duration")
 
     def __init__(self, *args, **kwargs):
         staff_user = kwargs.pop("staff_user", None)
         super().__init__(*args, **kwargs)
-        self.fields["student"].queryset = Profile.objects.filter(role__in=Profile.USER_ROLES)
-        self.fields["student"].required = False
-        self.fields["student"].help_text = "Leave blank to allow a student to sign up later."
-        self.fields["staff"].queryset = Profile.objects.filter(role__in=["staff", "team_member"])
+        self.fields["students"].queryset = Profile.objects.filter(role__in=Profile.USER_ROLES).select_related("user")
+        self.fields["capacity"].widget.attrs["min"] = 1
+        self.fields["capacity"].help_text = "How many students can book this session."
+        self.fields["staff"].queryset = Profile.objects.filter(role__in=["staff", "team_member"]).select_related("user")
         self.fields["staff"].required = True
         self.fields["staff"].label_from_instance = lambda p: p.get_full_name()
-        self.fields["student"].label_from_instance = lambda p: p.get_full_name()
+        self.fields["students"].label_from_instance = lambda p: p.get_full_name()
         self.fields["level"].queryset = CertificationLevel.objects.order_by("level")
         self.fields["level"].label_from_instance = lambda level: f"L{level.level}"
         self.fields["certification_type"].queryset = CertificationType.objects.order_by("name")
         self.fields["certification_type"].required = False
+        self.fields["room"].help_text = "Leave blank if the training doesn't need a room to itself."
+        self.fields["duration"].required = False
+        self.fields["duration"].help_text = "How long the session runs, as HH:MM:SS (one hour if left blank)."
 
         # If editing existing training, populate date/time fields
         if self.instance and self.instance.pk and self.instance.time:
@@ -125,7 +102,7 @@ class TrainingForm(forms.ModelForm):
 
         self.staff_profile = None
         if staff_user is not None:
-            self.staff_profile = Profile.objects.filter(user=staff_user).first()
+            self.staff_profile = getattr(staff_user, "profile", None)
             if self.staff_profile and not self.instance.pk:
                 self.fields["staff"].initial = self.staff_profile
 
@@ -160,7 +137,38 @@ class TrainingForm(forms.ModelForm):
             if not time_minute:
                 self.add_error("time_minute", "Minute is required if time is specified.")
         # If all are empty, time remains None (optional field)
-        
+
+        if not cleaned_data.get("duration"):
+            cleaned_data["duration"] = self.instance.duration
+        start = cleaned_data.get("time")
+        room = cleaned_data.get("room")
+        duration = cleaned_data["duration"]
+        if start and room and duration:
+            conflicts = room_timeline.conflicts_for(
+                room_timeline.Slot(room_timeline.TRAINING, room, start, start + duration, pk=self.instance.pk)
+            )
+            if conflicts:
+                self.add_error(None, room_timeline.describe(conflicts))
+
+        capacity = cleaned_data.get("capacity")
+        students = cleaned_data.get("students") or []
+        if capacity is not None:
+            if capacity < 1:
+                self.add_error("capacity", "A training needs at least one seat.")
+            elif self.instance.pk and capacity < self.instance.seats_taken:
+                self.add_error("capacity", f"{self.instance.seats_taken} students are already booked.")
+            else:
+                # Mirrors booking.assign_seats: booked students are skipped and
+                # invitees take the seat held for them; everyone else needs an open one.
+                booked = set()
+                if self.instance.pk:
+                    booked = set(self.instance.seats.values_list("profile_id", flat=True))
+                    booked |= set(self.instance.waitlist.filter(status="invited").values_list("profile_id", flat=True))
+                needed = sum(1 for student in students if student.pk not in booked)
+                open_seats = max(capacity - self.instance.seats_taken - self.instance.seats_held, 0)
+                if needed > open_seats:
+                    self.add_error("students", f"Only {open_seats} seat(s) available.")
+
         return cleaned_data
     
     def save(self, commit=True):
@@ -173,8 +181,15 @@ class TrainingForm(forms.ModelForm):
             instance.time = None
         if commit:
             instance.save()
+            self._save_m2m()
         return instance
 
+    def _save_m2m(self):
+        super()._save_m2m()
+        booking.assign_seats(self.instance, self.cleaned_data.get("students") or [])
+        if "capacity" in self.changed_data:
+            booking.recount_seats(self.instance)
+
 
 class RoomReservationForm(forms.ModelForm):
     room = forms.ChoiceField(choices=ROOM_CHOICES)
@@ -298,6 +313,9 @@ class RoomReservationForm(forms.ModelForm):
                 self.add_error("end_time_minute", "End time must be after the start time.")
             if start.date() != end.date():
                 self.add_error("end_date", "Reservations must begin and end on the same day.")
+            # The model's clean() (run after this) checks the room timeline for conflicts.
+            self.instance.start_time = start
+            self.instance.end_time = end
         
         return cleaned_data
     
@@ -313,6 +331,70 @@ class RoomReservationForm(forms.ModelForm):
         return instance
 
 
+class RoomReservationSeriesForm(forms.Form):
+    room = forms.ChoiceField(choices=ROOM_CHOICES)
+    semester = forms.ModelChoiceField(
+        queryset=Semester.objects.filter(is_active=True),
+        help_text="The series runs through this semester and skips its holidays.",
+    )
+    weekdays = forms.TypedMultipleChoiceField(
+        choices=OpenHour.Weekday.choices,
+        coerce=int,
+        widget=forms.CheckboxSelectMultiple,
+        help_text="Book the room every week on these days.",
+    )
+    start_time = forms.TimeField(widget=forms.TimeInput(attrs={"type": "time", "step": 900}))
+    end_time = forms.TimeField(widget=forms.TimeInput(attrs={"type": "time", "step": 900}))
+    first_date = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={"type": "date"}),
+        help_text="Leave blank to start at the beginning of the semester.",
+    )
+    last_date = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={"type": "date"}),
+        help_text="Leave blank to run until the end of the semester.",
+    )
+    affiliation = forms.CharField(
+        max_length=255,
+        help_text="Tell us which class or organization needs the space.",
+    )
+    is_exclusive_request = forms.BooleanField(
+        required=False,
+        label="Exclusive classroom/station use",
+    )
+    skip_conflicts = forms.BooleanField(
+        required=False,
+        label="Book the free dates if some are taken",
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name, field in self.fields.items():
+            if name != "weekdays":
+                existing_classes = field.widget.attrs.get("class", "")
+                field.widget.attrs["class"] = (existing_classes + " form-input").strip()
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start = cleaned_data.get("start_time")
+        end = cleaned_data.get("end_time")
+        if start and end and end <= start:
+            self.add_error("end_time", "End time must be after the start time.")
+
+        semester = cleaned_data.get("semester")
+        if semester:
+            first = cleaned_data.get("first_date") or semester.start_date
+            last = cleaned_data.get("last_date") or semester.end_date
+            if first < semester.start_date or last > semester.end_date:
+                self.add_error("first_date", "The series must fall within the semester dates.")
+            elif last < first:
+                self.add_error("last_date", "Last date must be on or after the first date.")
+            cleaned_data["first_date"] = first
+            cleaned_data["last_date"] = last
+        return cleaned_data
+
+
 class ReportForm(forms.ModelForm):
     class Meta:
         model = Report
@@ -420,13 +502,14 @@ class AvailabilityForm(forms.ModelForm):
                 self.add_error("day", "Availability must fall within the selected week.")
 
         # Enforce open hours/holidays for the active semester
-        semester = self.semester or _active_semester_for_date(
+        calendar = semester_calendar.get_calendar()
+        semester = self.semester or calendar.semester_for_date(
             start.date() if start else end.date() if end else None
         )
         if semester and start and end:
-            if _is_holiday(semester, start.date()):
+            if calendar.is_holiday(semester, start.date()):
                 self.add_error(None, f"{start.date()} is marked as a holiday for {semester.name}.")
-            elif not _within_open_hours(semester, start, end):
+            elif not calendar.within_open_hours(semester, start, end):
                 self.add_error(None, f"This slot is outside the open hours for {semester.name}.")
 
         return cleaned_data
@@ -470,7 +553,7 @@ class ShiftForm(forms.ModelForm):
         self.week = kwargs.pop("week", None)
         super().__init__(*args, **kwargs)
         self.fields["assigned_to"].required = False
-        self.fields["assigned_to"].queryset = Profile.objects.filter(role__in=Profile.USER_ROLES + ("staff",))
+        self.fields["assigned_to"].queryset = Profile.objects.filter(role__in=Profile.USER_ROLES + ("staff",)).select_related("user")
         self.fields["assigned_to"].label_from_instance = lambda p: p.get_full_name()
         for field in self.fields.values():
             existing_classes = field.widget.attrs.get("class", "")
@@ -507,8 +590,9 @@ class ShiftForm(forms.ModelForm):
         if start and end:
             start_date = start.date()
             end_date = end.date()
-            start_semester = _active_semester_for_date(start_date)
-            end_semester = _active_semester_for_date(end_date)
+            calendar = semester_calendar.get_calendar()
+            start_semester = calendar.semester_for_date(start_date)
+            end_semester = calendar.semester_for_date(end_date)
             if not start_semester or not end_semester or start_semester.pk != end_semester.pk:
                 self.add_error("start", "Shifts must start and end within an active semester.")
                 self.add_error("end", "Shifts must start and end within an active semester.")
@@ -517,11 +601,19 @@ class ShiftForm(forms.ModelForm):
                 if end_date > semester.end_date or start_date < semester.start_date:
                     self.add_error("start", f"Shifts must be scheduled during {semester.name}.")
                     self.add_error("end", f"Shifts must be scheduled during {semester.name}.")
-                elif _is_holiday(semester, start_date):
+                elif calendar.is_holiday(semester, start_date):
                     self.add_error(None, f"{start_date} is marked as a holiday for {semester.name}.")
-                elif not _within_open_hours(semester, start, end):
+                elif not calendar.within_open_hours(semester, start, end):
                     self.add_error(None, f"This shift is outside the open hours for {semester.name}.")
 
+        location = cleaned_data.get("location")
+        if location and start and end and end > start:
+            conflicts = room_timeline.conflicts_for(
+                room_timeline.Slot(room_timeline.SHIFT, location, start, end, pk=self.instance.pk)
+            )
+            if conflicts:
+                self.add_error(None, room_timeline.describe(conflicts))
+
         assignee = cleaned_data.get("assigned_to")
         if self.week and assignee and assignee.role == "team_member" and start and end:
             current_duration = Shift.weekly_assigned_duration(
@@ -545,7 +637,7 @@ class SwapRequestForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.fields["proposed_to"].required = False
-        self.fields["proposed_to"].queryset = Profile.objects.filter(role__in=Profile.USER_ROLES)
+        self.fields["proposed_to"].queryset = Profile.objects.filter(role__in=Profile.USER_ROLES).select_related("user")
         for field in self.fields.values():
             existing_classes = field.widget.attrs.get("class", "")
             field.widget.attrs["class"] = (existing_classes + " form-input").strip()
@@ -0,0 +1,62 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from pct import activity
+from pct.models import ActivityLog
+
+
+class Command(BaseCommand):
+    help = "Archive activity log entries past the retention period to gzip JSONL files and delete them"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=getattr(settings, "ACTIVITY_LOG_RETENTION_DAYS", 365),
+            help="Keep entries newer than this many days (default: ACTIVITY_LOG_RETENTION_DAYS).",
+        )
+        parser.add_argument(
+            "--archive-dir",
+            default=getattr(settings, "ACTIVITY_LOG_ARCHIVE_DIR", None),
+            help="Directory for activity-log-YYYY-MM.jsonl.gz files (default: ACTIVITY_LOG_ARCHIVE_DIR).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows moved per transaction.")
+        parser.add_argument("--max-batches", type=int, help="Stop after this many batches.")
+        parser.add_argument("--pause", type=float, default=0, help="Seconds to sleep between batches.")
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many rows would move.")
+
+    def handle(self, *args, **options):
+        if options["days"] < 1:
+            raise CommandError("--days must be at least 1.")
+        if not options["archive_dir"]:
+            raise CommandError(
+                "Set ACTIVITY_LOG_ARCHIVE_DIR or pass --archive-dir, pointing at durable storage: "
+                "archived entries are deleted from the database."
+            )
+        cutoff = timezone.now() - timedelta(days=options["days"])
+
+        if options["dry_run"]:
+            count = ActivityLog.objects.filter(created_at__lt=cutoff).count()
+            self.stdout.write(f"{count} entries older than {cutoff:%Y-%m-%d %H:%M} would be archived.")
+            return
+
+        total = 0
+        batches = 0
+        while options["max_batches"] is None or batches < options["max_batches"]:
+            moved = activity.archive_before(
+                cutoff, options["archive_dir"], batch_size=options["batch_size"], max_batches=1
+            )
+            if not moved:
+                break
+            total += moved
+            batches += 1
+            self.stdout.write(f"Archived {total} entries...")
+            if options["pause"]:
+                time.sleep(options["pause"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Archived {total} entries older than {cutoff:%Y-%m-%d} to {options['archive_dir']}.")
+        )
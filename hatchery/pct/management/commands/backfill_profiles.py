@@ -0,0 +1,28 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from pct import user_search
+from pct.models import Profile
+
+
+class Command(BaseCommand):
+    help = "Create a Profile for every user that doesn't have one"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Profiles inserted per query.")
+
+    def handle(self, *args, **options):
+        missing = get_user_model().objects.filter(profile__isnull=True)
+        before = Profile.objects.count()
+        Profile.objects.bulk_create(
+            [Profile(user=user, search_text=user_search.document(user, Profile())) for user in missing],
+            batch_size=options["batch_size"],
+            # A user created (and given a profile) meanwhile is skipped, not an error.
+            ignore_conflicts=True,
+        )
+        # bulk_create returns every object it was given, skipped or not; count the rows instead.
+        created = Profile.objects.count() - before
+        if created:
+            # bulk_create skips the signals that keep the search index in step.
+            user_search.get_backend().rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Created {created} profile(s)."))
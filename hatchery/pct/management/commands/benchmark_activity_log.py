@@ -0,0 +1,71 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from pct import activity
+from pct.models import Certification, CertificationLevel, CertificationType
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Command(BaseCommand):
+    help = "Compare per-request latency of synchronous and buffered ActivityLog writes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500, help="Simulated certification grants per mode.")
+        parser.add_argument("--batch", type=int, default=100, help="Buffered entries per flush.")
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.create_user(username=f"benchmark-activity-{time.time_ns()}")
+        # A profile holds each certification once, so every grant needs its own type.
+        cert_types = CertificationType.objects.bulk_create(
+            [CertificationType(name=f"Benchmark {user.pk} #{number}") for number in range(options["requests"])]
+        )
+        level, _ = CertificationLevel.objects.get_or_create(level=1)
+        try:
+            header = f"{'mode':<10} {'req ms p50':>11} {'req ms p95':>11} {'flush ms':>9} {'log INSERTs':>12}"
+            self.stdout.write(
+                f"{options['requests']} certification grants per mode, each in its own transaction"
+            )
+            self.stdout.write(header)
+            self.stdout.write("-" * len(header))
+            for mode, buffered in (("sync", False), ("buffered", True)):
+                self._run(mode, buffered, user.profile, cert_types, level, options)
+                Certification.objects.filter(profile=user.profile).delete()
+        finally:
+            activity.flush()
+            user.delete()
+            CertificationType.objects.filter(pk__in=[cert_type.pk for cert_type in cert_types]).delete()
+
+    def _run(self, mode, buffered, profile, cert_types, level, options):
+        latencies = []
+        flush_time = 0.0
+        with override_settings(
+            ACTIVITY_LOG_BUFFERED=buffered,
+            ACTIVITY_LOG_FLUSH_INTERVAL=0,
+            ACTIVITY_LOG_BATCH_SIZE=options["batch"],
+        ), CaptureQueriesContext(connection) as queries:
+            for count, cert_type in enumerate(cert_types, 1):
+                started = time.perf_counter()
+                with transaction.atomic():
+                    Certification.objects.create(profile=profile, type=cert_type, level=level)
+                latencies.append((time.perf_counter() - started) * 1000)
+                # Stands in for the background flusher, which runs off the request path.
+                if buffered and (count % options["batch"] == 0 or count == options["requests"]):
+                    started = time.perf_counter()
+                    activity.flush()
+                    flush_time += (time.perf_counter() - started) * 1000
+        inserts = sum(
+            1 for query in queries.captured_queries if query["sql"].startswith('INSERT INTO "pct_activitylog"')
+        )
+        self.stdout.write(
+            f"{mode:<10} {statistics.median(latencies):>11.2f} {_percentile(latencies, 95):>11.2f} "
+            f"{flush_time:>9.1f} {inserts:>12}"
+        )
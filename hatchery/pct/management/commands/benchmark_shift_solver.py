@@ -0,0 +1,115 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pct import shift_solver
+
+DAY = 24 * 3600
+HOUR = 3600
+
+
+def synthetic_week(shift_count, people_count, seed=0, certification_count=4):
+    """Build a random week of OpenShifts and Candidates without touching the database.
+
+    Shifts are 2-4 hours between 8:00 and 20:00 over seven days; a third of
+    them need one certification. Everyone submits one to three windows a day
+    on four random days and holds up to two certifications; one in ten people
+    is staff and uncapped.
+    """
+    rng = random.Random(seed)
+    shifts = []
+    for shift_id in range(1, shift_count + 1):
+        day = rng.randrange(7)
+        length = rng.choice((2, 3, 4))
+        start = day * DAY + rng.randrange(8, 21 - length) * HOUR
+        required = frozenset({rng.randrange(certification_count)}) if rng.random() < 1 / 3 else frozenset()
+        shifts.append(shift_solver.OpenShift(shift_id, start, start + length * HOUR, required))
+
+    candidates = []
+    for person_id in range(1, people_count + 1):
+        windows = []
+        for day in rng.sample(range(7), 4):
+            for _ in range(rng.randint(1, 3)):
+                start = day * DAY + rng.randrange(8, 17) * HOUR
+                windows.append((start, min(start + rng.randint(3, 8) * HOUR, day * DAY + 20 * HOUR)))
+        certifications = frozenset(rng.sample(range(certification_count), rng.randint(0, 2)))
+        capped = rng.random() >= 0.1
+        candidates.append(
+            shift_solver.Candidate(
+                id=person_id,
+                windows=shift_solver.merge_windows(windows),
+                certifications=certifications,
+                cap=int(shift_solver.WEEKLY_HOUR_CAP.total_seconds()) if capped else None,
+            )
+        )
+    return shifts, candidates
+
+
+def violations(shifts, candidates, assignments):
+    """Return a list of rule breaches in assignments, re-checked from scratch."""
+    by_id = {shift.id: shift for shift in shifts}
+    problems = []
+    for person in candidates:
+        mine = sorted((by_id[shift_id] for shift_id, owner in assignments.items() if owner == person.id), key=lambda s: s.start)
+        for shift in mine:
+            if not person.qualifies(shift):
+                problems.append(f"person {person.id} cannot cover shift {shift.id}")
+        for earlier, later in zip(mine, mine[1:]):
+            if later.start < earlier.end:
+                problems.append(f"person {person.id} double-booked on shifts {earlier.id} and {later.id}")
+        if person.cap is not None and sum(shift.duration for shift in mine) > person.cap:
+            problems.append(f"person {person.id} is over the weekly cap")
+    return problems
+
+
+class Command(BaseCommand):
+    help = "Time the shift auto-assignment solvers on synthetic weeks"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--shifts", type=int, default=200)
+        parser.add_argument("--people", type=int, default=80)
+        parser.add_argument("--weeks", type=int, default=5, help="Number of random weeks to solve.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--backend",
+            choices=("python", "scipy", "all"),
+            default="all",
+            help="Solver to time (default: every installed one).",
+        )
+
+    def handle(self, *args, **options):
+        backends = {"python": False, "scipy": True}
+        if options["backend"] != "all":
+            backends = {options["backend"]: backends[options["backend"]]}
+        if "scipy" in backends and not shift_solver.HAS_SCIPY:
+            if options["backend"] == "scipy":
+                raise CommandError("numpy and scipy are not installed.")
+            del backends["scipy"]
+
+        self.stdout.write(
+            f"{options['weeks']} synthetic week(s) of {options['shifts']} shifts x {options['people']} people"
+        )
+        header = f"{'solver':<8} {'ms p50':>8} {'ms max':>8} {'filled':>8} {'hours stdev':>12} {'max hours':>10}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for name, accelerate in backends.items():
+            timings, filled, spreads, peaks = [], [], [], []
+            for week in range(options["weeks"]):
+                shifts, candidates = synthetic_week(options["shifts"], options["people"], seed=options["seed"] + week)
+                started = time.perf_counter()
+                assignments = shift_solver.solve(shifts, candidates, accelerate=accelerate)
+                timings.append((time.perf_counter() - started) * 1000)
+
+                problems = violations(shifts, candidates, assignments)
+                if problems:
+                    raise CommandError(f"{name} solver broke the rules: {problems[0]}")
+                hours = [person.load / HOUR for person in candidates]
+                filled.append(len(assignments))
+                spreads.append(statistics.pstdev(hours))
+                peaks.append(max(hours))
+            self.stdout.write(
+                f"{name:<8} {statistics.median(timings):>8.1f} {max(timings):>8.1f} "
+                f"{statistics.mean(filled):>8.1f} {statistics.mean(spreads):>12.2f} {max(peaks):>10.1f}"
+            )
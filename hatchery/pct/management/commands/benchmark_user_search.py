@@ -0,0 +1,76 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from pct import user_search
+from pct.models import Profile
+
+FIRST_NAMES = ["Alice", "Bob", "Carmen", "Dmitri", "Eun-ji", "Farah", "Gabriel", "Hana", "Ibrahim", "Jia", "Kofi", "Lucia"]
+LAST_NAMES = ["Smith", "Nguyen", "Garcia", "Okafor", "Kowalski", "Chen", "Murphy", "Haddad", "Silva", "Johansson"]
+QUERIES = ["a", "al", "ali smi", "smith", "garcia jia", "user4242", "zz"]
+
+
+class Command(BaseCommand):
+    help = "Time staff user search against a synthetic roster (rolled back afterwards)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=50000, help="Synthetic users to search.")
+        parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query.")
+
+    def handle(self, *args, **options):
+        backend = user_search.get_backend()
+        with transaction.atomic():
+            self._seed(options["users"])
+            backend.rebuild()
+            if connection.vendor == "postgresql":
+                # Autovacuum would do this for a real roster; the seed is too fresh.
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT gin_clean_pending_list('pct_profile_search_gin')")
+                    cursor.execute("ANALYZE auth_user")
+                    cursor.execute("ANALYZE pct_profile")
+            users = get_user_model().objects.filter(profile__role__in=Profile.USER_ROLES).select_related("profile")
+            self.stdout.write(f"{type(backend).__name__}, {options['users']} users, first 50 results per query")
+            header = f"{'query':<12} {'matches':>8} {'ms p50':>8} {'ms max':>8}"
+            self.stdout.write(header)
+            self.stdout.write("-" * len(header))
+            for query in QUERIES:
+                timings = []
+                for _ in range(options["repeat"]):
+                    started = time.perf_counter()
+                    found = list(user_search.search(users, query)[:50])
+                    timings.append((time.perf_counter() - started) * 1000)
+                self.stdout.write(
+                    f"{query:<12} {len(found):>8} {statistics.median(timings):>8.2f} {max(timings):>8.2f}"
+                )
+            transaction.set_rollback(True)
+        backend.rebuild()
+
+    def _seed(self, count):
+        rng = random.Random(1)
+        User = get_user_model()
+        prefix = f"bench{time.time_ns()}"
+        users = User.objects.bulk_create(
+            [
+                User(
+                    username=f"{prefix}user{number}",
+                    first_name=rng.choice(FIRST_NAMES),
+                    last_name=rng.choice(LAST_NAMES),
+                    email=f"user{number}@bc.edu",
+                    password="!",
+                )
+                for number in range(count)
+            ],
+            batch_size=2000,
+        )
+        if users[0].pk is None:
+            users = list(User.objects.filter(username__startswith=prefix))
+        profiles = []
+        for user in users:
+            profile = Profile(user=user, role="student")
+            profile.search_text = user_search.document(user, profile)
+            profiles.append(profile)
+        Profile.objects.bulk_create(profiles, batch_size=2000)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from pct import bans
+
+
+class Command(BaseCommand):
+    help = "Lift temporary bans whose expiry has passed (run periodically, e.g. from cron)"
+
+    def handle(self, *args, **options):
+        cleared = bans.clear_expired()
+        self.stdout.write(self.style.SUCCESS(f"Cleared {cleared} expired temporary ban(s)."))
@@ -3,6 +3,7 @@ from datetime import timedelta
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
+from pct import booking
 from pct.models import CertificationLevel, CertificationType, Profile, Training
 
 
@@ -151,15 +152,16 @@ class Command(BaseCommand):
                         )
                     )
 
-            Training.objects.create(
+            training = Training.objects.create(
                 name=spec["name"],
                 machine=spec["machine"],
                 level=level_obj,
                 certification_type=cert_type_obj,
                 staff=staff_profile,
-                student=student_profile,
                 time=spec["time"],
             )
+            if student_profile is not None:
+                booking.claim_training(training, student_profile)
             created_count += 1
             self.stdout.write(
                 self.style.SUCCESS(
@@ -1,5 +1,5 @@
 from django.core.management.base import BaseCommand
-from pct.models import CertificationType, CertificationLevel, Certification
+from pct.models import CertificationType, CertificationLevel, CertificationTemplate
 
 class Command(BaseCommand):
     help = 'Load initial certification types and levels'
@@ -56,7 +56,7 @@ class Command(BaseCommand):
             )
 
             for level in levels:
-                certification, created = Certification.objects.get_or_create(type=obj, level=CertificationLevel.objects.get(level=level))
+                certification, created = CertificationTemplate.objects.get_or_create(type=obj, level=CertificationLevel.objects.get(level=level))
                 if created:
                     self.stdout.write(f'Created certification: {certification.type.name} - Level {certification.level.level}')
                 else:
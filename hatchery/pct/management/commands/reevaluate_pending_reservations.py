@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from pct import auto_approval
+
+
+class Command(BaseCommand):
+    help = "Approve the pending room requests that the active auto-approval rules now cover"
+
+    def handle(self, *args, **options):
+        approved = auto_approval.reevaluate_pending()
+        self.stdout.write(self.style.SUCCESS(f"Approved {approved} pending reservation(s)."))
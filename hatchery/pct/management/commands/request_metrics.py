@@ -0,0 +1,75 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+from hatchery import request_metrics
+
+
+class Command(BaseCommand):
+    help = "Show the per-view query/timing percentiles recorded by RequestMetricsMiddleware"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--json", action="store_true", help="Print the summary as JSON.")
+        parser.add_argument("--reset", action="store_true", help="Clear recorded samples first.")
+        parser.add_argument(
+            "--request",
+            action="append",
+            default=[],
+            metavar="PATH",
+            help="Issue GET PATH in-process before reporting (repeatable).",
+        )
+        parser.add_argument("--user", help="Username to log in as for --request.")
+        parser.add_argument("--repeat", type=int, default=10, help="Times to issue each --request.")
+
+    def handle(self, *args, **options):
+        if options["reset"]:
+            request_metrics.reset_samples()
+
+        if options["request"]:
+            self._sample(options["request"], options["user"], options["repeat"])
+
+        rows = request_metrics.summarize()
+        if options["json"]:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+        if not rows:
+            self.stdout.write("No samples recorded. Enable REQUEST_METRICS=1 or use --request.")
+            return
+
+        header = (
+            f"{'view':<28} {'n':>5} {'queries p50/p95/p99':>20} {'db ms p95':>10} "
+            f"{'tmpl ms p95':>12} {'total ms p95':>13} {'KB p95':>8}"
+        )
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for row in rows:
+            queries = row["queries"]
+            size_kb = row["bytes"]["p95"] / 1024 if row["bytes"] else 0
+            line = (
+                f"{row['url_name']:<28} {row['count']:>5} "
+                f"{'/'.join(str(queries[p]) for p in ('p50', 'p95', 'p99')):>20} "
+                f"{row['db_ms']['p95']:>10.1f} {row['template_ms']['p95']:>12.1f} "
+                f"{row['total_ms']['p95']:>13.1f} {size_kb:>8.1f}"
+            )
+            budget = row["query_budget"]
+            if budget is not None and queries["p95"] > budget:
+                self.stdout.write(self.style.WARNING(f"{line}  over budget ({budget})"))
+            else:
+                self.stdout.write(line)
+
+    def _sample(self, paths, username, repeat):
+        client = Client()
+        if username:
+            user = get_user_model().objects.filter(username=username).first()
+            if not user:
+                raise CommandError(f"No user named {username}.")
+            client.force_login(user)
+        with override_settings(REQUEST_METRICS_ENABLED=True, REQUEST_QUERY_BUDGET_STRICT=False):
+            for path in paths:
+                for _ in range(max(repeat, 1)):
+                    response = client.get(path, secure=True)
+                    if response.status_code >= 400:
+                        self.stderr.write(f"GET {path} returned {response.status_code}")
+                        break
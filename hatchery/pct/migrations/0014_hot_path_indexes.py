@@ -0,0 +1,95 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+OVERLAP_CONSTRAINT = "pct_roomreservation_no_overlap"
+
+
+def add_reservation_overlap_constraint(apps, schema_editor):
+    """Reject overlapping non-denied reservations of a room in the database (PostgreSQL only)."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT a.id, b.id FROM pct_roomreservation a
+            JOIN pct_roomreservation b
+              ON a.room = b.room AND a.id < b.id
+             AND a.start_time < b.end_time AND b.start_time < a.end_time
+            WHERE a.status <> 'denied' AND b.status <> 'denied'
+            """
+        )
+        conflicts = cursor.fetchall()
+    if conflicts:
+        pairs = ", ".join(f"{a}/{b}" for a, b in conflicts[:20])
+        raise RuntimeError(
+            f"Cannot add {OVERLAP_CONSTRAINT}: overlapping room reservations exist ({pairs}). "
+            "Deny one reservation of each pair and re-run the migration."
+        )
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    schema_editor.execute(
+        f"""
+        ALTER TABLE pct_roomreservation ADD CONSTRAINT {OVERLAP_CONSTRAINT}
+        EXCLUDE USING gist (room WITH =, tstzrange(start_time, end_time, '[)') WITH &&)
+        WHERE (status <> 'denied')
+        """
+    )
+
+
+def remove_reservation_overlap_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"ALTER TABLE pct_roomreservation DROP CONSTRAINT IF EXISTS {OVERLAP_CONSTRAINT}"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pct', '0013_merge_20251203_2241'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='training',
+            name='staff',
+            field=models.ForeignKey(blank=True, limit_choices_to={'role__in': ('staff', 'team_member')}, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='trainings_led', to='pct.profile'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['-created_at'], name='pct_activitylog_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='roomreservation',
+            index=models.Index(condition=models.Q(('status', 'denied'), _negated=True), fields=['room', 'start_time', 'end_time'], name='pct_resv_room_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='roomreservation',
+            index=models.Index(fields=['status', 'start_time'], name='pct_resv_status_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shift',
+            index=models.Index(fields=['schedule_week', 'assigned_to'], name='pct_shift_week_assignee_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='training',
+            index=models.Index(fields=['time'], name='pct_training_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='training',
+            index=models.Index(fields=['student', 'time'], name='pct_training_student_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trainingwaitlist',
+            index=models.Index(fields=['training', 'status', 'created_at'], name='pct_waitlist_queue_idx'),
+        ),
+        migrations.RunPython(
+            add_reservation_overlap_constraint,
+            remove_reservation_overlap_constraint,
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def copy_students_to_seats(apps, schema_editor):
+    Training = apps.get_model("pct", "Training")
+    TrainingSeat = apps.get_model("pct", "TrainingSeat")
+    TrainingSeat.objects.bulk_create(
+        TrainingSeat(training_id=training_id, profile_id=student_id)
+        for training_id, student_id in Training.objects.filter(student__isnull=False).values_list(
+            "id", "student_id"
+        )
+    )
+    trainings = Training.objects.annotate(
+        taken=Count("seats", distinct=True),
+        held=Count("waitlist", filter=Q(waitlist__status="invited"), distinct=True),
+    )
+    for training in trainings:
+        training.seats_taken = training.taken
+        training.seats_held = training.held
+        training.capacity = max(training.capacity, training.taken)
+    Training.objects.bulk_update(trainings, ["seats_taken", "seats_held", "capacity"], batch_size=500)
+
+
+def copy_seats_to_students(apps, schema_editor):
+    Training = apps.get_model("pct", "Training")
+    TrainingSeat = apps.get_model("pct", "TrainingSeat")
+    first_seats = {}
+    for training_id, profile_id in TrainingSeat.objects.order_by("created_at").values_list(
+        "training_id", "profile_id"
+    ):
+        first_seats.setdefault(training_id, profile_id)
+    for training_id, profile_id in first_seats.items():
+        Training.objects.filter(pk=training_id).update(student_id=profile_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pct', '0014_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrainingSeat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='training_seats', to='pct.profile')),
+                ('training', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seats', to='pct.training')),
+            ],
+            options={
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='training',
+            name='seats_held',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Seats held for outstanding waitlist invitations.'),
+        ),
+        migrations.AddField(
+            model_name='training',
+            name='seats_taken',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(copy_students_to_seats, copy_seats_to_students),
+        migrations.RemoveIndex(
+            model_name='training',
+            name='pct_training_student_time_idx',
+        ),
+        migrations.RemoveField(
+            model_name='training',
+            name='student',
+        ),
+        migrations.AddField(
+            model_name='training',
+            name='students',
+            field=models.ManyToManyField(blank=True, related_name='trainings_booked', through='pct.TrainingSeat', to='pct.profile'),
+        ),
+        migrations.AddConstraint(
+            model_name='training',
+            constraint=models.CheckConstraint(condition=models.Q(('seats_taken__lte', models.F('capacity'))), name='pct_training_seats_within_capacity'),
+        ),
+        migrations.AddConstraint(
+            model_name='trainingseat',
+            constraint=models.UniqueConstraint(fields=('training', 'profile'), name='pct_seat_unique_profile'),
+        ),
+    ]
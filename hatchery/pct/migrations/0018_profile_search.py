@@ -0,0 +1,88 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:19
+
+import re
+
+from django.db import migrations, models
+
+# Frozen copies of pct.user_search as of this migration, so later changes to
+# that module or the models can't change what this migration does.
+FTS_TABLE = "pct_profile_search"
+SEARCH_VECTOR = "search_vector"
+GIN_INDEX = "pct_profile_search_gin"
+
+_WORDS = re.compile(r"[^\W_]+")
+
+
+def document(user, profile):
+    parts = [
+        user.username,
+        user.first_name,
+        user.last_name,
+        user.email,
+        profile.first_name,
+        profile.last_name,
+        profile.email,
+    ]
+    seen = []
+    for word in _WORDS.findall(" ".join(part for part in parts if part).lower()):
+        if word not in seen:
+            seen.append(word)
+    return " ".join(seen)
+
+
+def fill_search_text(apps, schema_editor):
+    Profile = apps.get_model("pct", "Profile")
+    batch = []
+    for profile in Profile.objects.select_related("user").iterator(chunk_size=1000):
+        profile.search_text = document(profile.user, profile)
+        batch.append(profile)
+        if len(batch) == 1000:
+            Profile.objects.bulk_update(batch, ["search_text"])
+            batch = []
+    Profile.objects.bulk_update(batch, ["search_text"])
+
+
+def create_search_index(apps, schema_editor):
+    """GIN index on PostgreSQL, FTS5 table on SQLite; other databases fall back to icontains."""
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        # Kept up to date by PostgreSQL itself, so ranking reads stored vectors.
+        schema_editor.execute(
+            f"ALTER TABLE pct_profile ADD COLUMN {SEARCH_VECTOR} tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, search_text)) STORED"
+        )
+        schema_editor.execute(f"CREATE INDEX {GIN_INDEX} ON pct_profile USING gin ({SEARCH_VECTOR})")
+    elif vendor == "sqlite":
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            if not cursor.fetchone()[0]:
+                return
+        schema_editor.execute(f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(document)")
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, document) SELECT user_id, search_text FROM pct_profile"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(f"ALTER TABLE pct_profile DROP COLUMN IF EXISTS {SEARCH_VECTOR}")
+    elif vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pct', '0017_activitylog_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(fill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
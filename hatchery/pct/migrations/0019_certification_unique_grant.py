@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:36
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def drop_duplicate_grants(apps, schema_editor):
+    """Keep the oldest copy of each (profile, type, level) so the constraint can be added."""
+    Certification = apps.get_model("pct", "Certification")
+    duplicates = (
+        Certification.objects.filter(profile__isnull=False)
+        .values("profile", "type", "level")
+        .annotate(keep=Min("id"), copies=Count("id"))
+        .filter(copies__gt=1)
+        .order_by()
+    )
+    for group in duplicates:
+        Certification.objects.filter(
+            profile=group["profile"], type=group["type"], level=group["level"]
+        ).exclude(pk=group["keep"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pct', '0018_profile_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_grants, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='certification',
+            constraint=models.UniqueConstraint(fields=('profile', 'type', 'level'), name='pct_certification_unique_grant'),
+        ),
+    ]
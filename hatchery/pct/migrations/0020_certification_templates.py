@@ -0,0 +1,60 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:45
+
+import django.db.models.deletion
+from django.core.management.color import no_style
+from django.db import migrations, models
+
+
+def move_templates(apps, schema_editor):
+    """Move the profile-less Certification rows into the catalog, keeping their ids.
+
+    Ids are kept so the add-certifications selections in open sessions still
+    resolve. Of duplicate (type, level) templates only the oldest survives.
+    """
+    connection = schema_editor.connection
+    schema_editor.execute(
+        "INSERT INTO pct_certificationtemplate (id, type_id, level_id, created_at) "
+        "SELECT id, type_id, level_id, created_at FROM pct_certification template "
+        "WHERE profile_id IS NULL AND id = ("
+        "  SELECT MIN(id) FROM pct_certification other"
+        "  WHERE other.profile_id IS NULL AND other.type_id = template.type_id AND other.level_id = template.level_id"
+        ")"
+    )
+    schema_editor.execute("DELETE FROM pct_certification WHERE profile_id IS NULL")
+    for sql in connection.ops.sequence_reset_sql(no_style(), [apps.get_model("pct", "CertificationTemplate")]):
+        schema_editor.execute(sql)
+
+
+def restore_templates(apps, schema_editor):
+    schema_editor.execute(
+        "INSERT INTO pct_certification (type_id, level_id, created_at, profile_id) "
+        "SELECT type_id, level_id, created_at, NULL FROM pct_certificationtemplate"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pct', '0019_certification_unique_grant'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CertificationTemplate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('level', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='pct.certificationlevel')),
+                ('type', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='pct.certificationtype')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('type', 'level'), name='pct_certificationtemplate_unique')],
+            },
+        ),
+        migrations.RunPython(move_templates, restore_templates),
+        migrations.AlterField(
+            model_name='certification',
+            name='profile',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='certificates', to='pct.profile'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pct', '0020_certification_templates'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='roomreservation',
+            name='pct_resv_status_start_idx',
+        ),
+        migrations.AddIndex(
+            model_name='roomreservation',
+            index=models.Index(fields=['status', 'start_time', 'id'], name='pct_resv_status_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='roomreservation',
+            index=models.Index(fields=['room', 'start_time', 'id'], name='pct_resv_room_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='roomreservation',
+            index=models.Index(fields=['start_time', 'id'], name='pct_resv_start_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.6 on 2026-10-17 22:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pct', '0021_reservation_queue_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomReservationSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('room', models.CharField(choices=[('second_hatch_front', 'Second Floor • Hatch Front'), ('second_hatch_back', 'Second Floor • Hatch Back'), ('third_proto_studio', 'Third Floor • Prototyping Studio'), ('third_proto_shop', 'Third Floor • Prototyping Shop')], max_length=32)),
+                ('weekdays', models.CharField(max_length=13)),
+                ('first_date', models.DateField()),
+                ('last_date', models.DateField()),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('affiliation', models.CharField(help_text='Class or organization', max_length=255)),
+                ('is_exclusive_request', models.BooleanField(default=False)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('denied', 'Denied')], default='pending', max_length=20)),
+                ('reviewed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('requester', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='room_reservation_series', to='pct.profile')),
+                ('reviewed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='room_reservation_series_reviewed', to='pct.profile')),
+                ('semester', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='room_reservation_series', to='pct.semester')),
+            ],
+            options={
+                'verbose_name_plural': 'room reservation series',
+                'ordering': ['-first_date', '-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='roomreservation',
+            name='series',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='pct.roomreservationseries'),
+        ),
+    ]
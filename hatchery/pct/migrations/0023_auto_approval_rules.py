@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-17 22:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pct', '0022_room_reservation_series'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AutoApprovalRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('room', models.CharField(blank=True, choices=[('second_hatch_front', 'Second Floor • Hatch Front'), ('second_hatch_back', 'Second Floor • Hatch Back'), ('third_proto_studio', 'Third Floor • Prototyping Studio'), ('third_proto_shop', 'Third Floor • Prototyping Shop')], help_text='Leave blank to match every room.', max_length=32)),
+                ('max_duration', models.DurationField(help_text='Longest reservation the rule approves (HH:MM:SS).')),
+                ('requester_role', models.CharField(blank=True, choices=[('student', 'Student'), ('staff', 'Staff'), ('admin', 'Admin'), ('team_member', 'Team Member')], help_text='Leave blank to match every role.', max_length=20)),
+                ('allow_exclusive', models.BooleanField(default=False, help_text='Also approve exclusive-use requests.')),
+                ('require_open_hours', models.BooleanField(default=True, help_text="Only approve requests inside the semester's open hours.")),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='roomreservation',
+            name='approval_rule',
+            field=models.ForeignKey(blank=True, help_text='Set when the reservation was approved automatically.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='approved_reservations', to='pct.autoapprovalrule'),
+        ),
+    ]
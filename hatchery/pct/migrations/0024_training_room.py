@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-17 22:14
+
+import datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pct', '0023_auto_approval_rules'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='training',
+            name='duration',
+            field=models.DurationField(default=datetime.timedelta(seconds=3600), help_text='How long the session runs (HH:MM:SS).'),
+        ),
+        migrations.AddField(
+            model_name='training',
+            name='room',
+            field=models.CharField(blank=True, choices=[('second_hatch_front', 'Second Floor • Hatch Front'), ('second_hatch_back', 'Second Floor • Hatch Back'), ('third_proto_studio', 'Third Floor • Prototyping Studio'), ('third_proto_shop', 'Third Floor • Prototyping Shop')], help_text='Where the session runs; it holds the room for its duration.', max_length=32),
+        ),
+        migrations.AddIndex(
+            model_name='shift',
+            index=models.Index(fields=['location', 'start'], name='pct_shift_location_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='training',
+            index=models.Index(fields=['room', 'time'], name='pct_training_room_time_idx'),
+        ),
+    ]
@@ -59,6 +59,9 @@ class Profile(models.Model):
     ban_expires_at = models.DateTimeField(blank=True, null=True)
     banned_at = models.DateTimeField(blank=True, null=True)
     ban_reason = models.TextField(blank=True, null=True)
+
+    # Lowercased words from the user's names and emails; see pct.user_search.
+    search_text = models.TextField(blank=True, default="", editable=False)
     
     def __str__(self):
         return f"{self.user.username}'s profile"
@@ -108,10 +111,18 @@ class ActivityLog(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='activity_logs')
     action = models.CharField(max_length=20, choices=ACTION_CHOICES)
     description = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the event happens rather than on insert; pct.activity writes in batches.
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
+        # Keyset pagination of the admin feed (pct.activity.feed), unfiltered
+        # and filtered by user or action.
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='pct_activitylog_created_idx'),
+            models.Index(fields=['user', '-created_at', '-id'], name='pct_activitylog_user_idx'),
+            models.Index(fields=['action', '-created_at', '-id'], name='pct_activitylog_action_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.action}"
@@ -168,15 +179,44 @@ class CertificationLevel(models.Model):
     def __str__(self):
         return f"Level {self.level}"
 
+class CertificationTemplate(models.Model):
+    """A certification staff can grant: the catalog the add-certifications page offers."""
+    type = models.ForeignKey(CertificationType, on_delete=models.PROTECT)
+    level = models.ForeignKey(CertificationLevel, on_delete=models.PROTECT)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["type", "level"], name="pct_certificationtemplate_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.type.name} - level {self.level.level}"
+
 class Certification(models.Model):
-    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="certificates", null=True, blank=True) #just added this line extension: 
+    """A certification held by a profile (granted from a CertificationTemplate)."""
+    # Indexed by the unique constraint below, which leads with profile.
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="certificates", db_index=False)
     type = models.ForeignKey(CertificationType, on_delete=models.PROTECT)
     level = models.ForeignKey(CertificationLevel, on_delete=models.PROTECT)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["profile", "type", "level"], name="pct_certification_unique_grant"),
+        ]
+
     def __str__(self):
-        owner = self.profile.user.username if self.profile and self.profile.user_id else "unassigned"
-        return f"{self.type.name} - level {self.level.level} ({owner})"
+        return f"{self.type.name} - level {self.level.level} ({self.profile.user.username})"
+
+class Room(models.TextChoices):
+    """The reservable Hatchery spaces; shifts and trainings are placed in them too."""
+
+    HATCH_FRONT = "second_hatch_front", "Second Floor • Hatch Front"
+    HATCH_BACK = "second_hatch_back", "Second Floor • Hatch Back"
+    PROTO_STUDIO = "third_proto_studio", "Third Floor • Prototyping Studio"
+    PROTO_SHOP = "third_proto_shop", "Third Floor • Prototyping Shop"
+
 
 class Training(models.Model):
     name = models.CharField(max_length = 200)
@@ -190,12 +230,12 @@ class Training(models.Model):
         related_name="trainings",
         help_text="Select which certification track this session advances.",
     )
-    student = models.ForeignKey(
+    students = models.ManyToManyField(
         Profile,
-        on_delete=models.SET_NULL, null=True,
-        blank=True, related_name="trainings_booked",
-        limit_choices_to={"role__in": list(Profile.USER_ROLES) + ["staff"]},
-        )
+        through="TrainingSeat",
+        blank=True,
+        related_name="trainings_booked",
+    )
     staff = models.ForeignKey(
         Profile,
         on_delete=models.SET_NULL,
@@ -206,14 +246,61 @@ class Training(models.Model):
     )
 
     time = models.DateTimeField(blank=True, null=True)
+    duration = models.DurationField(default=timedelta(hours=1), help_text="How long the session runs (HH:MM:SS).")
+    room = models.CharField(
+        max_length=32,
+        choices=Room.choices,
+        blank=True,
+        help_text="Where the session runs; it holds the room for its duration.",
+    )
+
+    capacity = models.PositiveIntegerField(default=1)
+    # Maintained by pct.booking so list pages can check fullness without
+    # counting seat or waitlist rows.
+    seats_taken = models.PositiveIntegerField(default=0, editable=False)
+    seats_held = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Seats held for outstanding waitlist invitations.",
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["time"], name="pct_training_time_idx"),
+            # Room timeline conflict checks (pct/room_timeline.py).
+            models.Index(fields=["room", "time"], name="pct_training_room_time_idx"),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(seats_taken__lte=models.F("capacity")),
+                name="pct_training_seats_within_capacity",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.machine})"
-    
-    capacity = models.PositiveIntegerField(default=1) 
+
+    @property
+    def open_seats(self):
+        return max(self.capacity - self.seats_taken - self.seats_held, 0)
 
     def is_full(self):
-        return self.student is not None
+        return self.open_seats == 0
+
+
+class TrainingSeat(models.Model):
+    training = models.ForeignKey(Training, on_delete=models.CASCADE, related_name="seats")
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="training_seats")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["training", "profile"], name="pct_seat_unique_profile"),
+        ]
+
+    def __str__(self):
+        return f"{self.profile.get_full_name()} in {self.training.name}"
 
 class TrainingCancellationRequest(models.Model):
     class Status(models.TextChoices):
@@ -238,11 +325,7 @@ class TrainingCancellationRequest(models.Model):
 
 
 class RoomReservation(models.Model):
-    class RoomChoices(models.TextChoices):
-        HATCH_FRONT = "second_hatch_front", "Second Floor • Hatch Front"
-        HATCH_BACK = "second_hatch_back", "Second Floor • Hatch Back"
-        PROTO_STUDIO = "third_proto_studio", "Third Floor • Prototyping Studio"
-        PROTO_SHOP = "third_proto_shop", "Third Floor • Prototyping Shop"
+    RoomChoices = Room
 
     class StatusChoices(models.TextChoices):
         PENDING = "pending", "Pending"
@@ -275,11 +358,40 @@ class RoomReservation(models.Model):
         related_name="room_reservations_reviewed",
     )
     reviewed_at = models.DateTimeField(null=True, blank=True)
+    series = models.ForeignKey(
+        "RoomReservationSeries",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="occurrences",
+    )
+    approval_rule = models.ForeignKey(
+        "AutoApprovalRule",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="approved_reservations",
+        help_text="Set when the reservation was approved automatically.",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-start_time", "-created_at"]
+        indexes = [
+            # Overlap checks only consider reservations that still hold the room.
+            models.Index(
+                fields=["room", "start_time", "end_time"],
+                condition=~models.Q(status="denied"),
+                name="pct_resv_room_active_idx",
+            ),
+            # Moderation queues page on (start_time, id), optionally per status or room.
+            models.Index(fields=["status", "start_time", "id"], name="pct_resv_status_start_idx"),
+            models.Index(fields=["room", "start_time", "id"], name="pct_resv_room_start_idx"),
+            models.Index(fields=["start_time", "id"], name="pct_resv_start_idx"),
+        ]
+        # PostgreSQL also gets an exclusion constraint (migration 0014) that
+        # rejects overlapping non-denied reservations for the same room.
 
     def clean(self):
         super().clean()
@@ -288,25 +400,101 @@ class RoomReservation(models.Model):
                 raise ValidationError("End time must be after the start time.")
             if self.start_time.date() != self.end_time.date():
                 raise ValidationError("Reservations must start and end on the same day.")
-            overlapping = (
-                RoomReservation.objects.exclude(pk=self.pk)
-                .exclude(status=self.StatusChoices.DENIED)
-                .filter(
-                    room=self.room,
-                    start_time__lt=self.end_time,
-                    end_time__gt=self.start_time,
-                )
-            )
-            if overlapping.exists():
-                raise ValidationError(
-                    {"start_time": "This room is already reserved during the selected time."}
-                )
+            if self.status != self.StatusChoices.DENIED:
+                from . import room_timeline
+
+                conflicts = room_timeline.conflicts_for(room_timeline.reservation_slot(self))
+                if conflicts:
+                    raise ValidationError(room_timeline.describe(conflicts))
 
     def __str__(self):
         return (
             f"{self.get_room_display()} on {self.start_time:%Y-%m-%d} "
             f"from {self.start_time:%H:%M} to {self.end_time:%H:%M}"
         )
+class RoomReservationSeries(models.Model):
+    """A weekly recurring room booking; its dates are RoomReservation occurrences."""
+
+    requester = models.ForeignKey(
+        Profile,
+        on_delete=models.CASCADE,
+        related_name="room_reservation_series",
+    )
+    room = models.CharField(max_length=32, choices=RoomReservation.RoomChoices.choices)
+    semester = models.ForeignKey(
+        "Semester",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="room_reservation_series",
+    )
+    # Comma-separated weekday numbers, 0 = Monday (e.g. "1,3" for Tuesdays and Thursdays).
+    weekdays = models.CharField(max_length=13)
+    first_date = models.DateField()
+    last_date = models.DateField()
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    affiliation = models.CharField(max_length=255, help_text="Class or organization")
+    is_exclusive_request = models.BooleanField(default=False)
+    status = models.CharField(
+        max_length=20,
+        choices=RoomReservation.StatusChoices.choices,
+        default=RoomReservation.StatusChoices.PENDING,
+    )
+    reviewed_by = models.ForeignKey(
+        Profile,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="room_reservation_series_reviewed",
+    )
+    reviewed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-first_date", "-created_at"]
+        verbose_name_plural = "room reservation series"
+
+    @property
+    def weekday_numbers(self):
+        return [int(day) for day in self.weekdays.split(",") if day]
+
+    def __str__(self):
+        return f"{self.get_room_display()} weekly from {self.first_date} to {self.last_date}"
+
+
+class AutoApprovalRule(models.Model):
+    """Approve a room request without staff review when it meets every condition."""
+
+    name = models.CharField(max_length=100)
+    room = models.CharField(
+        max_length=32,
+        choices=RoomReservation.RoomChoices.choices,
+        blank=True,
+        help_text="Leave blank to match every room.",
+    )
+    max_duration = models.DurationField(help_text="Longest reservation the rule approves (HH:MM:SS).")
+    requester_role = models.CharField(
+        max_length=20,
+        choices=Profile.ROLE_CHOICES,
+        blank=True,
+        help_text="Leave blank to match every role.",
+    )
+    allow_exclusive = models.BooleanField(default=False, help_text="Also approve exclusive-use requests.")
+    require_open_hours = models.BooleanField(
+        default=True,
+        help_text="Only approve requests inside the semester's open hours.",
+    )
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+
 class WorkBlock(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     title = models.CharField(max_length=100, default="Work Block")
@@ -375,6 +563,11 @@ class Shift(models.Model):
 
     class Meta:
         ordering = ["start"]
+        indexes = [
+            models.Index(fields=["schedule_week", "assigned_to"], name="pct_shift_week_assignee_idx"),
+            # Room timeline conflict checks (pct/room_timeline.py).
+            models.Index(fields=["location", "start"], name="pct_shift_location_start_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} @ {self.start}"
@@ -405,38 +598,20 @@ class Shift(models.Model):
             local_start = timezone.localtime(self.start) if timezone.is_aware(self.start) else self.start
             local_end = timezone.localtime(self.end) if timezone.is_aware(self.end) else self.end
 
-            start_semester = (
-                Semester.objects.filter(
-                    is_active=True,
-                    start_date__lte=local_start.date(),
-                    end_date__gte=local_start.date(),
-                )
-                .order_by("-start_date")
-                .first()
-            )
-            end_semester = (
-                Semester.objects.filter(
-                    is_active=True,
-                    start_date__lte=local_end.date(),
-                    end_date__gte=local_end.date(),
-                )
-                .order_by("-start_date")
-                .first()
-            )
+            from .semester_calendar import get_calendar
+
+            calendar = get_calendar()
+            start_semester = calendar.semester_for_date(local_start.date())
+            end_semester = calendar.semester_for_date(local_end.date())
             if not start_semester or not end_semester or start_semester.pk != end_semester.pk:
                 message = "Shift must start and end within an active semester."
                 raise ValidationError({"start": message, "end": message})
 
             semester = start_semester
-            if semester.holidays.filter(date=local_start.date()).exists():
+            if calendar.is_holiday(semester, local_start.date()):
                 raise ValidationError({"start": f"{local_start.date()} is marked as a holiday for {semester.name}."})
 
-            open_hours = semester.open_hours.filter(
-                weekday=local_start.weekday(),
-                open_time__lte=local_start.time(),
-                close_time__gte=local_end.time(),
-            )
-            if not open_hours.exists():
+            if not calendar.within_open_hours(semester, local_start, local_end):
                 raise ValidationError({"start": f"This shift is outside the open hours for {semester.name}."})
 
         if (
@@ -553,6 +728,9 @@ class TrainingWaitlist(models.Model):
     class Meta:
         unique_together = ('training', 'profile')
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['training', 'status', 'created_at'], name='pct_waitlist_queue_idx'),
+        ]
 
     def __str__(self):
         return f"{self.profile.get_full_name()} waiting for {self.training.name}"
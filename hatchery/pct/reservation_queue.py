@@ -0,0 +1,105 @@
+"""
+Staff moderation queues for room reservations.
+
+page() returns one filtered page of reservations ordered on (start_time, id)
+with a keyset cursor, like activity.feed(): the pending queue reads soonest
+first, the history newest first, and each page is a single index range scan
+however deep into the queue it is.
+
+moderate() approves or denies one reservation. The reservations page and the
+moderation API both go through it.
+"""
+
+import base64
+from datetime import datetime, time, timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import RoomReservation
+
+PAGE_SIZE = 25
+
+
+class ModerationError(Exception):
+    """A moderation action was refused; the message is safe to show to the user."""
+
+
+def encode_cursor(reservation):
+    raw = f"{reservation.start_time.isoformat()}|{reservation.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Return (start_time, id) from a cursor, or None if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        start_time, pk = raw.rsplit("|", 1)
+        return datetime.fromisoformat(start_time), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def page(
+    status=None,
+    room=None,
+    requester_id=None,
+    date_from=None,
+    date_to=None,
+    cursor=None,
+    newest_first=True,
+    limit=None,
+):
+    """Return (reservations, next_cursor) for one page of the queue.
+
+    date_from and date_to are inclusive local dates matched against
+    start_time. next_cursor is None on the last page.
+    """
+    limit = limit or PAGE_SIZE
+    reservations = RoomReservation.objects.select_related("requester__user", "reviewed_by__user")
+    if status:
+        reservations = reservations.filter(status=status)
+    if room:
+        reservations = reservations.filter(room=room)
+    if requester_id is not None:
+        reservations = reservations.filter(requester__user_id=requester_id)
+    if date_from:
+        reservations = reservations.filter(start_time__gte=timezone.make_aware(datetime.combine(date_from, time.min)))
+    if date_to:
+        reservations = reservations.filter(
+            start_time__lt=timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min))
+        )
+    position = decode_cursor(cursor) if cursor else None
+    if newest_first:
+        reservations = reservations.order_by("-start_time", "-id")
+        if position:
+            start_time, pk = position
+            reservations = reservations.filter(Q(start_time__lt=start_time) | Q(start_time=start_time, id__lt=pk))
+    else:
+        reservations = reservations.order_by("start_time", "id")
+        if position:
+            start_time, pk = position
+            reservations = reservations.filter(Q(start_time__gt=start_time) | Q(start_time=start_time, id__gt=pk))
+    rows = list(reservations[: limit + 1])
+    if len(rows) > limit:
+        return rows[:limit], encode_cursor(rows[limit - 1])
+    return rows, None
+
+
+def moderate(reservation, approve, reviewer):
+    """Approve or deny reservation as reviewer; return whether its status changed."""
+    new_status = RoomReservation.StatusChoices.APPROVED if approve else RoomReservation.StatusChoices.DENIED
+    if reservation.status == new_status:
+        return False
+    reservation.status = new_status
+    reservation.reviewed_by = reviewer
+    reservation.reviewed_at = timezone.now()
+    try:
+        # The database rejects overlapping bookings on PostgreSQL.
+        with transaction.atomic():
+            reservation.save()
+    except IntegrityError:
+        reservation.refresh_from_db()
+        raise ModerationError("Another reservation already holds this room at that time.")
+    return True
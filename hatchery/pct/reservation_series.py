@@ -0,0 +1,169 @@
+"""
+Weekly recurring room reservations.
+
+A RoomReservationSeries books one room at the same local time on some
+weekdays between two dates, usually a semester's; dates that are holidays of
+that semester are left out. Each remaining date becomes a RoomReservation
+occurrence linked to the series.
+
+book() checks every occurrence against the room's timeline (reservations,
+shifts and trainings; see pct.room_timeline) in one batch and reports the
+conflicts per occurrence. Without conflicts
+(or with skip_conflicts, which books only the free dates) the series and its
+occurrences are written with one bulk_create and one ActivityLog entry.
+moderate() approves or denies a whole series with one UPDATE.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from . import activity, room_timeline, semester_calendar
+from .models import RoomReservation, RoomReservationSeries
+
+
+class SeriesError(Exception):
+    """A series was refused; the message is safe to show to the user."""
+
+
+class SeriesConflict(SeriesError):
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+        dates = ", ".join(f"{start:%a %b} {start.day}" for start, _ in conflicts)
+        super().__init__(f"The room is already reserved on {dates}.")
+
+
+@dataclass
+class SeriesResult:
+    series: RoomReservationSeries = None
+    created: int = 0
+    # (start, end) -> the room_timeline.Slots already holding the room then.
+    conflicts: dict = field(default_factory=dict)
+
+
+def occurrence_dates(weekdays, first_date, last_date, semester=None, calendar=None):
+    """Return the dates from first_date to last_date on the given weekdays, holidays of semester skipped."""
+    calendar = calendar or semester_calendar.get_calendar()
+    weekdays = set(weekdays)
+    dates = []
+    day = first_date
+    while day <= last_date:
+        if day.weekday() in weekdays and not calendar.is_holiday(semester, day):
+            dates.append(day)
+        day += timedelta(days=1)
+    return dates
+
+
+def occurrences(dates, start_time, end_time):
+    """Return the aware (start, end) of each date; wall-clock times hold across DST changes."""
+    return [
+        (
+            timezone.make_aware(datetime.combine(day, start_time)),
+            timezone.make_aware(datetime.combine(day, end_time)),
+        )
+        for day in dates
+    ]
+
+
+def conflicts(room, slots, is_exclusive_request=False):
+    """Map each (start, end) in slots that clashes with the room's timeline to the room_timeline.Slots it clashes with.
+
+    Checks every occurrence at once: one query per kind of entry over the whole range.
+    """
+    candidates = [
+        room_timeline.Slot(room_timeline.RESERVATION, room, start, end, exclusive=is_exclusive_request)
+        for start, end in slots
+    ]
+    return {
+        (candidate.start, candidate.end): clashes
+        for candidate, clashes in zip(candidates, room_timeline.find_conflicts(candidates))
+        if clashes
+    }
+
+
+def book(
+    requester,
+    room,
+    weekdays,
+    start_time,
+    end_time,
+    first_date,
+    last_date,
+    affiliation,
+    semester=None,
+    is_exclusive_request=False,
+    skip_conflicts=False,
+):
+    """Request a weekly series; raise SeriesConflict unless skip_conflicts books around conflicts."""
+    if end_time <= start_time:
+        raise SeriesError("End time must be after the start time.")
+    first_date = max(first_date, timezone.localdate())
+    slots = occurrences(occurrence_dates(weekdays, first_date, last_date, semester), start_time, end_time)
+    if not slots:
+        raise SeriesError("No dates fall on the chosen weekdays between the first and last date.")
+
+    result = SeriesResult(conflicts=conflicts(room, slots, is_exclusive_request))
+    if result.conflicts and not skip_conflicts:
+        raise SeriesConflict(result.conflicts)
+    free = [slot for slot in slots if slot not in result.conflicts]
+    if not free:
+        raise SeriesConflict(result.conflicts)
+
+    try:
+        with transaction.atomic():
+            result.series = RoomReservationSeries.objects.create(
+                requester=requester,
+                room=room,
+                semester=semester,
+                weekdays=",".join(str(day) for day in sorted(set(weekdays))),
+                first_date=free[0][0].date(),
+                last_date=free[-1][0].date(),
+                start_time=start_time,
+                end_time=end_time,
+                affiliation=affiliation,
+                is_exclusive_request=is_exclusive_request,
+            )
+            # bulk_create skips post_save, so log_reservation_activity doesn't log each date.
+            created = RoomReservation.objects.bulk_create(
+                RoomReservation(
+                    requester=requester,
+                    room=room,
+                    start_time=start,
+                    end_time=end,
+                    affiliation=affiliation,
+                    is_exclusive_request=is_exclusive_request,
+                    series=result.series,
+                )
+                for start, end in free
+            )
+    except IntegrityError:
+        # The PostgreSQL exclusion constraint caught a booking made since conflicts() ran.
+        raise SeriesError("Another reservation was booked for one of these dates meanwhile. Please try again.")
+    result.created = len(created)
+    activity.record(
+        requester.user,
+        "reservation",
+        f"Requested recurring room reservation: {result.series.get_room_display()} ({result.created} dates)",
+    )
+    return result
+
+
+def moderate(series, approve, reviewer):
+    """Approve the series' pending occurrences or deny all of them; return how many changed."""
+    rows = series.occurrences.all()
+    if approve:
+        new_status = RoomReservation.StatusChoices.APPROVED
+        rows = rows.filter(status=RoomReservation.StatusChoices.PENDING)
+    else:
+        new_status = RoomReservation.StatusChoices.DENIED
+        rows = rows.exclude(status=new_status)
+    now = timezone.now()
+    with transaction.atomic():
+        changed = rows.update(status=new_status, reviewed_by=reviewer, reviewed_at=now, updated_at=now)
+        series.status = new_status
+        series.reviewed_by = reviewer
+        series.reviewed_at = now
+        series.save(update_fields=["status", "reviewed_by", "reviewed_at"])
+    return changed
@@ -0,0 +1,128 @@
+"""
+Free time in the reservable rooms.
+
+free_slots() answers "when can I book this room (or any room) on this day for
+at least this long" without trial submissions. It reads what holds the rooms
+that day from pct.room_timeline (non-denied reservations, exclusive bookings
+among them, and trainings; one query each) and the semester's open hours from
+the cached semester calendar, merges each room's busy intervals and returns
+the gaps inside the open hours.
+
+Gaps are trimmed to the reservation form's 15-minute grid, so every
+suggestion can be submitted as is.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+from . import room_timeline, semester_calendar
+from .models import RoomReservation
+
+SLOT_STEP = timedelta(minutes=15)
+
+
+@dataclass
+class FreeSlot:
+    room: str
+    start: datetime
+    end: datetime
+
+    @property
+    def room_label(self):
+        return RoomReservation.RoomChoices(self.room).label
+
+
+def merge(intervals):
+    """Merge overlapping or touching (start, end) intervals into sorted disjoint ones."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def gaps(window_start, window_end, busy):
+    """Return the parts of [window_start, window_end) not covered by the merged busy intervals."""
+    free = []
+    cursor = window_start
+    for start, end in busy:
+        if end <= cursor:
+            continue
+        if start >= window_end:
+            break
+        if start > cursor:
+            free.append((cursor, start))
+        cursor = max(cursor, end)
+    if cursor < window_end:
+        free.append((cursor, window_end))
+    return free
+
+
+def _ceil_to_step(moment):
+    midnight = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    steps = -(-(moment - midnight) // SLOT_STEP)
+    return midnight + steps * SLOT_STEP
+
+
+def _floor_to_step(moment):
+    midnight = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight + ((moment - midnight) // SLOT_STEP) * SLOT_STEP
+
+
+def open_windows(target_date):
+    """Return the day's bookable (start, end) windows as aware datetimes.
+
+    Inside an active semester these are its open hours (none on holidays);
+    outside one the whole day is bookable, as for shifts.
+    """
+    calendar = semester_calendar.get_calendar()
+    semester = calendar.semester_for_date(target_date)
+    if not semester:
+        windows = [(time.min, time(23, 45))]
+    elif calendar.is_holiday(semester, target_date):
+        windows = []
+    else:
+        windows = calendar.open_windows(semester, target_date.weekday())
+    return [
+        (
+            timezone.make_aware(datetime.combine(target_date, open_time)),
+            timezone.make_aware(datetime.combine(target_date, close_time)),
+        )
+        for open_time, close_time in windows
+    ]
+
+
+def free_slots(target_date, min_duration, room=None):
+    """Return the FreeSlots of at least min_duration on target_date, by room then time.
+
+    With room=None every room is searched.
+    """
+    rooms = [room] if room else list(RoomReservation.RoomChoices.values)
+    windows = merge(open_windows(target_date))
+    if not windows:
+        return []
+
+    # A request spanning the whole day clashes with everything that would block part of it.
+    day = {
+        name: room_timeline.Slot(room_timeline.RESERVATION, name, windows[0][0], windows[-1][1])
+        for name in rooms
+    }
+    busy = {name: [] for name in rooms}
+    for held in room_timeline.occupants(list(day.values())):
+        if day[held.room].clashes_with(held):
+            busy[held.room].append((held.start, held.end))
+
+    earliest = timezone.now()
+    slots = []
+    for name in rooms:
+        taken = merge(busy[name])
+        for window_start, window_end in windows:
+            for start, end in gaps(max(window_start, earliest), window_end, taken):
+                start, end = _ceil_to_step(timezone.localtime(start)), _floor_to_step(timezone.localtime(end))
+                if end > start and end - start >= min_duration:
+                    slots.append(FreeSlot(name, start, end))
+    return slots
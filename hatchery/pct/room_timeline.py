@@ -0,0 +1,134 @@
+"""
+Who holds a room when: reservations, shifts and trainings on one timeline.
+
+Reservations name their room in ``room``, shifts in ``location`` and trainings
+in ``room`` (trainings run from ``time`` for ``duration``). Overlapping
+reservations and trainings conflict with each other, as two reservations
+always have. Shifts staff a room whatever else happens in it, so a shift only
+conflicts with an exclusive reservation.
+
+find_conflicts() checks any number of candidate Slots, say a week's shifts
+and trainings, with at most one query per entry type over the span and rooms
+they cover; types no candidate can clash with aren't queried at all.
+conflicts_for() checks a single candidate, which is what the model and form
+clean() methods use.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.db.models import DateTimeField, ExpressionWrapper, F
+
+from .models import RoomReservation, Shift, Training
+
+RESERVATION = "reservation"
+SHIFT = "shift"
+TRAINING = "training"
+
+
+@dataclass(frozen=True)
+class Slot:
+    kind: str
+    room: str
+    start: datetime
+    end: datetime
+    exclusive: bool = False
+    pk: int = None
+    label: str = ""
+
+    def clashes_with(self, other):
+        if (self.kind, self.pk) == (other.kind, other.pk) and self.pk is not None:
+            return False
+        if self.room != other.room or self.start >= other.end or other.start >= self.end:
+            return False
+        if SHIFT in (self.kind, other.kind):
+            return any(slot.kind == RESERVATION and slot.exclusive for slot in (self, other))
+        return True
+
+
+def reservation_slot(reservation):
+    if not (reservation.room and reservation.start_time and reservation.end_time):
+        return None
+    return Slot(
+        RESERVATION,
+        reservation.room,
+        reservation.start_time,
+        reservation.end_time,
+        exclusive=reservation.is_exclusive_request,
+        pk=reservation.pk,
+        label=f"{'an exclusive ' if reservation.is_exclusive_request else 'a '}room reservation",
+    )
+
+
+def shift_slot(shift):
+    if not (shift.location and shift.start and shift.end):
+        return None
+    return Slot(SHIFT, shift.location, shift.start, shift.end, pk=shift.pk, label=f"the shift {shift.title}")
+
+
+def training_slot(training):
+    if not (training.room and training.time and training.duration):
+        return None
+    return Slot(
+        TRAINING,
+        training.room,
+        training.time,
+        training.time + training.duration,
+        pk=training.pk,
+        label=f"the training {training.name}",
+    )
+
+
+def occupants(candidates):
+    """Read the entries any candidate could clash with, one query per entry type at most."""
+    rooms = {candidate.room for candidate in candidates}
+    start = min(candidate.start for candidate in candidates)
+    end = max(candidate.end for candidate in candidates)
+    only_shifts = all(candidate.kind == SHIFT for candidate in candidates)
+
+    reservations = RoomReservation.objects.exclude(status=RoomReservation.StatusChoices.DENIED).filter(
+        room__in=rooms, start_time__lt=end, end_time__gt=start
+    )
+    if only_shifts:
+        # Only exclusive reservations can clash with shifts.
+        reservations = reservations.filter(is_exclusive_request=True)
+    held = [reservation_slot(reservation) for reservation in reservations.order_by()]
+
+    if any(candidate.kind == RESERVATION and candidate.exclusive for candidate in candidates):
+        shifts = Shift.objects.filter(location__in=rooms, start__lt=end, end__gt=start).order_by()
+        held.extend(shift_slot(shift) for shift in shifts)
+
+    if not only_shifts:
+        trainings = (
+            Training.objects.filter(room__in=rooms, time__lt=end)
+            .annotate(ends_at=ExpressionWrapper(F("time") + F("duration"), output_field=DateTimeField()))
+            .filter(ends_at__gt=start)
+            .order_by()
+        )
+        held.extend(training_slot(training) for training in trainings)
+    return held
+
+
+def find_conflicts(candidates):
+    """Return, for each candidate Slot, the list of Slots it clashes with."""
+    checked = [candidate for candidate in candidates if candidate is not None]
+    if not checked:
+        return [[] for _ in candidates]
+    held = sorted(occupants(checked), key=lambda slot: slot.start)
+    return [
+        [occupant for occupant in held if candidate.clashes_with(occupant)] if candidate else []
+        for candidate in candidates
+    ]
+
+
+def conflicts_for(candidate):
+    return find_conflicts([candidate])[0]
+
+
+def describe(conflicts):
+    """Return a sentence naming what already holds the room."""
+    labels = []
+    for slot in conflicts:
+        if slot.label not in labels:
+            labels.append(slot.label)
+    return f"The room is already taken at that time by {', '.join(labels)}."
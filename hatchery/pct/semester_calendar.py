@@ -0,0 +1,108 @@
+"""
+In-memory snapshot of the semester calendar: active semesters, their weekly
+open hours and their holidays.
+
+Shift and availability validation asks the same three questions many times
+per request (which semester is this date in, is it a holiday, is this slot
+within open hours), and the "apply to whole semester" loop asks them once per
+week. get_calendar() loads everything those checks need in three queries and
+keeps it in the Django cache, so the checks themselves are dictionary lookups.
+
+Saving or deleting a Semester, OpenHour or Holiday invalidates the snapshot
+(see pct.signals). Queryset .update() calls bypass signals; call invalidate()
+after them. With the default per-process locmem cache, other workers only see
+a change once SEMESTER_CALENDAR_TIMEOUT expires; set REDIS_URL to share the
+cache and make invalidation immediate everywhere.
+"""
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .models import Holiday, OpenHour, Semester
+
+CACHE_KEY = "pct:semester_calendar"
+
+
+class SemesterCalendar:
+    def __init__(self, semesters, open_hours, holidays):
+        # Newest first, matching the old order_by("-start_date").first() lookups.
+        self.semesters = sorted(semesters, key=lambda semester: semester.start_date, reverse=True)
+        self._open_hours = open_hours
+        self._holidays = holidays
+
+    @classmethod
+    def load(cls):
+        semesters = list(Semester.objects.filter(is_active=True))
+        semester_ids = [semester.pk for semester in semesters]
+
+        open_hours = defaultdict(list)
+        for semester_id, weekday, open_time, close_time in OpenHour.objects.filter(
+            semester_id__in=semester_ids
+        ).values_list("semester_id", "weekday", "open_time", "close_time"):
+            open_hours[(semester_id, weekday)].append((open_time, close_time))
+
+        holidays = defaultdict(set)
+        for semester_id, holiday_date in Holiday.objects.filter(semester_id__in=semester_ids).values_list(
+            "semester_id", "date"
+        ):
+            holidays[semester_id].add(holiday_date)
+
+        return cls(semesters, dict(open_hours), dict(holidays))
+
+    def semester_for_date(self, target_date):
+        """Return the newest active semester containing target_date, or None."""
+        if not target_date:
+            return None
+        for semester in self.semesters:
+            if semester.start_date <= target_date <= semester.end_date:
+                return semester
+        return None
+
+    def is_holiday(self, semester, target_date):
+        if not semester:
+            return False
+        return target_date in self._holidays.get(semester.pk, ())
+
+    def open_windows(self, semester, weekday):
+        """Return the (open_time, close_time) windows for a weekday (0 = Monday)."""
+        return self._open_hours.get((semester.pk, weekday), [])
+
+    def within_open_hours(self, semester, start_dt, end_dt):
+        """Return True if start/end fall inside one open-hours window for start's weekday.
+
+        Without a semester there is nothing to enforce, so every slot is allowed.
+        """
+        if not semester:
+            return True
+        start_time = start_dt.time()
+        end_time = end_dt.time()
+        return any(
+            open_time <= start_time and close_time >= end_time
+            for open_time, close_time in self.open_windows(semester, start_dt.weekday())
+        )
+
+
+def _cache():
+    return caches[getattr(settings, "SEMESTER_CALENDAR_CACHE", "default")]
+
+
+def get_calendar():
+    """Return the current SemesterCalendar, loading it if it isn't cached."""
+    calendar = _cache().get(CACHE_KEY)
+    if calendar is None:
+        calendar = SemesterCalendar.load()
+        _cache().set(CACHE_KEY, calendar, getattr(settings, "SEMESTER_CALENDAR_TIMEOUT", 60))
+    return calendar
+
+
+def invalidate():
+    """Drop the cached calendar now and again once the current transaction commits.
+
+    The second delete stops a concurrent request from caching the pre-commit
+    rows in between.
+    """
+    _cache().delete(CACHE_KEY)
+    transaction.on_commit(lambda: _cache().delete(CACHE_KEY))
@@ -0,0 +1,307 @@
+"""
+Automatic shift assignment for the schedule builder.
+
+Fills the unassigned shifts of a week from the availability people submitted,
+respecting the same rules staff apply by hand:
+
+* one of the person's availability windows covers the whole shift,
+* they hold every certification type the shift requires,
+* they are not already working an overlapping shift,
+* team members stay within the 20-hour weekly cap Shift.clean enforces.
+
+Shifts are handed out in rounds. Each round gives every person at most one
+more shift, so nobody can pick up two overlapping shifts or overshoot the cap
+inside a round and every round leaves a valid schedule behind. Within a round
+the shifts with the fewest eligible people go first, each to whoever has
+worked least so far.
+
+The pure-Python solver matches each round greedily. When NumPy and SciPy are
+installed the constraint checks are vectorised and each round is matched
+exactly with scipy.optimize.linear_sum_assignment, filling as many shifts as
+possible and then minimising the rise in everyone's squared hours.
+`manage.py benchmark_shift_solver` compares the two on synthetic weeks.
+"""
+
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .coverage import merge_windows
+from .models import Availability, Certification, Shift
+
+try:
+    import numpy as np
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # optional acceleration
+    np = None
+    linear_sum_assignment = None
+
+HAS_SCIPY = linear_sum_assignment is not None
+
+WEEKLY_HOUR_CAP = timedelta(hours=20)
+CAPPED_ROLES = ("team_member",)
+
+
+@dataclass(frozen=True)
+class OpenShift:
+    """A shift to fill; times are POSIX seconds."""
+
+    id: int
+    start: int
+    end: int
+    required: frozenset = frozenset()
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+
+@dataclass
+class Candidate:
+    """Someone who submitted availability for the week; times are POSIX seconds."""
+
+    id: int
+    windows: list
+    certifications: frozenset = frozenset()
+    booked: list = field(default_factory=list)
+    load: int = 0
+    cap: int = None
+
+    def qualifies(self, shift):
+        """Availability and certification checks, which don't change while solving."""
+        return shift.required <= self.certifications and any(
+            start <= shift.start and end >= shift.end for start, end in self.windows
+        )
+
+    def is_free(self, shift):
+        """Overlap and hour-cap checks against what the person already works."""
+        if self.cap is not None and self.load + shift.duration > self.cap:
+            return False
+        return not any(start < shift.end and end > shift.start for start, end in self.booked)
+
+    def take(self, shift):
+        self.booked.append((shift.start, shift.end))
+        self.load += shift.duration
+
+
+def solve(shifts, candidates, accelerate=None):
+    """Return {shift id: candidate id} for the shifts that can be filled.
+
+    candidates are updated in place (booked, load) as shifts are handed out.
+    accelerate=None uses NumPy/SciPy when they are installed.
+    """
+    if accelerate is None:
+        accelerate = HAS_SCIPY
+    if accelerate and not HAS_SCIPY:
+        raise RuntimeError("The accelerated solver needs numpy and scipy installed.")
+    if not shifts or not candidates:
+        return {}
+    return (_solve_scipy if accelerate else _solve_python)(list(shifts), list(candidates))
+
+
+def _solve_python(shifts, candidates):
+    qualified = [[person for person in candidates if person.qualifies(shift)] for shift in shifts]
+    remaining = [index for index, people in enumerate(qualified) if people]
+    assignments = {}
+    while remaining:
+        options = {}
+        for index in remaining:
+            people = [person for person in qualified[index] if person.is_free(shifts[index])]
+            if people:
+                options[index] = people
+        if not options:
+            break
+        taken = set()
+        for index in sorted(options, key=lambda index: (len(options[index]), shifts[index].start)):
+            shift = shifts[index]
+            people = [person for person in options[index] if person.id not in taken]
+            if not people:
+                continue
+            person = min(people, key=lambda person: (person.load + shift.duration, person.id))
+            person.take(shift)
+            taken.add(person.id)
+            assignments[shift.id] = person.id
+        remaining = [index for index in options if shifts[index].id not in assignments]
+    return assignments
+
+
+def _overlaps(intervals, starts, ends):
+    """Boolean array: which of the (starts, ends) intervals overlap any of intervals."""
+    hit = np.zeros(len(starts), dtype=bool)
+    for start, end in intervals:
+        hit |= (starts < end) & (ends > start)
+    return hit
+
+
+def _solve_scipy(shifts, candidates):
+    starts = np.array([shift.start for shift in shifts], dtype=np.int64)
+    ends = np.array([shift.end for shift in shifts], dtype=np.int64)
+    durations = ends - starts
+
+    certification_ids = sorted({cert for shift in shifts for cert in shift.required})
+    column = {cert: position for position, cert in enumerate(certification_ids)}
+    required = np.zeros((len(shifts), len(certification_ids)), dtype=np.int32)
+    for row, shift in enumerate(shifts):
+        required[row, [column[cert] for cert in shift.required]] = 1
+    missing = np.ones((len(candidates), len(certification_ids)), dtype=np.int32)
+    for row, person in enumerate(candidates):
+        missing[row, [column[cert] for cert in person.certifications if cert in column]] = 0
+
+    qualified = (required @ missing.T) == 0
+    busy = np.zeros((len(shifts), len(candidates)), dtype=bool)
+    for col, person in enumerate(candidates):
+        covered = np.zeros(len(shifts), dtype=bool)
+        for start, end in person.windows:
+            covered |= (starts >= start) & (ends <= end)
+        qualified[:, col] &= covered
+        busy[:, col] = _overlaps(person.booked, starts, ends)
+
+    load = np.array([person.load for person in candidates], dtype=np.float64)
+    cap = np.array([np.inf if person.cap is None else person.cap for person in candidates])
+    open_shifts = qualified.any(axis=1)
+    assignments = {}
+    while open_shifts.any():
+        projected = load[None, :] + durations[:, None]
+        allowed = qualified & ~busy & (projected <= cap[None, :]) & open_shifts[:, None]
+        rows = np.flatnonzero(allowed.any(axis=1))
+        if not rows.size:
+            break
+        # Scarcest shifts first, then the smallest rise in squared hours.
+        marginal = (projected[rows] / 3600.0) ** 2 - (load[None, :] / 3600.0) ** 2
+        options = allowed[rows].sum(axis=1, keepdims=True)
+        cost = options * float(marginal.max() + 1) + marginal
+        # Any infeasible pair costs more than a whole round of feasible ones,
+        # so the matching fills as many shifts as it can.
+        infeasible = float(cost[allowed[rows]].max() + 1) * min(len(rows), len(candidates))
+        picked_rows, picked_cols = linear_sum_assignment(np.where(allowed[rows], cost, infeasible))
+        for row, col in zip(rows[picked_rows], picked_cols):
+            if not allowed[row, col]:
+                continue
+            shift, person = shifts[row], candidates[col]
+            person.take(shift)
+            load[col] += durations[row]
+            busy[:, col] |= (starts < ends[row]) & (ends > starts[row])
+            open_shifts[row] = False
+            assignments[shift.id] = person.id
+        # Loads only grow and bookings only accumulate, so a shift whose
+        # qualified people are all busy can be dropped for good.
+        open_shifts &= (qualified & ~busy).any(axis=1)
+    return assignments
+
+
+class WeekProblem:
+    """The shifts, people and constraints of one ScheduleWeek, loaded in four queries."""
+
+    def __init__(self, schedule_week):
+        self.schedule_week = schedule_week
+        shifts = list(
+            Shift.objects.filter(schedule_week=schedule_week)
+            .select_related("assigned_to__user")
+            .prefetch_related("required_certifications")
+            .order_by("start", "pk")
+        )
+        availabilities = list(
+            Availability.objects.filter(week__week_start=schedule_week.week_start).select_related("profile__user")
+        )
+        self.profiles = {slot.profile_id: slot.profile for slot in availabilities}
+        held = {}
+        for profile_id, type_id in Certification.objects.filter(profile_id__in=self.profiles).values_list(
+            "profile_id", "type_id"
+        ):
+            held.setdefault(profile_id, set()).add(type_id)
+
+        windows = {}
+        for slot in availabilities:
+            windows.setdefault(slot.profile_id, []).append((int(slot.start.timestamp()), int(slot.end.timestamp())))
+        cap = int(WEEKLY_HOUR_CAP.total_seconds())
+        self.candidates = {
+            profile_id: Candidate(
+                id=profile_id,
+                windows=merge_windows(windows[profile_id]),
+                certifications=frozenset(held.get(profile_id, ())),
+                cap=cap if profile.role in CAPPED_ROLES else None,
+            )
+            for profile_id, profile in self.profiles.items()
+        }
+
+        self.shifts = {shift.pk: shift for shift in shifts}
+        self.open_shifts = []
+        for shift in shifts:
+            window = OpenShift(
+                id=shift.pk,
+                start=int(shift.start.timestamp()),
+                end=int(shift.end.timestamp()),
+                required=frozenset(cert.pk for cert in shift.required_certifications.all()),
+            )
+            if shift.assigned_to_id is None:
+                self.open_shifts.append(window)
+            elif shift.assigned_to_id in self.candidates:
+                self.candidates[shift.assigned_to_id].take(window)
+
+    def unfilled_reason(self, shift):
+        people = self.candidates.values()
+        if not any(
+            any(start <= shift.start and end >= shift.end for start, end in person.windows) for person in people
+        ):
+            return "Nobody is available for the whole shift."
+        if not any(person.qualifies(shift) for person in people):
+            return "Nobody available holds the required certifications."
+        return "Everyone who could work it is on an overlapping shift or at the 20-hour cap."
+
+
+@dataclass
+class Proposal:
+    assignments: list
+    unfilled: list
+    backend: str
+
+
+def propose(schedule_week, accelerate=None):
+    """Solve the week without saving anything.
+
+    Returns a Proposal whose assignments are (shift, profile) pairs and whose
+    unfilled entries are (shift, reason) pairs, both in shift order.
+    """
+    problem = WeekProblem(schedule_week)
+    if accelerate is None:
+        accelerate = HAS_SCIPY
+    solved = solve(problem.open_shifts, problem.candidates.values(), accelerate=accelerate)
+    assignments, unfilled = [], []
+    for shift in problem.open_shifts:
+        if shift.id in solved:
+            assignments.append((problem.shifts[shift.id], problem.profiles[solved[shift.id]]))
+        else:
+            unfilled.append((problem.shifts[shift.id], problem.unfilled_reason(shift)))
+    return Proposal(assignments, unfilled, "scipy" if accelerate else "python")
+
+
+def apply(schedule_week, pairs):
+    """Save previewed (shift id, profile id) pairs that still satisfy every rule.
+
+    The week is re-read under row locks, so a pair is rejected if the shift was
+    assigned, or the person's availability or hours changed, since the preview.
+    Returns (applied, rejected) counts.
+    """
+    with transaction.atomic():
+        list(Shift.objects.select_for_update().filter(schedule_week=schedule_week).values_list("pk"))
+        problem = WeekProblem(schedule_week)
+        open_shifts = {shift.id: shift for shift in problem.open_shifts}
+        updated = []
+        rejected = 0
+        for shift_id, profile_id in pairs:
+            shift = open_shifts.pop(shift_id, None)
+            person = problem.candidates.get(profile_id)
+            if not shift or not person or not person.qualifies(shift) or not person.is_free(shift):
+                rejected += 1
+                continue
+            person.take(shift)
+            instance = problem.shifts[shift_id]
+            instance.assigned_to = problem.profiles[profile_id]
+            updated.append(instance)
+        now = timezone.now()
+        for instance in updated:
+            instance.updated_at = now
+        Shift.objects.bulk_update(updated, ["assigned_to", "updated_at"])
+    return len(updated), rejected
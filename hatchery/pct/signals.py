@@ -1,17 +1,23 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from allauth.account.signals import user_logged_in
 from allauth.socialaccount.signals import social_account_added
-from .models import Profile, ActivityLog, Training, Certification, RoomReservation
+from .models import AutoApprovalRule, Profile, TrainingSeat, Certification, CertificationLevel, CertificationTemplate, CertificationType, RoomReservation, Semester, OpenHour, Holiday
+from . import activity, auto_approval, certification_catalog, semester_calendar, user_search
 from django.contrib import messages
 
 User = get_user_model()
 
 @receiver(post_save, sender=User)
-def ensure_profile(sender, instance, **kwargs):
-    profile, created = Profile.objects.get_or_create(user=instance)
-    profile.save()
+def ensure_profile(sender, instance, created, raw=False, **kwargs):
+    """Give every new user a Profile.
+
+    Later saves (each login updates last_login) leave the profile alone; users
+    created before this signal existed are covered by `manage.py backfill_profiles`.
+    """
+    if created and not raw:
+        Profile.objects.create(user=instance)
 
 @receiver(user_logged_in)
 def assign_role_on_login(request, user, **kwargs):
@@ -42,11 +48,7 @@ def assign_role_on_login(request, user, **kwargs):
     
     # Log login activity
     try:
-        ActivityLog.objects.create(
-            user=user,
-            action='login',
-            description=f'{user.get_full_name() or user.username} logged in'
-        )
+        activity.record(user, 'login', f'{user.get_full_name() or user.username} logged in')
     except Exception:
         pass  # Don't break login if logging fails
 
@@ -86,16 +88,12 @@ def assign_role_on_social_login(request, sociallogin, **kwargs):
         # Don't raise - let the login continue even if role assignment fails
 
 
-@receiver(post_save, sender=Training)
+@receiver(post_save, sender=TrainingSeat)
 def log_training_activity(sender, instance, created, **kwargs):
     """Log training booking activity"""
-    if created and instance.student:
+    if created:
         try:
-            ActivityLog.objects.create(
-                user=instance.student.user,
-                action='training',
-                description=f'Booked training: {instance.name}'
-            )
+            activity.record(instance.profile.user, 'training', f'Booked training: {instance.training.name}')
         except Exception:
             pass  # Don't break training creation if logging fails
 
@@ -103,13 +101,9 @@ def log_training_activity(sender, instance, created, **kwargs):
 @receiver(post_save, sender=Certification)
 def log_certification_activity(sender, instance, created, **kwargs):
     """Log certification activity"""
-    if created and instance.profile:
+    if created:
         try:
-            ActivityLog.objects.create(
-                user=instance.profile.user,
-                action='certification',
-                description=f'Added certification: {instance.type.name} Level {instance.level.level}'
-            )
+            activity.record(instance.profile.user, 'certification', f'Added certification: {instance.type.name} Level {instance.level.level}')
         except Exception:
             pass  # Don't break certification creation if logging fails
 
@@ -119,10 +113,61 @@ def log_reservation_activity(sender, instance, created, **kwargs):
     """Log reservation activity"""
     if created:
         try:
-            ActivityLog.objects.create(
-                user=instance.requester.user,
-                action='reservation',
-                description=f'Requested room reservation: {instance.get_room_display()}'
-            )
+            activity.record(instance.requester.user, 'reservation', f'Requested room reservation: {instance.get_room_display()}')
         except Exception:
             pass  # Don't break reservation creation if logging fails
+
+
+@receiver([post_save, post_delete], sender=Semester)
+@receiver([post_save, post_delete], sender=OpenHour)
+@receiver([post_save, post_delete], sender=Holiday)
+def invalidate_semester_calendar(sender, **kwargs):
+    """Drop the cached semester calendar when its source rows change"""
+    semester_calendar.invalidate()
+
+
+@receiver([post_save, post_delete], sender=CertificationTemplate)
+@receiver([post_save, post_delete], sender=CertificationType)
+@receiver([post_save, post_delete], sender=CertificationLevel)
+def invalidate_certification_catalog(sender, **kwargs):
+    """Drop the cached certification catalog when its source rows change"""
+    certification_catalog.invalidate()
+
+
+@receiver([post_save, post_delete], sender=AutoApprovalRule)
+def invalidate_auto_approval_rules(sender, **kwargs):
+    """Drop the cached auto-approval rules when one changes"""
+    auto_approval.invalidate()
+
+
+USER_SEARCH_FIELDS = {'username', 'first_name', 'last_name', 'email'}
+PROFILE_SEARCH_FIELDS = {'first_name', 'last_name', 'email', 'search_text'}
+
+
+def _touches(update_fields, fields):
+    return update_fields is None or bool(fields & set(update_fields))
+
+
+@receiver(pre_save, sender=Profile)
+def update_profile_search_text(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Keep search_text in step with the names and emails it is built from"""
+    if not raw and _touches(update_fields, PROFILE_SEARCH_FIELDS):
+        instance.search_text = user_search.document(instance.user, instance)
+
+
+@receiver(post_save, sender=Profile)
+def index_profile_search_text(sender, instance, update_fields=None, raw=False, **kwargs):
+    if not raw and _touches(update_fields, PROFILE_SEARCH_FIELDS):
+        user_search.get_backend().index(instance.user_id, instance.search_text)
+
+
+@receiver(post_delete, sender=Profile)
+def unindex_profile(sender, instance, **kwargs):
+    user_search.get_backend().remove(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def refresh_user_search_text(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """A new user's profile is indexed as it's created; logins only touch last_login"""
+    if not created and not raw and _touches(update_fields, USER_SEARCH_FIELDS):
+        user_search.refresh(instance)
@@ -0,0 +1,235 @@
+from datetime import datetime, timedelta
+import gzip
+import io
+import json
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.core.signals import request_finished
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from pct import activity
+from pct.models import ActivityLog, Certification, CertificationLevel, CertificationType
+
+
+@override_settings(ACTIVITY_LOG_BUFFERED=True, ACTIVITY_LOG_FLUSH_INTERVAL=0, ACTIVITY_LOG_BATCH_SIZE=50)
+class BufferedActivityLogTests(TestCase):
+    def setUp(self):
+        activity.flush()
+        self.user = get_user_model().objects.create_user(username="student")
+        self.level = CertificationLevel.objects.create(level=1)
+
+    def tearDown(self):
+        activity.flush()
+
+    def _grant(self):
+        # A profile holds each certification once; grant a new one every time.
+        cert_type = CertificationType.objects.create(name=f"Laser {CertificationType.objects.count()}")
+        Certification.objects.create(profile=self.user.profile, type=cert_type, level=self.level)
+
+    def test_entries_are_queued_on_commit_and_written_in_one_insert(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(3):
+                self._grant()
+        self.assertEqual(ActivityLog.objects.count(), 0)
+        self.assertEqual(activity.pending(), 3)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(activity.flush(), 3)
+        self.assertEqual(ActivityLog.objects.filter(user=self.user, action="certification").count(), 3)
+
+    def test_entries_keep_the_time_they_were_recorded(self):
+        recorded_at = timezone.now() - timedelta(minutes=5)
+        with mock.patch("pct.activity.timezone.now", return_value=recorded_at):
+            with self.captureOnCommitCallbacks(execute=True):
+                activity.record(self.user, "other", "Earlier")
+        activity.flush()
+        self.assertEqual(ActivityLog.objects.get().created_at, recorded_at)
+
+    def test_rolled_back_work_is_not_logged(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self._grant()
+                    raise DatabaseError("booking failed")
+            except DatabaseError:
+                pass
+        self.assertEqual(activity.pending(), 0)
+
+    def test_request_end_flushes_when_no_flusher_runs(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            activity.record(self.user, "other", "Submitted report")
+        # As the test client does, keep the test transaction's connection open.
+        request_finished.disconnect(close_old_connections)
+        try:
+            request_finished.send(sender=self.__class__)
+        finally:
+            request_finished.connect(close_old_connections)
+        self.assertEqual(activity.pending(), 0)
+        self.assertTrue(ActivityLog.objects.filter(description="Submitted report").exists())
+
+    def test_failed_batch_falls_back_to_single_writes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            activity.record(self.user, "other", "One")
+            activity.record(self.user, "other", "Two")
+        with mock.patch.object(ActivityLog.objects, "bulk_create", side_effect=DatabaseError("batch failed")):
+            with self.assertLogs("pct.activity", "WARNING"):
+                self.assertEqual(activity.flush(), 2)
+        self.assertEqual(ActivityLog.objects.count(), 2)
+
+    @override_settings(ACTIVITY_LOG_MAX_BUFFER=2)
+    def test_full_buffer_writes_synchronously(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for number in range(3):
+                activity.record(self.user, "other", f"Entry {number}")
+        self.assertEqual(activity.pending(), 2)
+        self.assertEqual(list(ActivityLog.objects.values_list("description", flat=True)), ["Entry 2"])
+
+    def test_forked_child_drops_the_inherited_buffer(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            activity.record(self.user, "other", "Parent's entry")
+        with mock.patch("pct.activity.os.getpid", return_value=activity._buffer_pid + 1):
+            self.assertEqual(activity.flush(), 0)
+            with self.captureOnCommitCallbacks(execute=True):
+                activity.record(self.user, "other", "Child's entry")
+            self.assertEqual(activity.flush(), 1)
+        self.assertEqual(list(ActivityLog.objects.values_list("description", flat=True)), ["Child's entry"])
+
+    @override_settings(ACTIVITY_LOG_BUFFERED=False)
+    def test_unbuffered_mode_writes_immediately(self):
+        self._grant()
+        self.assertEqual(activity.pending(), 0)
+        self.assertEqual(ActivityLog.objects.filter(action="certification").count(), 1)
+
+
+class ActivityFeedTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.alex = User.objects.create_user(username="alex")
+        self.blair = User.objects.create_user(username="blair")
+        self.now = timezone.now()
+        # Pairs of entries share a timestamp so paging has to break ties on id.
+        ActivityLog.objects.bulk_create(
+            ActivityLog(
+                user=self.alex if number % 3 else self.blair,
+                action="booking" if number % 2 else "training",
+                description=f"Entry {number}",
+                created_at=self.now - timedelta(days=number // 2),
+            )
+            for number in range(12)
+        )
+
+    def _all_pages(self, limit, **filters):
+        seen, cursor = [], None
+        while True:
+            page, cursor = activity.feed(cursor=cursor, limit=limit, **filters)
+            seen.extend(page)
+            if cursor is None:
+                return seen
+
+    def test_pages_cover_every_entry_once_in_order(self):
+        expected = list(ActivityLog.objects.order_by("-created_at", "-id"))
+        self.assertEqual(self._all_pages(limit=5), expected)
+        self.assertEqual(self._all_pages(limit=2), expected)
+
+    def test_filters(self):
+        by_user = self._all_pages(limit=3, user_id=self.blair.pk, action="training")
+        self.assertEqual([entry.description for entry in by_user], ["Entry 0", "Entry 6"])
+        today = timezone.localdate(self.now)
+        recent = self._all_pages(limit=3, date_from=today - timedelta(days=1), date_to=today)
+        self.assertEqual(len(recent), 4)
+
+    def test_malformed_cursor_starts_from_the_top(self):
+        page, _ = activity.feed(cursor="not-a-cursor", limit=3)
+        self.assertEqual(page, list(ActivityLog.objects.order_by("-created_at", "-id")[:3]))
+
+    def test_cursor_round_trip(self):
+        entry = ActivityLog.objects.first()
+        self.assertEqual(activity.decode_cursor(activity.encode_cursor(entry)), (entry.created_at, entry.pk))
+
+    def test_admin_log_pages_with_constant_queries(self):
+        admin = get_user_model().objects.create_user(username="admin", password="pass")
+        admin.profile.role = "admin"
+        admin.profile.save()
+        client = Client()
+        client.force_login(admin)
+        url = reverse("admin_log")
+        ActivityLog.objects.bulk_create(
+            ActivityLog(user=self.alex, action="other", description=f"Filler {number}", created_at=self.now)
+            for number in range(60)
+        )
+
+        first = client.get(url)
+        self.assertEqual(len(first.context["activity_logs"]), 50)
+        self.assertTrue(first.context["is_first_page"])
+        with CaptureQueriesContext(connection) as first_queries:
+            client.get(url)
+        with self.assertNumQueries(len(first_queries.captured_queries)):
+            second = client.get(url, {"cursor": first.context["next_cursor"]})
+        self.assertEqual(len(second.context["activity_logs"]), 22)
+        self.assertIsNone(second.context["next_cursor"])
+
+        filtered = client.get(url, {"user": "blair", "action": "training"})
+        self.assertEqual([entry.description for entry in filtered.context["activity_logs"]], ["Entry 0", "Entry 6"])
+        self.assertEqual(filtered.context["log_query"], "user=blair&action=training")
+        missing = client.get(url, {"user": "nobody"})
+        self.assertEqual(list(missing.context["activity_logs"]), [])
+
+
+class ActivityArchiveTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="student")
+        self.archive_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.archive_dir.cleanup)
+
+    def _entry(self, year, month, day, description):
+        created_at = timezone.make_aware(datetime(year, month, day, 12, 0))
+        return ActivityLog.objects.create(
+            user=self.user, action="other", description=description, created_at=created_at
+        )
+
+    def _archived(self, month):
+        with gzip.open(activity.archive_path(self.archive_dir.name, month), "rt") as archive:
+            return [json.loads(line) for line in archive]
+
+    def test_old_entries_move_to_monthly_files_in_batches(self):
+        for day in range(1, 4):
+            self._entry(2024, 1, day, f"January {day}")
+        self._entry(2024, 2, 1, "February")
+        recent = ActivityLog.objects.create(user=self.user, action="other", description="Recent")
+        cutoff = timezone.make_aware(datetime(2024, 6, 1))
+
+        self.assertEqual(activity.archive_before(cutoff, self.archive_dir.name, batch_size=2, max_batches=1), 2)
+        self.assertEqual(activity.archive_before(cutoff, self.archive_dir.name, batch_size=2), 2)
+
+        january = self._archived("2024-01")
+        self.assertEqual([record["description"] for record in january], ["January 1", "January 2", "January 3"])
+        self.assertEqual(january[0]["username"], "student")
+        self.assertEqual([record["description"] for record in self._archived("2024-02")], ["February"])
+        self.assertEqual(list(ActivityLog.objects.all()), [recent])
+
+    def test_command(self):
+        self._entry(2020, 5, 4, "Old")
+        ActivityLog.objects.create(user=self.user, action="other", description="Recent")
+
+        args = ["archive_activity_log", "--days", "30", "--archive-dir", self.archive_dir.name]
+
+        call_command(*args, "--dry-run", stdout=io.StringIO())
+        self.assertEqual(ActivityLog.objects.count(), 2)
+
+        call_command(*args, stdout=io.StringIO())
+        self.assertEqual(list(ActivityLog.objects.values_list("description", flat=True)), ["Recent"])
+        self.assertEqual([record["description"] for record in self._archived("2020-05")], ["Old"])
+
+    @override_settings(ACTIVITY_LOG_ARCHIVE_DIR=None)
+    def test_command_requires_an_archive_dir(self):
+        self._entry(2020, 5, 4, "Old")
+        with self.assertRaises(CommandError):
+            call_command("archive_activity_log", "--days", "30", stdout=io.StringIO())
+        self.assertEqual(ActivityLog.objects.count(), 1)
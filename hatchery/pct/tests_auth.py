@@ -0,0 +1,66 @@
+from django.contrib.auth import BACKEND_SESSION_KEY, get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from pct import semester_calendar
+
+
+class ProfileLoadingTests(TestCase):
+    """The profile arrives with the user; gates and views never query it again."""
+
+    def setUp(self):
+        semester_calendar.invalidate()
+        self.client = Client()
+
+    def tearDown(self):
+        semester_calendar.invalidate()
+
+    def _login(self, role, **kwargs):
+        user = get_user_model().objects.create_user(username=f"{role}-user", password="pass")
+        user.profile.role = role
+        user.profile.save()
+        self.client.force_login(user, **kwargs)
+        return user
+
+    def _get(self, url, queries):
+        self.client.get(url)  # Fills the calendar cache so the count is steady.
+        with self.assertNumQueries(queries):
+            return self.client.get(url)
+
+    def test_role_gated_views_read_the_cached_profile(self):
+        # Every count includes the session and one user query that joins the
+        # profile; the role gates and views never query the profile again.
+        views = {
+            "student": {"training-list": 3, "home": 6},
+            "team_member": {
+                "training-list": 3,
+                "staff-training-list": 4,
+                "training-create": 6,
+                "add_certifications": 4,
+                "schedule": 6,
+            },
+            "staff": {"schedule-builder": 15, "semester-settings": 8, "staff-training-list": 4},
+            "admin": {"admin_log": 4, "manage_users": 3, "schedule": 8},
+        }
+        for role, counts in views.items():
+            self._login(role)
+            for name, queries in counts.items():
+                with self.subTest(role=role, view=name):
+                    self.assertEqual(self._get(reverse(name), queries).status_code, 200)
+
+    def test_rejected_role_costs_the_session_and_one_user_query(self):
+        self._login("student")
+        url = reverse("schedule-builder")
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertRedirects(response, f"{reverse('account_login')}?next={url}", fetch_redirect_response=False)
+
+    def test_anonymous_request_is_rejected_without_queries(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("schedule"))
+        self.assertEqual(response.status_code, 302)
+
+    def test_sessions_from_the_stock_backend_keep_working(self):
+        self._login("staff", backend="django.contrib.auth.backends.ModelBackend")
+        self.assertEqual(self.client.get(reverse("schedule-builder")).status_code, 200)
+        self.assertEqual(self.client.session[BACKEND_SESSION_KEY], "pct.auth.ModelBackend")
@@ -0,0 +1,115 @@
+from datetime import datetime, time, timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from pct import auto_approval, semester_calendar
+from pct.models import AutoApprovalRule, Holiday, OpenHour, RoomReservation, Semester
+
+SHOP = RoomReservation.RoomChoices.PROTO_SHOP
+STUDIO = RoomReservation.RoomChoices.PROTO_STUDIO
+
+
+class AutoApprovalTests(TestCase):
+    def setUp(self):
+        semester_calendar.invalidate()
+        auto_approval.invalidate()
+        self.addCleanup(semester_calendar.invalidate)
+        self.addCleanup(auto_approval.invalidate)
+        self.day = timezone.localdate() + timedelta(days=7)
+        self.semester = Semester.objects.create(
+            name="Fall", start_date=self.day - timedelta(days=30), end_date=self.day + timedelta(days=30), is_active=True
+        )
+        OpenHour.objects.create(semester=self.semester, weekday=self.day.weekday(), open_time=time(9, 0), close_time=time(17, 0))
+        self.rule = AutoApprovalRule.objects.create(
+            name="Short shop bookings", room=SHOP, max_duration=timedelta(hours=2), requester_role="student"
+        )
+        self.profile = get_user_model().objects.create_user(username="student").profile
+        self.profile.role = "student"
+        self.profile.save()
+
+    def _at(self, hour):
+        return timezone.make_aware(datetime.combine(self.day, time(hour, 0)))
+
+    def _reservation(self, start, end, room=SHOP, **fields):
+        return RoomReservation(
+            requester=self.profile, room=room, start_time=self._at(start), end_time=self._at(end), affiliation="Club", **fields
+        )
+
+    def _applies(self, reservation, role="student"):
+        return auto_approval.apply(reservation, role) is not None
+
+    def test_rule_conditions(self):
+        self.assertTrue(self._applies(self._reservation(10, 12)))
+        self.assertFalse(self._applies(self._reservation(10, 13)))
+        self.assertFalse(self._applies(self._reservation(10, 11, room=STUDIO)))
+        self.assertFalse(self._applies(self._reservation(10, 11), role="team_member"))
+        self.assertFalse(self._applies(self._reservation(10, 11, is_exclusive_request=True)))
+        self.assertFalse(self._applies(self._reservation(16, 18)))
+        Holiday.objects.create(semester=self.semester, date=self.day, name="Break")
+        self.assertFalse(self._applies(self._reservation(10, 11)))
+
+    def test_conflicts_are_left_for_staff(self):
+        self._reservation(11, 13, room=SHOP).save()
+        reservation = self._reservation(10, 12)
+        self.assertFalse(self._applies(reservation))
+        self.assertEqual(reservation.status, RoomReservation.StatusChoices.PENDING)
+
+    def test_rules_are_cached(self):
+        auto_approval.get_rules()
+        semester_calendar.get_calendar()
+        with CaptureQueriesContext(connection) as queries:
+            auto_approval.matching_rule(self._reservation(10, 11), "student")
+        self.assertEqual(len(queries.captured_queries), 0)
+
+        self.rule.max_duration = timedelta(minutes=30)
+        self.rule.save()
+        self.assertIsNone(auto_approval.matching_rule(self._reservation(10, 11), "student"))
+
+    def test_submission_is_approved(self):
+        client = Client()
+        client.force_login(self.profile.user)
+        with CaptureQueriesContext(connection) as queries:
+            client.post(
+                reverse("reservations"),
+                {
+                    "form_type": "room_request",
+                    "room": SHOP,
+                    "start_date": self.day.isoformat(),
+                    "start_time_hour": "10",
+                    "start_time_minute": "00",
+                    "end_date": self.day.isoformat(),
+                    "end_time_hour": "11",
+                    "end_time_minute": "00",
+                    "affiliation": "Robotics Club",
+                },
+            )
+        # The form's validation checked the room timeline; auto-approval doesn't repeat it.
+        self.assertEqual(sum(1 for query in queries.captured_queries if 'FROM "pct_training"' in query["sql"]), 1)
+        reservation = RoomReservation.objects.get()
+        self.assertEqual(reservation.status, RoomReservation.StatusChoices.APPROVED)
+        self.assertEqual(reservation.approval_rule, self.rule)
+
+    def test_reevaluate_pending_queue(self):
+        AutoApprovalRule.objects.all().delete()
+        eligible = [self._reservation(9, 10), self._reservation(13, 14)]
+        # Denied requests don't hold the room.
+        beside_denied = [self._reservation(11, 12), self._reservation(11, 12, status=RoomReservation.StatusChoices.DENIED)]
+        clashing = [self._reservation(15, 16, room=STUDIO), self._reservation(15, 17, room=STUDIO)]
+        too_long = self._reservation(9, 12, room=STUDIO)
+        for reservation in [*eligible, *beside_denied, *clashing, too_long]:
+            reservation.save()
+        AutoApprovalRule.objects.create(name="Any short booking", max_duration=timedelta(hours=2))
+
+        out = StringIO()
+        call_command("reevaluate_pending_reservations", stdout=out)
+
+        self.assertIn("Approved 3", out.getvalue())
+        approved = set(RoomReservation.objects.filter(status=RoomReservation.StatusChoices.APPROVED).values_list("pk", flat=True))
+        self.assertEqual(approved, {eligible[0].pk, eligible[1].pk, beside_denied[0].pk})
@@ -0,0 +1,150 @@
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from pct import availability_replication, semester_calendar
+from pct.models import Availability, CertificationType, Holiday, OpenHour, ScheduleWeek, Semester
+
+
+class AvailabilityReplicationTests(TestCase):
+    def setUp(self):
+        semester_calendar.invalidate()
+        today = timezone.localdate()
+        self.week_start = today + timedelta(days=(7 - today.weekday()))
+        self.semester = self._semester(weeks=6)
+        self.user = get_user_model().objects.create_user(username="member", password="pass")
+        self.profile = self.user.profile
+        self.profile.role = "team_member"
+        self.profile.save()
+        self.week = ScheduleWeek.objects.create(week_start=self.week_start)
+        self.source = self._slot(self.week_start, 10, 12)
+
+    def tearDown(self):
+        semester_calendar.invalidate()
+
+    def _semester(self, weeks, name="Fall"):
+        semester = Semester.objects.create(
+            name=name,
+            start_date=self.week_start,
+            end_date=self.week_start + timedelta(weeks=weeks, days=-1),
+            is_active=True,
+        )
+        OpenHour.objects.create(
+            semester=semester, weekday=self.week_start.weekday(), open_time=time(9, 0), close_time=time(17, 0)
+        )
+        return semester
+
+    def _at(self, day, hour):
+        return timezone.make_aware(datetime.combine(day, time(hour, 0)))
+
+    def _slot(self, day, start, end, week=None):
+        week = week or ScheduleWeek.objects.get_or_create(week_start=day - timedelta(days=day.weekday()))[0]
+        return Availability.objects.create(
+            profile=self.profile, week=week, start=self._at(day, start), end=self._at(day, end), note="Desk"
+        )
+
+    def _copies(self):
+        return Availability.objects.filter(profile=self.profile).exclude(pk=self.source.pk)
+
+    def test_add_skips_holidays_and_existing_copies(self):
+        Holiday.objects.create(semester=self.semester, date=self.week_start + timedelta(weeks=2), name="Break")
+        self._slot(self.week_start + timedelta(weeks=3), 10, 12)
+
+        result = availability_replication.replicate(self.source, self.semester)
+
+        self.assertEqual((result.created, result.skipped_closed, result.skipped_overlapping), (3, 1, 1))
+        self.assertEqual(self._copies().count(), 4)
+        # The holiday week never gets a ScheduleWeek created for it.
+        self.assertEqual(ScheduleWeek.objects.count(), 5)
+        self.assertEqual(set(self._copies().values_list("note", flat=True)), {"Desk"})
+
+    def test_add_skips_partial_overlaps(self):
+        self._slot(self.week_start + timedelta(weeks=1), 11, 13)
+        # Touching isn't overlapping.
+        self._slot(self.week_start + timedelta(weeks=2), 12, 14)
+
+        result = availability_replication.replicate(self.source, self.semester)
+
+        self.assertEqual((result.created, result.skipped_closed, result.skipped_overlapping), (4, 0, 1))
+        week_one = self._copies().filter(week__week_start=self.week_start + timedelta(weeks=1))
+        self.assertEqual(week_one.count(), 1)
+
+    def test_add_skips_weeks_outside_open_hours(self):
+        late = self._slot(self.week_start, 16, 18)
+        result = availability_replication.replicate(late, self.semester)
+        self.assertEqual((result.created, result.skipped_closed), (0, 5))
+
+    def test_query_count_does_not_grow_with_semester_length(self):
+        self.source.skills.add(CertificationType.objects.create(name="Laser"))
+        semester_calendar.get_calendar()
+        with CaptureQueriesContext(connection) as short:
+            availability_replication.replicate(self.source, self.semester)
+
+        Availability.objects.exclude(pk=self.source.pk).delete()
+        long_semester = self._semester(weeks=30, name="Long")
+        semester_calendar.get_calendar()
+        with self.assertNumQueries(len(short.captured_queries)):
+            result = availability_replication.replicate(self.source, long_semester)
+        self.assertEqual(result.created, 29)
+        self.assertEqual(
+            Availability.skills.through.objects.exclude(availability=self.source).count(), 29
+        )
+
+    def test_replace_removes_overlapping_future_slots(self):
+        clash = self._slot(self.week_start + timedelta(weeks=1), 11, 13)
+        elsewhere = self._slot(self.week_start + timedelta(weeks=1), 14, 16)
+
+        result = availability_replication.replicate(
+            self.source, self.semester, mode=availability_replication.MODE_REPLACE
+        )
+
+        self.assertEqual((result.created, result.removed), (5, 1))
+        self.assertFalse(Availability.objects.filter(pk=clash.pk).exists())
+        self.assertTrue(Availability.objects.filter(pk=elsewhere.pk).exists())
+
+    def test_remove_deletes_only_exact_copies(self):
+        availability_replication.replicate(self.source, self.semester)
+        other = self._slot(self.week_start + timedelta(weeks=1), 14, 16)
+
+        result = availability_replication.replicate(
+            self.source, self.semester, mode=availability_replication.MODE_REMOVE
+        )
+
+        self.assertEqual(result.removed, 5)
+        self.assertEqual(list(self._copies()), [other])
+
+    def test_schedule_view_replicates_and_removes(self):
+        client = Client()
+        client.force_login(self.user)
+        url = reverse("schedule")
+        day = self.week_start
+        response = client.post(
+            url,
+            {
+                "action": "save_availability",
+                "week_start": self.week_start.isoformat(),
+                "day": day.isoformat(),
+                "start_time": "13:00",
+                "end_time": "15:00",
+                "apply_semester": "add",
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        slot = Availability.objects.get(profile=self.profile, week=self.week, start=self._at(day, 13))
+        self.assertEqual(Availability.objects.filter(profile=self.profile).count(), 7)
+
+        client.post(
+            url,
+            {
+                "action": "delete_availability",
+                "week_start": self.week_start.isoformat(),
+                "availability_id": slot.pk,
+                "remove_future": "1",
+            },
+        )
+        self.assertEqual(list(Availability.objects.filter(profile=self.profile)), [self.source])
@@ -0,0 +1,88 @@
+from datetime import timedelta
+import io
+from unittest import mock
+
+from django.contrib.auth import SESSION_KEY, get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from pct.models import Profile
+
+
+class BanMiddlewareTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.student = User.objects.create_user(username="student", password="pass")
+        self.student.profile.role = "student"
+        self.student.profile.save()
+        self.client = Client()
+        self.client.force_login(self.student)
+
+    def _ban(self, **fields):
+        Profile.objects.filter(user=self.student).update(is_banned=True, banned_at=timezone.now(), **fields)
+
+    def test_banned_user_is_signed_out_on_any_page(self):
+        self._ban(ban_type="permanent", ban_reason="Left the laser running")
+        response = self.client.get(reverse("training-list"))
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response["Location"].startswith(reverse("ban_error")))
+        self.assertIn("ban_reason=Left+the+laser+running", response["Location"])
+        self.assertNotIn(SESSION_KEY, self.client.session)
+
+    def test_ban_takes_effect_on_the_next_request(self):
+        url = reverse("training-list")
+        self.assertEqual(self.client.get(url).status_code, 200)
+        # Even a bare UPDATE, which skips signals, applies at once.
+        self._ban(ban_type="permanent")
+        self.assertTrue(self.client.get(url)["Location"].startswith(reverse("ban_error")))
+
+        Profile.objects.filter(user=self.student).update(is_banned=False)
+        self.client.force_login(self.student)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        staff = get_user_model().objects.create_user(username="staff")
+        staff.profile.role = "staff"
+        staff.profile.save()
+        staff_client = Client()
+        staff_client.force_login(staff)
+        staff_client.post(
+            reverse("manage_users"),
+            {"user_id": self.student.pk, "ban_user": "1", "ban_type": "permanent", "ban_reason": ""},
+        )
+        self.assertTrue(self.client.get(url)["Location"].startswith(reverse("ban_error")))
+
+    def test_temporary_ban_lapses_on_time(self):
+        expires_at = timezone.now() + timedelta(hours=1)
+        self._ban(ban_type="temporary", ban_expires_at=expires_at)
+        self.assertEqual(self.client.get(reverse("help")).status_code, 302)
+
+        self.client.force_login(self.student)
+        with mock.patch("pct.bans.timezone.now", return_value=expires_at + timedelta(seconds=1)):
+            self.assertEqual(self.client.get(reverse("help")).status_code, 200)
+
+    def test_ban_error_page_is_reachable_while_signed_in(self):
+        self._ban(ban_type="permanent")
+        self.assertEqual(self.client.get(reverse("ban_error")).status_code, 200)
+
+    def test_sweep_clears_expired_temporary_bans_in_one_update(self):
+        now = timezone.now()
+        self._ban(ban_type="temporary", ban_expires_at=now - timedelta(hours=1), ban_reason="Expired")
+        still_banned = get_user_model().objects.create_user(username="still").profile
+        Profile.objects.filter(pk=still_banned.pk).update(
+            is_banned=True, ban_type="temporary", ban_expires_at=now + timedelta(days=1)
+        )
+        permanent = get_user_model().objects.create_user(username="forever").profile
+        Profile.objects.filter(pk=permanent.pk).update(is_banned=True, ban_type="permanent")
+
+        with self.assertNumQueries(1):
+            call_command("clear_expired_bans", stdout=io.StringIO())
+
+        self.assertEqual(
+            set(Profile.objects.filter(is_banned=True).values_list("user__username", flat=True)),
+            {"still", "forever"},
+        )
+        cleared = Profile.objects.get(user=self.student)
+        self.assertIsNone(cleared.ban_type)
+        self.assertIsNone(cleared.ban_reason)
@@ -0,0 +1,328 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import unittest
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from pct import booking
+from pct.forms import TrainingForm
+from pct.models import CertificationLevel, Training, TrainingSeat, TrainingWaitlist
+
+
+def _make_profiles(prefix, count):
+    User = get_user_model()
+    profiles = []
+    for i in range(count):
+        profile = User.objects.create_user(username=f"{prefix}{i}").profile
+        profile.role = "student"
+        profile.save(update_fields=["role"])
+        profiles.append(profile)
+    return profiles
+
+
+class BookingServiceTests(TestCase):
+    def setUp(self):
+        self.level = CertificationLevel.objects.create(level=1)
+        self.training = self._training(capacity=1)
+        self.alice, self.bob, self.carol, self.dave = _make_profiles("student", 4)
+
+    def _training(self, capacity):
+        return Training.objects.create(
+            name="Laser intro", machine="Glowforge Pro", level=self.level, capacity=capacity
+        )
+
+    def _waitlist(self, training, *profiles):
+        return [TrainingWaitlist.objects.create(training=training, profile=profile) for profile in profiles]
+
+    def assertCounts(self, training, taken, held):
+        training.refresh_from_db()
+        self.assertEqual((training.seats_taken, training.seats_held), (taken, held))
+        self.assertEqual(training.seats.count(), taken)
+        self.assertEqual(training.waitlist.filter(status="invited").count(), held)
+
+    def test_seats_fill_up_to_capacity(self):
+        training = self._training(capacity=3)
+        for profile in (self.alice, self.bob, self.carol):
+            booking.claim_training(training, profile)
+        with self.assertRaisesMessage(booking.BookingError, "full"):
+            booking.claim_training(training, self.dave)
+
+        self.assertTrue(training.is_full())
+        self.assertCounts(training, taken=3, held=0)
+
+    def test_same_profile_cannot_book_twice(self):
+        training = self._training(capacity=3)
+        booking.claim_training(training, self.alice)
+        with self.assertRaises(booking.BookingError):
+            booking.claim_training(training, self.alice)
+        self.assertCounts(training, taken=1, held=0)
+
+    def test_release_invites_one_person_per_open_seat(self):
+        training = self._training(capacity=3)
+        for profile in (self.alice, self.bob, self.carol):
+            booking.claim_training(training, profile)
+        first, second, _ = self._waitlist(training, *_make_profiles("waiting", 3))
+
+        self.assertEqual(booking.release_training(training, self.alice), [first])
+        self.assertEqual(booking.release_training(training, self.bob), [second])
+        self.assertEqual(booking.fill_open_seats(training), [])
+        self.assertCounts(training, taken=1, held=2)
+
+    def test_invitations_hold_seats_against_walk_ins(self):
+        booking.claim_training(self.training, self.alice)
+        (entry,) = self._waitlist(self.training, self.bob)
+        booking.release_training(self.training, self.alice)
+
+        with self.assertRaisesMessage(booking.BookingError, "reserved"):
+            booking.claim_training(self.training, self.carol)
+
+        booking.claim_training(self.training, self.bob)
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, "accepted")
+        self.assertCounts(self.training, taken=1, held=0)
+
+    def test_release_ignores_someone_elses_seat(self):
+        booking.claim_training(self.training, self.alice)
+        self.assertEqual(booking.release_training(self.training, self.bob), [])
+        self.assertCounts(self.training, taken=1, held=0)
+
+    def test_declining_passes_the_invitation_on(self):
+        bob_entry, carol_entry = self._waitlist(self.training, self.bob, self.carol)
+        booking.fill_open_seats(self.training)
+
+        invited = booking.respond_to_invitation(bob_entry, accept=False)
+
+        self.assertEqual(invited, [carol_entry])
+        with self.assertRaises(booking.BookingError):
+            booking.respond_to_invitation(bob_entry, accept=True)
+        self.assertCounts(self.training, taken=0, held=1)
+
+    def test_accepting_books_the_invitee(self):
+        (entry,) = self._waitlist(self.training, self.bob)
+        booking.fill_open_seats(self.training)
+        booking.respond_to_invitation(entry, accept=True)
+
+        self.assertEqual(list(self.training.students.all()), [self.bob])
+        self.assertCounts(self.training, taken=1, held=0)
+
+    def test_accepting_when_already_booked_passes_the_seat_on(self):
+        bob_entry, carol_entry = self._waitlist(self.training, self.bob, self.carol)
+        booking.fill_open_seats(self.training)
+        # Staff booked bob onto a seat they added in the admin.
+        TrainingSeat.objects.create(training=self.training, profile=self.bob)
+        Training.objects.filter(pk=self.training.pk).update(capacity=2, seats_taken=1)
+        entry = TrainingWaitlist.objects.select_related("training").get(pk=bob_entry.pk)
+
+        invited = booking.respond_to_invitation(entry, accept=True)
+
+        self.assertEqual(invited, [carol_entry])
+        self.assertEqual((entry.training.seats_taken, entry.training.seats_held), (1, 1))
+        self.assertCounts(self.training, taken=1, held=1)
+
+    def test_leaving_with_an_invitation_passes_it_on(self):
+        _, carol_entry = self._waitlist(self.training, self.bob, self.carol)
+        booking.fill_open_seats(self.training)
+
+        left, invited = booking.leave_waitlist(self.training, self.bob)
+
+        self.assertTrue(left)
+        self.assertEqual(invited, [carol_entry])
+        self.assertCounts(self.training, taken=0, held=1)
+
+    def test_recount_repairs_counters_and_fills_raised_capacity(self):
+        booking.claim_training(self.training, self.alice)
+        entries = self._waitlist(self.training, self.bob, self.carol)
+        Training.objects.filter(pk=self.training.pk).update(capacity=3, seats_taken=0)
+
+        invited = booking.recount_seats(self.training)
+
+        self.assertEqual(invited, entries)
+        self.assertCounts(self.training, taken=1, held=2)
+
+    def test_assign_seats_is_all_or_nothing(self):
+        training = self._training(capacity=2)
+        with self.assertRaises(booking.BookingError):
+            booking.assign_seats(training, [self.alice, self.bob, self.carol])
+        self.assertCounts(training, taken=0, held=0)
+
+        booking.assign_seats(training, [self.alice, self.bob])
+        self.assertCounts(training, taken=2, held=0)
+
+
+class TrainingSeatViewTests(TestCase):
+    def setUp(self):
+        self.level = CertificationLevel.objects.create(level=1)
+        self.staff_user = get_user_model().objects.create_user(username="staff", password="pass")
+        self.staff_user.profile.role = "staff"
+        self.staff_user.profile.save()
+        self.students = _make_profiles("student", 3)
+
+    def test_form_reserves_seats_within_capacity(self):
+        data = {
+            "name": "Laser intro",
+            "machine": "Glowforge Pro",
+            "level": self.level.pk,
+            "capacity": 2,
+            "staff": self.staff_user.profile.pk,
+            "students": [profile.pk for profile in self.students],
+        }
+        form = TrainingForm(data, staff_user=self.staff_user)
+        self.assertFalse(form.is_valid())
+        self.assertIn("students", form.errors)
+
+        data["students"] = data["students"][:2]
+        form = TrainingForm(data, staff_user=self.staff_user)
+        self.assertTrue(form.is_valid(), form.errors)
+        training = form.save()
+        self.assertEqual(training.seats_taken, 2)
+        self.assertEqual(training.seats.count(), 2)
+
+    def test_form_counts_seats_already_taken(self):
+        training = Training.objects.create(
+            name="Laser intro", machine="Glowforge Pro", level=self.level, capacity=2, staff=self.staff_user.profile
+        )
+        booking.claim_training(training, self.students[0])
+        data = {
+            "name": "Laser intro",
+            "machine": "Glowforge Pro",
+            "level": self.level.pk,
+            "capacity": 2,
+            "staff": self.staff_user.profile.pk,
+            "students": [profile.pk for profile in self.students[1:]],
+        }
+        form = TrainingForm(data, instance=training, staff_user=self.staff_user)
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors["students"], ["Only 1 seat(s) available."])
+
+        # The student already booked doesn't need a second seat.
+        data["students"] = [profile.pk for profile in self.students[:2]]
+        form = TrainingForm(data, instance=training, staff_user=self.staff_user)
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+        self.assertEqual(training.seats.count(), 2)
+
+    def test_create_view_reports_seats_lost_after_validation(self):
+        client = Client()
+        client.force_login(self.staff_user)
+        data = {
+            "name": "Laser intro",
+            "machine": "Glowforge Pro",
+            "level": self.level.pk,
+            "capacity": 2,
+            "staff": self.staff_user.profile.pk,
+            "students": [self.students[0].pk],
+        }
+        with mock.patch.object(booking, "assign_seats", side_effect=booking.BookingError("That training is full.")):
+            response = client.post(reverse("training-create"), data)
+        self.assertContains(response, "That training is full.")
+        self.assertFalse(Training.objects.exists())
+
+    def test_training_list_query_count_ignores_waitlist_size(self):
+        training = Training.objects.create(
+            name="Laser intro", machine="Glowforge Pro", level=self.level, capacity=8
+        )
+        client = Client()
+        client.force_login(self.students[0].user)
+        client.get(reverse("training-list"))
+        with CaptureQueriesContext(connection) as baseline:
+            client.get(reverse("training-list"))
+
+        for profile in _make_profiles("waiting", 20):
+            TrainingWaitlist.objects.create(training=training, profile=profile)
+        booking.assign_seats(training, self.students[1:])
+
+        with self.assertNumQueries(len(baseline.captured_queries)):
+            response = client.get(reverse("training-list"))
+        (listed,) = response.context["trainings"]
+        self.assertEqual(listed.open_seats, 6)
+        self.assertTrue(listed.can_signup)
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "Row locking needs PostgreSQL")
+# Keep booking log rows out of the activity buffer, which would outlive the test's data.
+@override_settings(ACTIVITY_LOG_BUFFERED=False)
+class ConcurrentBookingStressTests(TransactionTestCase):
+    CONTENDERS = 200
+    WORKERS = 32
+    CAPACITY = 5
+
+    def setUp(self):
+        level = CertificationLevel.objects.create(level=1)
+        self.training = Training.objects.create(
+            name="Laser intro", machine="Glowforge Pro", level=level, capacity=self.CAPACITY
+        )
+        self.profiles = _make_profiles("contender", self.CONTENDERS)
+
+    def _run_concurrently(self, attempt, items):
+        """Run attempt(item) for every item on a thread pool, released all at once."""
+        start = threading.Event()
+
+        def run(item):
+            start.wait()
+            try:
+                return attempt(item)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.WORKERS) as pool:
+            futures = [pool.submit(run, item) for item in items]
+            start.set()
+            return [future.result() for future in futures]
+
+    def test_concurrent_signups_fill_exactly_capacity(self):
+        def attempt(profile):
+            try:
+                booking.claim_training(Training(pk=self.training.pk), profile)
+                return profile.pk
+            except booking.BookingError:
+                return None
+
+        winners = [pk for pk in self._run_concurrently(attempt, self.profiles) if pk]
+
+        self.assertEqual(len(winners), self.CAPACITY)
+        self.training.refresh_from_db()
+        self.assertEqual(self.training.seats_taken, self.CAPACITY)
+        self.assertCountEqual(self.training.seats.values_list("profile_id", flat=True), winners)
+
+    def test_concurrent_promotion_invites_one_person_per_seat(self):
+        TrainingWaitlist.objects.bulk_create(
+            TrainingWaitlist(training=self.training, profile=profile) for profile in self.profiles
+        )
+
+        self._run_concurrently(
+            lambda _: booking.fill_open_seats(Training(pk=self.training.pk)),
+            range(self.CONTENDERS),
+        )
+
+        self.training.refresh_from_db()
+        self.assertEqual(self.training.seats_held, self.CAPACITY)
+        self.assertEqual(self.training.waitlist.filter(status="invited").count(), self.CAPACITY)
+
+    def test_invitees_and_walk_ins_race_for_the_seats(self):
+        invitees = self.profiles[: self.CAPACITY]
+        TrainingWaitlist.objects.bulk_create(
+            TrainingWaitlist(training=self.training, profile=profile) for profile in invitees
+        )
+        booking.fill_open_seats(self.training)
+        entries = {entry.profile_id: entry for entry in self.training.waitlist.all()}
+
+        def attempt(profile):
+            try:
+                if profile.pk in entries:
+                    booking.respond_to_invitation(entries[profile.pk], accept=True)
+                else:
+                    booking.claim_training(Training(pk=self.training.pk), profile)
+                return profile.pk
+            except booking.BookingError:
+                return None
+
+        winners = [pk for pk in self._run_concurrently(attempt, self.profiles) if pk]
+
+        self.assertCountEqual(winners, [profile.pk for profile in invitees])
+        self.training.refresh_from_db()
+        self.assertEqual((self.training.seats_taken, self.training.seats_held), (self.CAPACITY, 0))
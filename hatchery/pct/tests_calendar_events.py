@@ -0,0 +1,126 @@
+from datetime import datetime, time, timedelta
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from pct.models import CertificationLevel, Profile, RoomReservation, Training, WorkBlock
+
+
+class CalendarEventsWindowTests(TestCase):
+    def setUp(self):
+        self.User = get_user_model()
+        self.user = self.User.objects.create_user(username="member", password="pass")
+        self.profile: Profile = self.user.profile
+        self.profile.role = "student"
+        self.profile.save()
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.day = timezone.localdate() + timedelta(days=3)
+
+    def _at(self, day_offset, hour):
+        return timezone.make_aware(
+            datetime.combine(self.day + timedelta(days=day_offset), time(hour, 0))
+        )
+
+    def _workblock(self, day_offset, hour, title="Block"):
+        return WorkBlock.objects.create(
+            user=self.user,
+            title=title,
+            start=self._at(day_offset, hour),
+            end=self._at(day_offset, hour + 1),
+        )
+
+    def _get(self, **params):
+        response = self.client.get(reverse("events"), params)
+        self.assertEqual(response.status_code, 200)
+        return response, [event["id"] for event in json.loads(response.content)]
+
+    def test_window_limits_every_source(self):
+        inside = self._workblock(0, 10)
+        outside = self._workblock(30, 10)
+        reservation_inside = RoomReservation.objects.create(
+            requester=self.profile,
+            room=RoomReservation.RoomChoices.HATCH_FRONT,
+            start_time=self._at(1, 9),
+            end_time=self._at(1, 10),
+            affiliation="ENGR 101",
+            status=RoomReservation.StatusChoices.APPROVED,
+        )
+        reservation_outside = RoomReservation.objects.create(
+            requester=self.profile,
+            room=RoomReservation.RoomChoices.HATCH_FRONT,
+            start_time=self._at(-30, 9),
+            end_time=self._at(-30, 10),
+            affiliation="ENGR 101",
+            status=RoomReservation.StatusChoices.APPROVED,
+        )
+
+        _, ids = self._get(start=self._at(0, 0).isoformat(), end=self._at(7, 0).isoformat())
+
+        self.assertIn(f"workblock-{inside.pk}", ids)
+        self.assertIn(f"reservation-{reservation_inside.pk}", ids)
+        self.assertNotIn(f"workblock-{outside.pk}", ids)
+        self.assertNotIn(f"reservation-{reservation_outside.pk}", ids)
+
+    def test_event_overlapping_window_start_is_included(self):
+        block = WorkBlock.objects.create(
+            user=self.user, start=self._at(0, 9), end=self._at(0, 12)
+        )
+
+        _, ids = self._get(start=self._at(0, 10).isoformat(), end=self._at(0, 11).isoformat())
+
+        self.assertEqual(ids, [f"workblock-{block.pk}"])
+
+    def test_trainings_span_their_duration(self):
+        level = CertificationLevel.objects.create(level=1)
+        long_session = Training.objects.create(
+            name="CNC intro", machine="Shopbot", level=level, time=self._at(0, 9), duration=timedelta(hours=3)
+        )
+        Training.objects.create(name="Laser intro", machine="Glowforge Pro", level=level, time=self._at(0, 9))
+
+        response, ids = self._get(start=self._at(0, 11).isoformat(), end=self._at(0, 13).isoformat())
+
+        self.assertEqual(ids, [f"training-{long_session.pk}"])
+        self.assertEqual(json.loads(response.content)[0]["end"], self._at(0, 12).isoformat())
+
+    def test_date_only_bounds_are_accepted(self):
+        block = self._workblock(0, 10)
+
+        _, ids = self._get(start=self.day.isoformat(), end=(self.day + timedelta(days=1)).isoformat())
+
+        self.assertEqual(ids, [f"workblock-{block.pk}"])
+
+    def test_oversize_window_is_paged_with_cursor(self):
+        blocks = [self._workblock(day, 10) for day in range(5)]
+        # Two blocks share a start time to exercise the tie-breaker.
+        blocks.append(self._workblock(2, 10, title="Twin"))
+        expected = sorted(blocks, key=lambda block: (block.start, block.pk))
+        params = {"start": self._at(-1, 0).isoformat(), "end": self._at(10, 0).isoformat()}
+
+        seen = []
+        with mock.patch("pct.views.CALENDAR_EVENT_LIMIT", 2):
+            response, ids = self._get(**params)
+            seen.extend(ids)
+            while response.get("X-Next-Cursor"):
+                self.assertLessEqual(len(ids), 2)
+                response, ids = self._get(cursor=response["X-Next-Cursor"], **params)
+                seen.extend(ids)
+
+        self.assertEqual(seen, [f"workblock-{block.pk}" for block in expected])
+
+    def test_invalid_window_is_rejected(self):
+        response = self.client.get(reverse("events"), {"start": "not-a-date"})
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get(
+            reverse("events"),
+            {"start": self._at(1, 0).isoformat(), "end": self._at(0, 0).isoformat()},
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get(reverse("events"), {"cursor": "garbage"})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,91 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from pct import certification_catalog
+from pct.models import Certification, CertificationLevel, CertificationTemplate, CertificationType
+
+
+class CertificationCatalogTests(TestCase):
+    def setUp(self):
+        certification_catalog.invalidate()
+        self.addCleanup(certification_catalog.invalidate)
+        staff = get_user_model().objects.create_user(username="staff")
+        staff.profile.role = "staff"
+        staff.profile.save()
+        self.staff_profile = staff.profile
+        self.client = Client()
+        self.client.force_login(staff)
+
+        self.level1 = CertificationLevel.objects.create(level=1)
+        self.level2 = CertificationLevel.objects.create(level=2)
+        self.printer = CertificationType.objects.create(name="3D Printer", description="Prusa MK4")
+        self.laser = CertificationType.objects.create(name="Laser Cutter", description="Glowforge")
+        self.printer_cert = CertificationTemplate.objects.create(type=self.printer, level=self.level1)
+        CertificationTemplate.objects.create(type=self.printer, level=self.level2)
+        CertificationTemplate.objects.create(type=self.laser, level=self.level1)
+
+    def _search(self, query="", **headers):
+        return self.client.get(reverse("search_certifications_api"), {"q": query}, **headers)
+
+    def _names(self, query):
+        return [(cert["name"], cert["level"]) for cert in self._search(query).json()["certifications"]]
+
+    def test_filters_the_catalog_in_memory(self):
+        self.assertEqual(
+            self._names("printer"), [("3D Printer", 1), ("3D Printer", 2)]
+        )
+        self.assertEqual(self._names("GLOWFORGE"), [("Laser Cutter", 1)])
+        self.assertEqual(self._names("2"), [("3D Printer", 2)])
+        self.assertEqual(len(self._names("")), 3)
+
+        with CaptureQueriesContext(connection) as queries:
+            self._names("laser")
+        self.assertFalse(any("pct_certification" in query["sql"] for query in queries.captured_queries))
+
+    def test_updating_to_an_existing_level_is_refused(self):
+        response = self.client.post(
+            reverse("update_certification_api", args=[self.printer_cert.pk]),
+            json.dumps({"title": "Resin Printer", "level": 2}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.printer.refresh_from_db()
+        self.assertEqual(self.printer.name, "3D Printer")
+
+    def test_revalidation_answers_304_until_the_catalog_changes(self):
+        response = self._search("printer")
+        etag = response["ETag"]
+        self.assertIn("no-cache", response["Cache-Control"])
+
+        response = self._search("printer", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.client.post(
+            reverse("update_certification_api", args=[self.printer_cert.pk]),
+            json.dumps({"title": "Resin Printer"}),
+            content_type="application/json",
+        )
+        response = self._search("printer", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(self._names("resin"), [("Resin Printer", 1), ("Resin Printer", 2)])
+
+    def test_created_certification_appears(self):
+        etag = self._search()["ETag"]
+        self.client.post(
+            reverse("create_certification_api"),
+            json.dumps({"title": "CNC Router", "level": 2}),
+            content_type="application/json",
+        )
+        self.assertEqual(self._search(HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.assertEqual(self._names("cnc"), [("CNC Router", 2)])
+
+    def test_granting_a_certification_keeps_the_catalog(self):
+        etag = self._search()["ETag"]
+        Certification.objects.create(profile=self.staff_profile, type=self.laser, level=self.level2)
+        self.assertEqual(self._search(HTTP_IF_NONE_MATCH=etag).status_code, 304)
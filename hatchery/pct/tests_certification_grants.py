@@ -0,0 +1,115 @@
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from pct import certification_grants
+from pct.models import ActivityLog, Certification, CertificationLevel, CertificationTemplate, CertificationType, Profile
+
+
+@override_settings(ACTIVITY_LOG_BUFFERED=False)
+class CertificationGrantTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        staff = User.objects.create_user(username="staff")
+        staff.profile.role = "staff"
+        staff.profile.save()
+        self.client = Client()
+        self.client.force_login(staff)
+
+        level = CertificationLevel.objects.create(level=1)
+        self.templates = [
+            CertificationTemplate.objects.create(type=CertificationType.objects.create(name=name), level=level)
+            for name in ("3D Printer", "Laser Cutter", "Soldering")
+        ]
+        self.students = [User.objects.create_user(username=f"student{number}") for number in range(30)]
+
+    def _profiles(self, users):
+        return list(Profile.objects.filter(user__in=users).select_related("user"))
+
+    def _grant(self, users, templates):
+        with CaptureQueriesContext(connection) as queries:
+            result = certification_grants.grant(self._profiles(users), templates)
+        return result, len(queries.captured_queries)
+
+    def test_query_count_does_not_grow_with_users(self):
+        _, few = self._grant(self.students[:2], self.templates)
+        _, many = self._grant(self.students[2:], self.templates)
+        # One ActivityLog write per user is the only per-user cost.
+        self.assertEqual(many - few, 26)
+        self.assertEqual(Certification.objects.count(), 90)
+
+    def test_existing_grants_are_skipped(self):
+        first = self.students[0].profile
+        Certification.objects.create(profile=first, type=self.templates[0].type, level=self.templates[0].level)
+        ActivityLog.objects.all().delete()
+
+        result, _ = self._grant(self.students[:2], self.templates)
+
+        self.assertEqual(result.created, 5)
+        self.assertEqual(result.already_had[first.pk], ["3D Printer - Level 1"])
+        self.assertEqual(first.certificates.count(), 3)
+        self.assertEqual(
+            list(ActivityLog.objects.filter(user=self.students[0]).values_list("description", flat=True)),
+            ["Added certifications: Laser Cutter - Level 1, Soldering - Level 1"],
+        )
+        self.assertEqual(ActivityLog.objects.count(), 2)
+
+    def test_rows_the_insert_skipped_are_not_reported(self):
+        # As if a conflicting grant had claimed every row first.
+        with mock.patch.object(Certification.objects, "bulk_create", return_value=[]):
+            result, _ = self._grant(self.students[:2], self.templates)
+
+        self.assertEqual(result.created, 0)
+        self.assertEqual(len(result.already_had[self.students[0].profile.pk]), 3)
+        self.assertFalse(ActivityLog.objects.filter(action="certification").exists())
+
+    def test_duplicate_grants_are_rejected(self):
+        template = self.templates[0]
+        profile = self.students[0].profile
+        Certification.objects.create(profile=profile, type=template.type, level=template.level)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Certification.objects.create(profile=profile, type=template.type, level=template.level)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            CertificationTemplate.objects.create(type=template.type, level=template.level)
+
+    def test_bulk_certify_api_grants_the_session_selection(self):
+        session = self.client.session
+        session["selected_certification_ids"] = [template.pk for template in self.templates[:2]]
+        session.save()
+
+        response = self.client.post(
+            reverse("bulk_certify_api"),
+            json.dumps({"user_ids": [student.pk for student in self.students[:5]]}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.json()["created"], 10)
+        self.assertEqual(len(response.json()["users"]), 5)
+        self.assertEqual(self.client.session["selected_certification_ids"], [])
+
+    def test_bulk_certify_api_requires_staff(self):
+        student = Client()
+        student.force_login(self.students[0])
+        response = student.post(
+            reverse("bulk_certify_api"),
+            json.dumps({"user_ids": [self.students[1].pk], "certification_ids": [self.templates[0].pk]}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Certification.objects.exists())
+
+    def test_profile_page_lists_grants_in_one_query(self):
+        student = self.students[0]
+        student.profile.role = "student"
+        student.profile.save()
+        certification_grants.grant(self._profiles([student]), self.templates)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("view_student_profile", args=[student.pk]))
+        self.assertContains(response, "Soldering")
+        certification_queries = [query for query in queries.captured_queries if "pct_certification" in query["sql"]]
+        self.assertEqual(len(certification_queries), 1)
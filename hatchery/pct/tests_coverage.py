@@ -0,0 +1,167 @@
+from datetime import datetime, time, timedelta
+import random
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from pct import coverage, semester_calendar
+from pct.models import (
+    Availability,
+    Certification,
+    CertificationLevel,
+    CertificationType,
+    OpenHour,
+    RoomReservation,
+    ScheduleWeek,
+    Semester,
+    Shift,
+)
+
+
+class CoveringProfilesTests(SimpleTestCase):
+    def test_sweep_matches_brute_force(self):
+        rng = random.Random(7)
+        windows = {}
+        for profile_id in range(40):
+            raw = []
+            for _ in range(rng.randint(0, 6)):
+                start = rng.randrange(0, 160)
+                raw.append((start, start + rng.randint(1, 10)))
+            windows[profile_id] = coverage.merge_windows(raw)
+        shifts = []
+        for pk in range(150):
+            start = rng.randrange(0, 165)
+            shifts.append(SimpleNamespace(pk=pk, start=start, end=start + rng.randint(1, 4)))
+
+        found = coverage.covering_profiles(windows, shifts)
+
+        for shift in shifts:
+            expected = {
+                profile_id
+                for profile_id, merged in windows.items()
+                if any(start <= shift.start and end >= shift.end for start, end in merged)
+            }
+            self.assertEqual(set(found[shift.pk]), expected)
+            self.assertEqual(len(found[shift.pk]), len(expected))
+
+    def test_back_to_back_windows_cover_a_shift_across_them(self):
+        windows = {1: coverage.merge_windows([(12, 14), (9, 12)])}
+        shift = SimpleNamespace(pk=1, start=10, end=13)
+        self.assertEqual(coverage.covering_profiles(windows, [shift]), {1: [1]})
+
+
+class WeekCoverageTests(TestCase):
+    def setUp(self):
+        today = timezone.localdate()
+        self.week_start = today + timedelta(days=(7 - today.weekday()))
+        semester_calendar.invalidate()
+        semester = Semester.objects.create(
+            name="Fall",
+            start_date=self.week_start,
+            end_date=self.week_start + timedelta(days=30),
+            is_active=True,
+        )
+        for weekday in range(7):
+            OpenHour.objects.create(semester=semester, weekday=weekday, open_time=time(8, 0), close_time=time(20, 0))
+        self.week = ScheduleWeek.objects.create(week_start=self.week_start)
+        self.laser = CertificationType.objects.create(name="Laser")
+        self.level = CertificationLevel.objects.create(level=1)
+        User = get_user_model()
+        self.staff_user = User.objects.create_user(username="staff", password="pass")
+        self.staff_user.profile.role = "staff"
+        self.staff_user.profile.save()
+        self.alex = self._member("alex")
+        self.blair = self._member("blair")
+
+    def tearDown(self):
+        semester_calendar.invalidate()
+
+    def _member(self, username):
+        profile = get_user_model().objects.create_user(username=username).profile
+        profile.role = "team_member"
+        profile.save()
+        return profile
+
+    def _at(self, day, hour, minute=0):
+        return timezone.make_aware(datetime.combine(self.week_start + timedelta(days=day), time(hour, minute)))
+
+    def _available(self, profile, day, start, end):
+        Availability.objects.create(profile=profile, week=self.week, start=self._at(day, start), end=self._at(day, end))
+
+    def _shift(self, day, start, end, min_staffing=1, assigned_to=None):
+        return Shift.objects.create(
+            schedule_week=self.week,
+            title="Front desk",
+            location=RoomReservation.RoomChoices.HATCH_FRONT,
+            start=self._at(day, start),
+            end=self._at(day, end),
+            min_staffing=min_staffing,
+            assigned_to=assigned_to,
+        )
+
+    def test_candidates_and_heatmap(self):
+        self._available(self.alex, 0, 9, 12)
+        self._available(self.alex, 0, 12, 14)
+        self._available(self.blair, 0, 10, 12)
+        Certification.objects.create(profile=self.blair, type=self.laser, level=self.level)
+        laser_shift = self._shift(0, 10, 12, min_staffing=2, assigned_to=self.alex)
+        laser_shift.required_certifications.add(self.laser)
+        long_shift = self._shift(0, 11, 14)
+
+        week = coverage.WeekCoverage(self.week)
+
+        self.assertCountEqual(week.candidates_for(laser_shift), [(self.alex, False), (self.blair, True)])
+        self.assertEqual(week.candidates_for(long_shift), [(self.alex, True)])
+        heatmap = week.heatmap()
+        self.assertEqual(heatmap.required[9:14], [0, 2, 3, 1, 1])
+        self.assertEqual(heatmap.assigned[9:14], [0, 1, 1, 0, 0])
+        self.assertEqual(heatmap.available[9:14], [1, 2, 2, 1, 1])
+        self.assertEqual(sum(heatmap.required[24:]), 0)
+
+    def test_partial_hours_count_toward_the_hour(self):
+        Shift.objects.create(
+            schedule_week=self.week,
+            title="Front desk",
+            location=RoomReservation.RoomChoices.HATCH_FRONT,
+            start=self._at(1, 9, 30),
+            end=self._at(1, 10, 15),
+        )
+        heatmap = coverage.WeekCoverage(self.week).heatmap()
+        self.assertEqual(heatmap.required[24 + 9 : 24 + 12], [1, 1, 0])
+
+    def test_api_query_count_does_not_grow_with_the_week(self):
+        client = Client()
+        client.force_login(self.staff_user)
+        url = f"{reverse('schedule_coverage_api')}?week_start={self.week_start}"
+        self._available(self.alex, 0, 9, 17)
+        self._shift(0, 9, 11).required_certifications.add(self.laser)
+        with CaptureQueriesContext(connection) as small:
+            client.get(url)
+
+        for day in range(1, 7):
+            for profile in (self.alex, self.blair):
+                self._available(profile, day, 9, 17)
+            for hour in (9, 11, 13, 15):
+                self._shift(day, hour, hour + 2).required_certifications.add(self.laser)
+
+        with self.assertNumQueries(len(small.captured_queries)):
+            response = client.get(url)
+        data = response.json()
+        self.assertEqual(len(data["shifts"]), 25)
+        self.assertEqual(len(data["heatmap"]), 7)
+        self.assertEqual(data["heatmap"][1]["available"][9], 2)
+        self.assertEqual(
+            {candidate["id"]: candidate["certified"] for candidate in data["shifts"][-1]["candidates"]},
+            {self.alex.pk: False, self.blair.pk: False},
+        )
+
+    def test_api_is_staff_only(self):
+        client = Client()
+        client.force_login(self.alex.user)
+        response = client.get(reverse("schedule_coverage_api"), {"week_start": self.week_start.isoformat()})
+        self.assertEqual(response.status_code, 403)
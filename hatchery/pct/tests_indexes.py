@@ -0,0 +1,103 @@
+from datetime import timedelta
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+from django.utils import timezone
+
+from pct.models import (
+    ActivityLog,
+    CertificationLevel,
+    RoomReservation,
+    ScheduleWeek,
+    Shift,
+    Training,
+    TrainingWaitlist,
+)
+
+
+class HotQueryIndexTests(TestCase):
+    """Each hot predicate should be answered from its index, not a table scan."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(username="student", password="pass")
+        cls.profile = user.profile
+        level = CertificationLevel.objects.create(level=1)
+        cls.training = Training.objects.create(name="Laser intro", machine="Glowforge Pro", level=level)
+        cls.week = ScheduleWeek.objects.create(week_start=timezone.localdate())
+
+    def assertUsesIndex(self, queryset, index_name):
+        if connection.vendor == "postgresql":
+            # Empty test tables make a sequential scan cheapest; take it off the table.
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, msg=f"Expected {index_name} in plan:\n{plan}")
+
+    def test_reservation_overlap_check(self):
+        start = timezone.now()
+        queryset = (
+            RoomReservation.objects.exclude(status=RoomReservation.StatusChoices.DENIED)
+            .filter(
+                room=RoomReservation.RoomChoices.HATCH_FRONT,
+                start_time__lt=start + timedelta(hours=1),
+                end_time__gt=start,
+            )
+            .order_by()
+        )
+        self.assertUsesIndex(queryset, "pct_resv_room_active_idx")
+
+    def test_pending_reservation_queue(self):
+        queryset = RoomReservation.objects.filter(
+            status=RoomReservation.StatusChoices.PENDING
+        ).order_by("start_time")
+        self.assertUsesIndex(queryset, "pct_resv_status_start_idx")
+
+    def test_reservation_history_pages(self):
+        self.assertUsesIndex(RoomReservation.objects.order_by("-start_time", "-id")[:26], "pct_resv_start_idx")
+        queryset = RoomReservation.objects.filter(room=RoomReservation.RoomChoices.PROTO_SHOP).order_by(
+            "-start_time", "-id"
+        )[:26]
+        self.assertUsesIndex(queryset, "pct_resv_room_start_idx")
+
+    def test_upcoming_trainings(self):
+        queryset = Training.objects.filter(time__gte=timezone.now()).order_by("time")
+        self.assertUsesIndex(queryset, "pct_training_time_idx")
+
+    def test_weekly_assigned_shifts(self):
+        queryset = Shift.objects.filter(schedule_week=self.week, assigned_to=self.profile).order_by()
+        self.assertUsesIndex(queryset, "pct_shift_week_assignee_idx")
+
+    def test_next_waitlisted(self):
+        queryset = self.training.waitlist.filter(status="waiting").order_by("created_at")[:1]
+        self.assertUsesIndex(queryset, "pct_waitlist_queue_idx")
+
+    def test_recent_activity(self):
+        self.assertUsesIndex(ActivityLog.objects.all()[:50], "pct_activitylog_created_idx")
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "Exclusion constraint is PostgreSQL-only")
+class ReservationOverlapConstraintTests(TestCase):
+    def test_database_rejects_overlapping_reservations(self):
+        profile = get_user_model().objects.create_user(username="student", password="pass").profile
+        start = timezone.now().replace(microsecond=0)
+        common = {
+            "requester": profile,
+            "room": RoomReservation.RoomChoices.PROTO_SHOP,
+            "affiliation": "ENGR 101",
+        }
+        RoomReservation.objects.create(start_time=start, end_time=start + timedelta(hours=2), **common)
+        # Touching intervals and denied requests don't conflict.
+        RoomReservation.objects.create(
+            start_time=start + timedelta(hours=2), end_time=start + timedelta(hours=3), **common
+        )
+        RoomReservation.objects.create(
+            start_time=start, end_time=start + timedelta(hours=1),
+            status=RoomReservation.StatusChoices.DENIED, **common
+        )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            RoomReservation.objects.create(
+                start_time=start + timedelta(hours=1), end_time=start + timedelta(hours=2), **common
+            )
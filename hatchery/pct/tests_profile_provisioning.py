@@ -0,0 +1,102 @@
+import io
+from unittest import mock
+
+from allauth.account.adapter import get_adapter as get_account_adapter
+from allauth.socialaccount.models import SocialAccount, SocialLogin
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test import Client, RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from pct import user_search
+from pct.adapters import BCOnlySocialAccountAdapter
+from pct.models import Profile
+from pct.signals import ensure_profile
+
+
+def _profile_queries(queries):
+    return [query["sql"] for query in queries.captured_queries if '"pct_profile"' in query["sql"]]
+
+
+class ProfileProvisioningTests(TestCase):
+    def test_new_user_gets_a_profile_in_one_insert(self):
+        with CaptureQueriesContext(connection) as queries:
+            user = get_user_model().objects.create_user(username="student", password="pass")
+        profile_sql = _profile_queries(queries)
+        self.assertEqual(len(profile_sql), 1)
+        self.assertTrue(profile_sql[0].startswith('INSERT INTO "pct_profile"'))
+        self.assertTrue(Profile.objects.filter(user=user).exists())
+
+    def test_password_login_leaves_the_profile_alone(self):
+        User = get_user_model()
+        User.objects.create_user(username="student", password="pass")
+        # What the login costs with no profile signal at all.
+        post_save.disconnect(ensure_profile, sender=User)
+        try:
+            with CaptureQueriesContext(connection) as baseline:
+                self.assertTrue(Client().login(username="student", password="pass"))
+        finally:
+            post_save.connect(ensure_profile, sender=User)
+
+        with self.assertNumQueries(len(baseline.captured_queries)) as queries:
+            self.assertTrue(Client().login(username="student", password="pass"))
+        self.assertEqual(_profile_queries(queries), [])
+
+    def test_google_signup_and_return_visit(self):
+        adapter = BCOnlySocialAccountAdapter()
+        request = RequestFactory().get("/accounts/google/login/callback/")
+        SessionMiddleware(lambda request: None).process_request(request)
+        sociallogin = SocialLogin(
+            user=get_user_model()(username="eagle", email="eagle@bc.edu"),
+            account=SocialAccount(provider="google", uid="1234567890"),
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            user = adapter.save_user(request, sociallogin)
+        profile_sql = _profile_queries(queries)
+        self.assertEqual(len(profile_sql), 1)
+        self.assertTrue(profile_sql[0].startswith('INSERT INTO "pct_profile"'))
+
+        # Signing in re-saves the user to stamp last_login; that no longer touches the profile.
+        with CaptureQueriesContext(connection) as queries:
+            get_account_adapter(request).login(request, user)
+        self.assertEqual(_profile_queries(queries), [])
+
+    def test_backfill_creates_only_missing_profiles(self):
+        User = get_user_model()
+        kept = User.objects.create_user(username="kept")
+        kept.profile.role = "staff"
+        kept.profile.save()
+        orphans = [User.objects.create_user(username=f"orphan-{number}") for number in range(3)]
+        Profile.objects.filter(user__in=orphans).delete()
+
+        out = io.StringIO()
+        call_command("backfill_profiles", stdout=out)
+
+        self.assertEqual(Profile.objects.filter(user__in=orphans).count(), 3)
+        self.assertEqual(Profile.objects.get(user=kept).role, "staff")
+        self.assertIn("Created 3 profile(s).", out.getvalue())
+
+    def test_backfill_counts_rows_not_objects(self):
+        orphan = get_user_model().objects.create_user(username="orphan")
+        Profile.objects.filter(user=orphan).delete()
+
+        out = io.StringIO()
+        # bulk_create(ignore_conflicts=True) hands back every object, including the ones it skipped.
+        with mock.patch.object(Profile.objects, "bulk_create", side_effect=lambda profiles, **kwargs: profiles):
+            call_command("backfill_profiles", stdout=out)
+
+        self.assertFalse(Profile.objects.filter(user=orphan).exists())
+        self.assertIn("Created 0 profile(s).", out.getvalue())
+
+    def test_backfilled_profiles_are_searchable(self):
+        user = get_user_model().objects.create_user(username="orphan", first_name="Olive")
+        Profile.objects.filter(user=user).delete()
+
+        call_command("backfill_profiles", stdout=io.StringIO())
+
+        users = get_user_model().objects.all()
+        self.assertEqual(list(user_search.search(users, "oli")), [user])
@@ -0,0 +1,95 @@
+from io import StringIO
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from hatchery import request_metrics
+from hatchery.request_metrics import QueryBudgetExceeded
+
+
+@override_settings(REQUEST_METRICS_ENABLED=True, REQUEST_QUERY_BUDGETS={}, REQUEST_QUERY_BUDGET_STRICT=False)
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        request_metrics.reset_samples()
+        User = get_user_model()
+        self.staff_user = User.objects.create_user(username="staff", password="pass")
+        self.staff_user.profile.role = "staff"
+        self.staff_user.profile.save()
+        self.student_user = User.objects.create_user(username="student", password="pass")
+        self.student_user.profile.role = "student"
+        self.student_user.profile.save()
+
+    def tearDown(self):
+        request_metrics.reset_samples()
+
+    def _rows(self):
+        return {row["url_name"]: row for row in request_metrics.summarize()}
+
+    def test_records_queries_templates_and_size_per_url_name(self):
+        client = Client()
+        client.force_login(self.staff_user)
+        for _ in range(3):
+            self.assertEqual(client.get(reverse("home")).status_code, 200)
+
+        row = self._rows()["home"]
+        self.assertEqual(row["count"], 3)
+        self.assertGreater(row["queries"]["p50"], 0)
+        self.assertGreater(row["template_ms"]["p95"], 0)
+        self.assertGreater(row["bytes"]["p99"], 0)
+        self.assertLessEqual(row["total_ms"]["p50"], row["total_ms"]["p99"])
+
+    def test_percentiles_use_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(request_metrics._percentile(values, 50), 50)
+        self.assertEqual(request_metrics._percentile(values, 95), 95)
+        self.assertEqual(request_metrics._percentile(values, 99), 99)
+        self.assertEqual(request_metrics._percentile([7], 99), 7)
+
+    def test_strict_budget_fails_request(self):
+        client = Client()
+        client.force_login(self.staff_user)
+        with self.settings(REQUEST_QUERY_BUDGETS={"home": 0}, REQUEST_QUERY_BUDGET_STRICT=True):
+            with self.assertRaises(QueryBudgetExceeded):
+                client.get(reverse("home"))
+
+    def test_budget_overrun_logs_warning_by_default(self):
+        client = Client()
+        client.force_login(self.staff_user)
+        with self.settings(REQUEST_QUERY_BUDGETS={"home": 0}):
+            with self.assertLogs("hatchery.request_metrics", level="WARNING"):
+                response = client.get(reverse("home"))
+        self.assertEqual(response.status_code, 200)
+
+    def test_summary_endpoint_is_staff_only(self):
+        client = Client()
+        client.force_login(self.student_user)
+        self.assertEqual(client.get(reverse("request_metrics_api")).status_code, 403)
+
+        client.force_login(self.staff_user)
+        client.get(reverse("home"))
+        response = client.get(reverse("request_metrics_api"))
+        self.assertEqual(response.status_code, 200)
+        names = [row["url_name"] for row in json.loads(response.content)["views"]]
+        self.assertIn("home", names)
+
+    def test_management_command_samples_and_reports(self):
+        out = StringIO()
+        call_command(
+            "request_metrics", "--reset", "--request", reverse("home"),
+            "--user", "staff", "--repeat", "2", stdout=out,
+        )
+        self.assertIn("home", out.getvalue())
+        self.assertEqual(self._rows()["home"]["count"], 2)
+
+
+class RequestMetricsDisabledTests(TestCase):
+    def test_nothing_recorded_when_disabled(self):
+        request_metrics.reset_samples()
+        user = get_user_model().objects.create_user(username="staff", password="pass")
+        client = Client()
+        client.force_login(user)
+        client.get(reverse("home"))
+        self.assertEqual(request_metrics.summarize(), [])
@@ -0,0 +1,114 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from pct import reservation_queue
+from pct.models import RoomReservation
+
+
+class ReservationQueueTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        staff = User.objects.create_user(username="staff")
+        staff.profile.role = "staff"
+        staff.profile.save()
+        self.client = Client()
+        self.client.force_login(staff)
+        self.alice = User.objects.create_user(username="alice").profile
+        self.bob = User.objects.create_user(username="bob").profile
+        self.start = (timezone.now() + timedelta(days=1)).replace(hour=9, minute=0, second=0, microsecond=0)
+
+    def _reserve(self, hours, requester=None, room=RoomReservation.RoomChoices.PROTO_SHOP, **fields):
+        start = self.start + timedelta(hours=hours)
+        return RoomReservation.objects.create(
+            requester=requester or self.alice,
+            room=room,
+            start_time=start,
+            end_time=start + timedelta(minutes=30),
+            affiliation="ENGR 101",
+            **fields,
+        )
+
+    def _get(self, **params):
+        return self.client.get(reverse("reservations"), params)
+
+    def test_pending_queue_pages_soonest_first(self):
+        reservations = [self._reserve(hours) for hours in range(5)]
+        # Same start time: the id breaks the tie.
+        reservations.append(self._reserve(4, room=RoomReservation.RoomChoices.HATCH_FRONT))
+
+        seen, cursor = [], None
+        while True:
+            rows, cursor = reservation_queue.page(
+                status=RoomReservation.StatusChoices.PENDING, cursor=cursor, newest_first=False, limit=2
+            )
+            seen.extend(rows)
+            if not cursor:
+                break
+        self.assertEqual(seen, reservations)
+
+    def test_history_pages_through_the_view(self):
+        reservations = [self._reserve(hours) for hours in range(5)]
+        with mock.patch.object(reservation_queue, "PAGE_SIZE", 3):
+            first = self._get()
+            second = self._get(cursor=first.context["next_history_cursor"])
+        self.assertEqual(list(first.context["all_room_reservations"]), reservations[:1:-1])
+        self.assertEqual(list(second.context["all_room_reservations"]), reservations[1::-1])
+        self.assertIsNone(second.context["next_history_cursor"])
+
+    def test_filters(self):
+        early = self._reserve(0)
+        self._reserve(1, requester=self.bob)
+        self._reserve(2, room=RoomReservation.RoomChoices.HATCH_FRONT)
+        approved = self._reserve(48, status=RoomReservation.StatusChoices.APPROVED)
+
+        def history(**params):
+            return list(self._get(**params).context["all_room_reservations"])
+
+        self.assertEqual(len(history(requester="bob")), 1)
+        self.assertEqual(len(history(room=RoomReservation.RoomChoices.HATCH_FRONT)), 1)
+        self.assertEqual(history(status="approved"), [approved])
+        day = timezone.localtime(self.start).date()
+        self.assertEqual(len(history(**{"from": day, "to": day})), 3)
+        self.assertEqual(
+            list(self._get(requester="alice", room=RoomReservation.RoomChoices.PROTO_SHOP).context["pending_room_reservations"]),
+            [early],
+        )
+
+    def test_moderation_post_skips_the_queues(self):
+        reservation = self._reserve(0)
+        with mock.patch.object(reservation_queue, "page", wraps=reservation_queue.page) as page:
+            response = self.client.post(
+                reverse("reservations"), {"form_type": "approve_reservation", "reservation_id": reservation.pk}
+            )
+            self.assertRedirects(response, reverse("reservations"), fetch_redirect_response=False)
+            page.assert_not_called()
+
+            self.client.post(reverse("reservations"), {"form_type": "room_request", "room": "nowhere"})
+            self.assertEqual(page.call_count, 2)
+
+    def test_moderation_api_returns_the_changed_card(self):
+        reservation = self._reserve(0)
+        response = self.client.post(
+            reverse("moderate_reservation_api", args=[reservation.pk]), {"action": "approve"}
+        )
+        data = response.json()
+        self.assertEqual(data["status"], "approved")
+        self.assertIn(f'data-reservation-id="{reservation.pk}"', data["html"])
+        self.assertNotIn("btn-approve", data["html"])
+        reservation.refresh_from_db()
+        self.assertEqual(reservation.status, RoomReservation.StatusChoices.APPROVED)
+        self.assertIsNotNone(reservation.reviewed_at)
+
+    def test_moderation_api_requires_staff(self):
+        reservation = self._reserve(0)
+        student = Client()
+        student.force_login(self.alice.user)
+        response = student.post(reverse("moderate_reservation_api", args=[reservation.pk]), {"action": "deny"})
+        self.assertEqual(response.status_code, 403)
+        reservation.refresh_from_db()
+        self.assertEqual(reservation.status, RoomReservation.StatusChoices.PENDING)
@@ -0,0 +1,139 @@
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from pct import reservation_series, semester_calendar
+from pct.models import ActivityLog, Holiday, RoomReservation, RoomReservationSeries, Semester
+
+STUDIO = RoomReservation.RoomChoices.PROTO_STUDIO
+TUESDAY, THURSDAY = 1, 3
+
+
+@override_settings(ACTIVITY_LOG_BUFFERED=False)
+class ReservationSeriesTests(TestCase):
+    def setUp(self):
+        semester_calendar.invalidate()
+        self.addCleanup(semester_calendar.invalidate)
+        # Fifteen weeks starting on a Monday, all in the future.
+        today = timezone.localdate()
+        self.monday = today + timedelta(days=7 - today.weekday())
+        self.semester = Semester.objects.create(
+            name="Fall",
+            start_date=self.monday,
+            end_date=self.monday + timedelta(weeks=15, days=-1),
+            is_active=True,
+        )
+        Holiday.objects.create(semester=self.semester, date=self.monday + timedelta(weeks=7, days=THURSDAY), name="Break")
+        self.profile = get_user_model().objects.create_user(username="prof").profile
+        self.profile.role = "student"
+        self.profile.save()
+
+    def _at(self, day, hour):
+        return timezone.make_aware(datetime.combine(day, time(hour, 0)))
+
+    def _book(self, **overrides):
+        arguments = {
+            "requester": self.profile,
+            "room": STUDIO,
+            "weekdays": [TUESDAY, THURSDAY],
+            "start_time": time(10, 0),
+            "end_time": time(12, 0),
+            "first_date": self.semester.start_date,
+            "last_date": self.semester.end_date,
+            "affiliation": "ENGR 101",
+            "semester": self.semester,
+        }
+        arguments.update(overrides)
+        return reservation_series.book(**arguments)
+
+    def _reserve(self, start, end, **fields):
+        return RoomReservation.objects.create(
+            requester=self.profile, room=STUDIO, start_time=start, end_time=end, affiliation="Club", **fields
+        )
+
+    def test_books_every_week_but_holidays_in_fixed_queries(self):
+        semester_calendar.get_calendar()
+        with CaptureQueriesContext(connection) as few:
+            self._book(room=RoomReservation.RoomChoices.HATCH_BACK, last_date=self.monday + timedelta(days=6))
+        with CaptureQueriesContext(connection) as queries:
+            result = self._book()
+        self.assertEqual(result.created, 29)
+        self.assertEqual(len(queries.captured_queries), len(few.captured_queries))
+        starts = list(result.series.occurrences.order_by("start_time").values_list("start_time", flat=True))
+        self.assertEqual(starts[0], self._at(self.monday + timedelta(days=TUESDAY), 10))
+        self.assertNotIn(self._at(self.monday + timedelta(weeks=7, days=THURSDAY), 10), starts)
+        self.assertEqual(
+            ActivityLog.objects.filter(
+                description="Requested recurring room reservation: Third Floor • Prototyping Studio (29 dates)"
+            ).count(),
+            1,
+        )
+
+    def test_conflicts_are_reported_per_occurrence(self):
+        second_tuesday = self.monday + timedelta(weeks=1, days=TUESDAY)
+        taken = self._reserve(self._at(second_tuesday, 11), self._at(second_tuesday, 13))
+        self._reserve(self._at(second_tuesday, 12), self._at(second_tuesday, 14))
+        self._reserve(
+            self._at(second_tuesday + timedelta(days=2), 9),
+            self._at(second_tuesday + timedelta(days=2), 11),
+            status=RoomReservation.StatusChoices.DENIED,
+        )
+
+        with self.assertRaises(reservation_series.SeriesConflict) as caught:
+            self._book()
+        self.assertEqual(
+            {slot: [held.pk for held in clashes] for slot, clashes in caught.exception.conflicts.items()},
+            {(self._at(second_tuesday, 10), self._at(second_tuesday, 12)): [taken.pk]},
+        )
+        self.assertFalse(RoomReservationSeries.objects.exists())
+
+        result = self._book(skip_conflicts=True)
+        self.assertEqual(result.created, 28)
+        self.assertEqual(len(result.conflicts), 1)
+
+    def test_series_moderation(self):
+        series = self._book().series
+        staff = get_user_model().objects.create_user(username="staff")
+        staff.profile.role = "staff"
+        staff.profile.save()
+        client = Client()
+        client.force_login(staff)
+        first = series.occurrences.order_by("start_time").first()
+
+        response = client.post(
+            reverse("moderate_reservation_api", args=[first.pk]), {"action": "approve", "scope": "series"}
+        )
+
+        self.assertEqual(response.json()["changed"], 29)
+        self.assertEqual(len(response.json()["cards"]), 29)
+        self.assertEqual(
+            set(series.occurrences.values_list("status", flat=True)), {RoomReservation.StatusChoices.APPROVED}
+        )
+        series.refresh_from_db()
+        self.assertEqual(series.status, RoomReservation.StatusChoices.APPROVED)
+
+        self.assertEqual(reservation_series.moderate(series, False, staff.profile), 29)
+        self.assertFalse(series.occurrences.exclude(status=RoomReservation.StatusChoices.DENIED).exists())
+
+    def test_series_form(self):
+        client = Client()
+        client.force_login(self.profile.user)
+        response = client.post(
+            reverse("reservations"),
+            {
+                "form_type": "room_series",
+                "room": STUDIO,
+                "semester": self.semester.pk,
+                "weekdays": [TUESDAY],
+                "start_time": "14:00",
+                "end_time": "15:30",
+                "affiliation": "ENGR 101",
+            },
+        )
+        self.assertRedirects(response, reverse("reservations"))
+        self.assertEqual(RoomReservation.objects.filter(series__isnull=False).count(), 15)
@@ -0,0 +1,91 @@
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from pct import room_availability, semester_calendar
+from pct.models import Holiday, OpenHour, RoomReservation, Semester
+
+SHOP = RoomReservation.RoomChoices.PROTO_SHOP
+STUDIO = RoomReservation.RoomChoices.PROTO_STUDIO
+
+
+class RoomAvailabilityTests(TestCase):
+    def setUp(self):
+        semester_calendar.invalidate()
+        self.addCleanup(semester_calendar.invalidate)
+        self.profile = get_user_model().objects.create_user(username="student").profile
+        self.client = Client()
+        self.client.force_login(self.profile.user)
+        self.day = timezone.localdate() + timedelta(days=7)
+        self.semester = Semester.objects.create(
+            name="Fall", start_date=self.day - timedelta(days=30), end_date=self.day + timedelta(days=30), is_active=True
+        )
+        OpenHour.objects.create(semester=self.semester, weekday=self.day.weekday(), open_time=time(9, 0), close_time=time(17, 0))
+        semester_calendar.invalidate()
+
+    def _at(self, hour, minute=0, day=None):
+        return timezone.make_aware(datetime.combine(day or self.day, time(hour, minute)))
+
+    def _reserve(self, start, end, room=SHOP, **fields):
+        return RoomReservation.objects.create(
+            requester=self.profile, room=room, start_time=start, end_time=end, affiliation="ENGR 101", **fields
+        )
+
+    def _slots(self, minutes, room=SHOP):
+        return [
+            (slot.room, slot.start, slot.end)
+            for slot in room_availability.free_slots(self.day, timedelta(minutes=minutes), room=room)
+        ]
+
+    def test_merge_and_gaps(self):
+        merged = room_availability.merge([(3, 5), (1, 2), (2, 3), (7, 8), (7, 9)])
+        self.assertEqual(merged, [(1, 5), (7, 9)])
+        self.assertEqual(room_availability.gaps(0, 10, merged), [(0, 1), (5, 7), (9, 10)])
+        self.assertEqual(room_availability.gaps(2, 4, merged), [])
+
+    def test_gaps_between_reservations_inside_open_hours(self):
+        self._reserve(self._at(8), self._at(10))
+        self._reserve(self._at(10, 10), self._at(11, 50), is_exclusive_request=True)
+        self._reserve(self._at(11, 30), self._at(13))
+        self._reserve(self._at(13), self._at(16), status=RoomReservation.StatusChoices.DENIED)
+
+        self.assertEqual(self._slots(30), [(SHOP, self._at(13), self._at(17))])
+        # 10:00-10:10 is free but has no whole 15-minute step.
+        self.assertEqual(self._slots(0), [(SHOP, self._at(13), self._at(17))])
+
+    def test_any_room_in_one_reservation_query(self):
+        self._reserve(self._at(9), self._at(17))
+        with CaptureQueriesContext(connection) as queries:
+            slots = self._slots(60, room=None)
+        self.assertEqual(len(slots), len(RoomReservation.RoomChoices.values) - 1)
+        self.assertNotIn(SHOP, [room for room, _, _ in slots])
+        reservation_queries = [query for query in queries.captured_queries if "pct_roomreservation" in query["sql"]]
+        self.assertEqual(len(reservation_queries), 1)
+
+    def test_holidays_are_closed(self):
+        Holiday.objects.create(semester=self.semester, date=self.day, name="Break")
+        self.assertEqual(self._slots(15), [])
+
+    def test_api(self):
+        self._reserve(self._at(9), self._at(16), room=STUDIO)
+        response = self.client.get(
+            reverse("room_free_slots_api"), {"date": self.day.isoformat(), "room": STUDIO, "duration": 45}
+        )
+        self.assertEqual(
+            response.json()["slots"],
+            [{
+                "room": STUDIO,
+                "room_label": "Third Floor • Prototyping Studio",
+                "start": self._at(16).isoformat(),
+                "end": self._at(17).isoformat(),
+                "start_label": "16:00",
+                "end_label": "17:00",
+            }],
+        )
+        bad = self.client.get(reverse("room_free_slots_api"), {"date": self.day.isoformat(), "duration": "long"})
+        self.assertEqual(bad.status_code, 400)
@@ -0,0 +1,165 @@
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from pct import room_timeline, semester_calendar
+from pct.forms import ShiftForm, TrainingForm
+from pct.models import CertificationLevel, OpenHour, Room, RoomReservation, ScheduleWeek, Semester, Shift, Training
+
+SHOP = Room.PROTO_SHOP
+STUDIO = Room.PROTO_STUDIO
+
+
+class RoomTimelineTests(TestCase):
+    def setUp(self):
+        semester_calendar.invalidate()
+        self.addCleanup(semester_calendar.invalidate)
+        today = timezone.localdate()
+        self.day = today + timedelta(days=(7 - today.weekday()))
+        self.semester = Semester.objects.create(
+            name="Fall", start_date=self.day - timedelta(days=7), end_date=self.day + timedelta(days=30), is_active=True
+        )
+        OpenHour.objects.create(semester=self.semester, weekday=self.day.weekday(), open_time=time(9, 0), close_time=time(17, 0))
+        self.week = ScheduleWeek.objects.create(week_start=self.day)
+        self.level = CertificationLevel.objects.create(level=1)
+        self.staff = get_user_model().objects.create_user(username="staff")
+        self.staff.profile.role = "staff"
+        self.staff.profile.save()
+        self.student = get_user_model().objects.create_user(username="student").profile
+        self.student.role = "student"
+        self.student.save()
+
+    def _at(self, hour):
+        return timezone.make_aware(datetime.combine(self.day, time(hour, 0)))
+
+    def _reserve(self, start, end, room=SHOP, **fields):
+        return RoomReservation.objects.create(
+            requester=self.student, room=room, start_time=self._at(start), end_time=self._at(end), affiliation="Club", **fields
+        )
+
+    def _shift(self, start, end, room=SHOP):
+        return Shift.objects.create(
+            schedule_week=self.week, title="Front desk", location=room, start=self._at(start), end=self._at(end)
+        )
+
+    def _training(self, start, hours=1, room=SHOP):
+        return Training.objects.create(
+            name="Laser intro", machine="Glowforge Pro", level=self.level, time=self._at(start), duration=timedelta(hours=hours), room=room
+        )
+
+    def test_exclusive_reservation_blocks_shifts_and_trainings(self):
+        self._reserve(10, 12, is_exclusive_request=True)
+        shift = room_timeline.Slot(room_timeline.SHIFT, SHOP, self._at(11), self._at(13))
+        training = room_timeline.Slot(room_timeline.TRAINING, SHOP, self._at(9), self._at(11))
+        elsewhere = room_timeline.Slot(room_timeline.SHIFT, STUDIO, self._at(11), self._at(13))
+        later = room_timeline.Slot(room_timeline.SHIFT, SHOP, self._at(12), self._at(13))
+        conflicts = room_timeline.find_conflicts([shift, training, elsewhere, later, None])
+        self.assertEqual([len(clashes) for clashes in conflicts], [1, 1, 0, 0, 0])
+
+    def test_shifts_share_rooms_with_ordinary_reservations(self):
+        self._reserve(10, 12)
+        shift = self._shift(11, 13)
+        self.assertEqual(room_timeline.conflicts_for(room_timeline.shift_slot(shift)), [])
+
+    def test_shifts_and_trainings_share_rooms(self):
+        shift = self._shift(10, 13)
+        training = self._training(11)
+        self.assertEqual(room_timeline.conflicts_for(room_timeline.shift_slot(shift)), [])
+        self.assertEqual(room_timeline.conflicts_for(room_timeline.training_slot(training)), [])
+
+        later = room_timeline.Slot(room_timeline.TRAINING, SHOP, self._at(11), self._at(13))
+        self.assertEqual([held.pk for held in room_timeline.conflicts_for(later)], [training.pk])
+
+    def test_reservation_clean_sees_trainings(self):
+        self._training(10, hours=2)
+        reservation = RoomReservation(
+            requester=self.student, room=SHOP, start_time=self._at(11), end_time=self._at(12), affiliation="Club"
+        )
+        with self.assertRaisesMessage(ValidationError, "the training Laser intro"):
+            reservation.clean()
+        reservation.room = STUDIO
+        reservation.clean()
+
+    def test_reservation_form_rejects_booking_over_training(self):
+        self._training(10)
+        client = Client()
+        client.force_login(self.student.user)
+        response = client.post(
+            reverse("reservations"),
+            {
+                "form_type": "room_request",
+                "room": SHOP,
+                "start_date": self.day.isoformat(),
+                "start_time_hour": "10",
+                "start_time_minute": "30",
+                "end_date": self.day.isoformat(),
+                "end_time_hour": "11",
+                "end_time_minute": "30",
+                "affiliation": "Club",
+            },
+        )
+        self.assertFalse(RoomReservation.objects.exists())
+        self.assertContains(response, "the training Laser intro")
+
+    def test_batch_check_reads_each_type_once(self):
+        self._reserve(10, 12, is_exclusive_request=True)
+        self._training(14)
+        self._shift(16, 17)
+        candidates = [
+            room_timeline.Slot(kind, room, self._at(hour), self._at(hour + 1))
+            for kind in (room_timeline.SHIFT, room_timeline.TRAINING)
+            for room in (SHOP, STUDIO)
+            for hour in range(9, 17)
+        ]
+        candidates.append(room_timeline.Slot(room_timeline.RESERVATION, SHOP, self._at(16), self._at(17), exclusive=True))
+        with CaptureQueriesContext(connection) as queries:
+            conflicts = room_timeline.find_conflicts(candidates)
+        self.assertEqual(len(queries.captured_queries), 3)
+        # Shifts at 10 and 11 and trainings at 10, 11 and 14 in the shop, and the exclusive booking over the shift.
+        self.assertEqual(sum(1 for clashes in conflicts if clashes), 6)
+
+    def test_shift_form_rejects_exclusive_booking(self):
+        semester_calendar.get_calendar()
+        self._reserve(10, 12, is_exclusive_request=True)
+        data = {
+            "title": "Front desk",
+            "location": SHOP,
+            "start": self._at(11).strftime("%Y-%m-%dT%H:%M"),
+            "end": self._at(13).strftime("%Y-%m-%dT%H:%M"),
+            "min_staffing": 1,
+        }
+        form = ShiftForm(data, week=self.week)
+        self.assertFalse(form.is_valid())
+        self.assertIn("an exclusive room reservation", form.non_field_errors()[0])
+
+        data["location"] = STUDIO
+        self.assertTrue(ShiftForm(data, week=self.week).is_valid())
+
+    def test_training_form_rejects_occupied_room(self):
+        self._shift(9, 17)
+        self._reserve(10, 12)
+        data = {
+            "name": "Laser intro",
+            "machine": "Glowforge Pro",
+            "level": self.level.pk,
+            "capacity": 2,
+            "staff": self.staff.profile.pk,
+            "time_date": self.day.isoformat(),
+            "time_hour": "11",
+            "time_minute": "00",
+            "room": SHOP,
+        }
+        form = TrainingForm(data, staff_user=self.staff)
+        self.assertFalse(form.is_valid())
+        self.assertIn("a room reservation", form.non_field_errors()[0])
+
+        data["time_hour"] = "12"
+        form = TrainingForm(data, staff_user=self.staff)
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.save().duration, timedelta(hours=1))
@@ -3,7 +3,9 @@ import json
 
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
@@ -132,8 +134,7 @@ class ScheduleReleaseTests(TestCase):
         response = member_client.post(reverse("training-signup", args=[training.pk]))
         self.assertEqual(response.status_code, 302)
 
-        training.refresh_from_db()
-        self.assertEqual(training.student, self.member_profile)
+        self.assertEqual(list(training.students.all()), [self.member_profile])
 
     def test_training_signup_blocked_when_schedule_not_published(self):
         level_one = CertificationLevel.objects.create(level=1)
@@ -156,8 +157,7 @@ class ScheduleReleaseTests(TestCase):
 
         response = member_client.post(reverse("training-signup", args=[training.pk]), follow=True)
 
-        training.refresh_from_db()
-        self.assertEqual(training.student, None)
+        self.assertFalse(training.seats.exists())
         messages_list = list(response.wsgi_request._messages)
         self.assertTrue(any("published" in message.message.lower() for message in messages_list))
         schedule_week.refresh_from_db()
@@ -185,8 +185,7 @@ class ScheduleReleaseTests(TestCase):
         response = member_client.post(reverse("training-signup", args=[training.pk]), follow=True)
         self.assertEqual(response.status_code, 200)
 
-        training.refresh_from_db()
-        self.assertEqual(training.student, self.member_profile)
+        self.assertEqual(list(training.students.all()), [self.member_profile])
 
     def test_calendar_hides_training_until_schedule_published(self):
         level_one = CertificationLevel.objects.create(level=1)
@@ -305,3 +304,39 @@ class ScheduleReleaseTests(TestCase):
         self.assertEqual(swap_request.status, ShiftSwapRequest.Status.PENDING)
         messages_list = list(response.wsgi_request._messages)
         self.assertTrue(any("20 hours" in message.message for message in messages_list))
+
+    def test_publication_checks_use_constant_queries(self):
+        level_one = CertificationLevel.objects.create(level=1)
+
+        def add_training(week_offset):
+            week_start = self.week_start + timedelta(days=7 * week_offset)
+            ScheduleWeek.objects.get_or_create(
+                week_start=week_start,
+                defaults={"status": ScheduleWeek.Status.PUBLISHED, "created_by": self.staff_profile},
+            )
+            Training.objects.create(
+                name=f"Laser intro {week_offset}",
+                machine="Glowforge Pro",
+                level=level_one,
+                staff=self.staff_profile,
+                time=timezone.make_aware(datetime.combine(week_start, time(10, 0))),
+            )
+
+        member_client = Client()
+        member_client.force_login(self.member_user)
+
+        def count_queries(url):
+            with CaptureQueriesContext(connection) as ctx:
+                response = member_client.get(url)
+            self.assertEqual(response.status_code, 200)
+            return len(ctx.captured_queries)
+
+        add_training(0)
+        list_queries = count_queries(reverse("training-list"))
+        event_queries = count_queries(reverse("events"))
+
+        for week_offset in range(1, 6):
+            add_training(week_offset)
+
+        self.assertEqual(count_queries(reverse("training-list")), list_queries)
+        self.assertEqual(count_queries(reverse("events")), event_queries)
@@ -0,0 +1,113 @@
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from pct import semester_calendar
+from pct.forms import ShiftForm
+from pct.models import Holiday, OpenHour, RoomReservation, ScheduleWeek, Semester, Shift
+
+
+class SemesterCalendarTests(TestCase):
+    def setUp(self):
+        semester_calendar.invalidate()
+        today = timezone.localdate()
+        self.week_start = today + timedelta(days=(7 - today.weekday()))
+        self.semester = Semester.objects.create(
+            name="Fall",
+            start_date=self.week_start - timedelta(days=7),
+            end_date=self.week_start + timedelta(days=90),
+            is_active=True,
+        )
+        self.open_hour = OpenHour.objects.create(
+            semester=self.semester,
+            weekday=self.week_start.weekday(),
+            open_time=time(9, 0),
+            close_time=time(17, 0),
+        )
+        self.week = ScheduleWeek.objects.create(week_start=self.week_start)
+
+    def tearDown(self):
+        semester_calendar.invalidate()
+
+    def _at(self, day, hour):
+        return timezone.make_aware(datetime.combine(day, time(hour, 0)))
+
+    def _shift(self, day=None, start=10, end=12):
+        day = day or self.week_start
+        return Shift(
+            schedule_week=self.week,
+            title="Front desk",
+            location=RoomReservation.RoomChoices.HATCH_FRONT,
+            start=self._at(day, start),
+            end=self._at(day, end),
+        )
+
+    def test_lookups_are_query_free_once_loaded(self):
+        semester_calendar.get_calendar()
+        with self.assertNumQueries(0):
+            calendar = semester_calendar.get_calendar()
+            self.assertEqual(calendar.semester_for_date(self.week_start), self.semester)
+            self.assertIsNone(calendar.semester_for_date(self.semester.end_date + timedelta(days=1)))
+            self.assertTrue(
+                calendar.within_open_hours(self.semester, self._at(self.week_start, 9), self._at(self.week_start, 17))
+            )
+            self.assertFalse(
+                calendar.within_open_hours(self.semester, self._at(self.week_start, 8), self._at(self.week_start, 10))
+            )
+            self.assertFalse(calendar.is_holiday(self.semester, self.week_start))
+            self._shift().clean()
+
+    def test_shift_form_validation_uses_cached_calendar(self):
+        semester_calendar.get_calendar()
+        data = {
+            "title": "Front desk",
+            "location": RoomReservation.RoomChoices.HATCH_FRONT,
+            "start": self._at(self.week_start, 10).strftime("%Y-%m-%dT%H:%M"),
+            "end": self._at(self.week_start, 12).strftime("%Y-%m-%dT%H:%M"),
+            "min_staffing": 1,
+        }
+        form = ShiftForm(data, week=self.week)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(form.is_valid(), form.errors)
+        # Only the room conflict check (pct.room_timeline) reads the database.
+        calendar_tables = ("pct_semester", "pct_openhour", "pct_holiday")
+        self.assertFalse([query for query in queries.captured_queries if any(table in query["sql"] for table in calendar_tables)])
+
+    def test_holiday_save_and_delete_invalidate(self):
+        semester_calendar.get_calendar()
+        holiday = Holiday.objects.create(semester=self.semester, date=self.week_start, name="Break")
+        with self.assertRaises(ValidationError):
+            self._shift().clean()
+
+        holiday.delete()
+        self._shift().clean()
+
+    def test_open_hour_change_invalidates(self):
+        semester_calendar.get_calendar()
+        self.open_hour.close_time = time(11, 0)
+        self.open_hour.save()
+        with self.assertRaises(ValidationError):
+            self._shift().clean()
+
+    def test_deactivating_from_settings_page_invalidates(self):
+        staff_user = get_user_model().objects.create_user(username="staff", password="pass")
+        staff_user.profile.role = "staff"
+        staff_user.profile.save()
+        newer = Semester.objects.create(
+            name="Spring",
+            start_date=self.semester.start_date,
+            end_date=self.semester.end_date,
+        )
+        self.assertEqual(semester_calendar.get_calendar().semester_for_date(self.week_start), self.semester)
+
+        client = Client()
+        client.force_login(staff_user)
+        client.post(reverse("semester-settings"), {"action": "set_active", "semester_id": newer.pk})
+
+        self.assertEqual(semester_calendar.get_calendar().semester_for_date(self.week_start), newer)
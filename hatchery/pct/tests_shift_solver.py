@@ -0,0 +1,187 @@
+from datetime import datetime, time, timedelta
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.test import Client, SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from pct import semester_calendar, shift_solver
+from pct.management.commands.benchmark_shift_solver import HOUR, synthetic_week, violations
+from pct.models import (
+    Availability,
+    Certification,
+    CertificationLevel,
+    CertificationType,
+    OpenHour,
+    RoomReservation,
+    ScheduleWeek,
+    Semester,
+    Shift,
+)
+
+CAP = int(shift_solver.WEEKLY_HOUR_CAP.total_seconds())
+
+
+def _shift(shift_id, day, start, end, required=()):
+    base = day * 24 * HOUR
+    return shift_solver.OpenShift(shift_id, base + start * HOUR, base + end * HOUR, frozenset(required))
+
+
+class SolverTests(SimpleTestCase):
+    backends = [False] + ([True] if shift_solver.HAS_SCIPY else [])
+
+    def _person(self, person_id, windows=((0, 7 * 24),), certifications=(), cap=CAP):
+        return shift_solver.Candidate(
+            id=person_id,
+            windows=[(start * HOUR, end * HOUR) for start, end in windows],
+            certifications=frozenset(certifications),
+            cap=cap,
+        )
+
+    def test_team_members_stop_at_the_weekly_cap(self):
+        shifts = [_shift(day + 1, day, 9, 13) for day in range(7)]
+        for accelerate in self.backends:
+            with self.subTest(accelerate=accelerate):
+                member = self._person(1)
+                staff = self._person(2, cap=None)
+                assignments = shift_solver.solve(shifts, [member], accelerate=accelerate)
+                self.assertEqual(len(assignments), 5)
+                self.assertEqual(member.load, CAP)
+
+                assignments = shift_solver.solve(shifts, [staff], accelerate=accelerate)
+                self.assertEqual(len(assignments), 7)
+
+    def test_availability_certifications_and_overlaps(self):
+        shifts = [
+            _shift(1, 0, 9, 12, required=[7]),
+            _shift(2, 0, 10, 11),
+            _shift(3, 1, 9, 12),
+        ]
+        for accelerate in self.backends:
+            with self.subTest(accelerate=accelerate):
+                certified = self._person(1, windows=[(9, 12)], certifications=[7])
+                # Back-to-back windows merge into one that covers shift 3.
+                windows = shift_solver.merge_windows([(24 + 9, 24 + 10), (24 + 10, 24 + 12), (10, 11)])
+                other = self._person(2, windows=windows)
+                assignments = shift_solver.solve(shifts, [certified, other], accelerate=accelerate)
+                self.assertEqual(assignments, {1: 1, 2: 2, 3: 2})
+
+    def test_load_is_balanced(self):
+        shifts = [_shift(shift_id, shift_id % 7, 9 + shift_id // 7, 10 + shift_id // 7) for shift_id in range(1, 13)]
+        for accelerate in self.backends:
+            with self.subTest(accelerate=accelerate):
+                people = [self._person(person_id) for person_id in range(1, 5)]
+                shift_solver.solve(shifts, people, accelerate=accelerate)
+                self.assertEqual([person.load for person in people], [3 * HOUR] * 4)
+
+    def test_synthetic_weeks_follow_every_rule(self):
+        for accelerate in self.backends:
+            for seed in range(3):
+                with self.subTest(accelerate=accelerate, seed=seed):
+                    shifts, people = synthetic_week(200, 80, seed=seed)
+                    assignments = shift_solver.solve(shifts, people, accelerate=accelerate)
+                    self.assertEqual(violations(shifts, people, assignments), [])
+                    self.assertGreater(len(assignments), 180)
+
+    @unittest.skipIf(shift_solver.HAS_SCIPY, "numpy and scipy are installed")
+    def test_accelerated_solver_needs_scipy(self):
+        with self.assertRaises(RuntimeError):
+            shift_solver.solve([_shift(1, 0, 9, 10)], [self._person(1)], accelerate=True)
+
+
+class AutoAssignViewTests(TestCase):
+    def setUp(self):
+        semester_calendar.invalidate()
+        today = timezone.localdate()
+        self.week_start = today + timedelta(days=(7 - today.weekday()))
+        semester = Semester.objects.create(
+            name="Fall",
+            start_date=self.week_start,
+            end_date=self.week_start + timedelta(days=60),
+            is_active=True,
+        )
+        for weekday in range(7):
+            OpenHour.objects.create(semester=semester, weekday=weekday, open_time=time(8, 0), close_time=time(20, 0))
+        self.week = ScheduleWeek.objects.create(week_start=self.week_start)
+        self.laser = CertificationType.objects.create(name="Laser")
+
+        User = get_user_model()
+        self.staff_user = User.objects.create_user(username="staff", password="pass")
+        self.staff_user.profile.role = "staff"
+        self.staff_user.profile.save()
+        self.members = []
+        for name in ("alex", "blair"):
+            profile = User.objects.create_user(username=name).profile
+            profile.role = "team_member"
+            profile.save()
+            Availability.objects.create(
+                profile=profile, week=self.week, start=self._at(0, 9), end=self._at(0, 17)
+            )
+            self.members.append(profile)
+        Certification.objects.create(
+            profile=self.members[0], type=self.laser, level=CertificationLevel.objects.create(level=1)
+        )
+
+        self.laser_shift = self._shift("Laser desk", 9, 12)
+        self.laser_shift.required_certifications.add(self.laser)
+        self.front_shift = self._shift("Front desk", 9, 12)
+        self.late_shift = self._shift("Closing", 17, 19)
+
+        self.client = Client()
+        self.client.force_login(self.staff_user)
+        self.url = f"{reverse('schedule-builder')}?week_start={self.week_start}"
+
+    def tearDown(self):
+        semester_calendar.invalidate()
+
+    def _at(self, day, hour):
+        return timezone.make_aware(datetime.combine(self.week_start + timedelta(days=day), time(hour, 0)))
+
+    def _shift(self, title, start, end):
+        return Shift.objects.create(
+            schedule_week=self.week,
+            title=title,
+            location=RoomReservation.RoomChoices.HATCH_FRONT,
+            start=self._at(0, start),
+            end=self._at(0, end),
+        )
+
+    def test_preview_does_not_save_and_explains_gaps(self):
+        response = self.client.post(self.url, {"action": "auto_assign_preview"})
+
+        proposal = response.context["auto_assign"]
+        self.assertEqual(
+            [(shift.pk, person.pk) for shift, person in proposal.assignments],
+            [(self.laser_shift.pk, self.members[0].pk), (self.front_shift.pk, self.members[1].pk)],
+        )
+        self.assertEqual([shift.pk for shift, _ in proposal.unfilled], [self.late_shift.pk])
+        self.assertIn("available", proposal.unfilled[0][1])
+        self.assertFalse(Shift.objects.filter(assigned_to__isnull=False).exists())
+
+    def test_week_is_loaded_in_constant_queries(self):
+        with self.assertNumQueries(4):
+            shift_solver.WeekProblem(self.week)
+
+    def test_apply_saves_pairs_that_still_fit(self):
+        alex, blair = self.members
+        # Someone took the front desk by hand after the preview was shown.
+        Shift.objects.filter(pk=self.front_shift.pk).update(assigned_to=alex)
+
+        self.client.post(
+            self.url,
+            {
+                "action": "auto_assign_apply",
+                "assign": [f"{self.laser_shift.pk}:{alex.pk}", f"{self.front_shift.pk}:{blair.pk}"],
+            },
+        )
+
+        self.laser_shift.refresh_from_db()
+        self.front_shift.refresh_from_db()
+        # The laser shift now overlaps the front desk Alex picked up.
+        self.assertIsNone(self.laser_shift.assigned_to)
+        self.assertEqual(self.front_shift.assigned_to, alex)
+
+        self.client.post(self.url, {"action": "auto_assign_apply", "assign": [f"{self.late_shift.pk}:{blair.pk}"]})
+        self.late_shift.refresh_from_db()
+        self.assertIsNone(self.late_shift.assigned_to)
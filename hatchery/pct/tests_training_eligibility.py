@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from pct import booking, training_eligibility
+from pct.models import (
+    Certification,
+    CertificationLevel,
+    CertificationType,
+    ScheduleWeek,
+    Training,
+    TrainingWaitlist,
+)
+
+
+class TrainingEligibilityTests(TestCase):
+    def setUp(self):
+        self.profile = get_user_model().objects.create_user(username="student").profile
+        self.profile.role = "student"
+        self.profile.save()
+        self.client = Client()
+        self.client.force_login(self.profile.user)
+        self.level1 = CertificationLevel.objects.create(level=1)
+        self.level2 = CertificationLevel.objects.create(level=2)
+        self.laser = CertificationType.objects.create(name="Laser")
+        self.printer = CertificationType.objects.create(name="Printer")
+
+    def _training(self, name, level=None, certification_type=None, time=None, capacity=4):
+        return Training.objects.create(
+            name=name,
+            machine="Glowforge",
+            level=level or self.level1,
+            certification_type=certification_type,
+            time=time,
+            capacity=capacity,
+        )
+
+    def _listed(self):
+        response = self.client.get(reverse("training-list"))
+        return {training.name: training for training in response.context["trainings"]}
+
+    def test_prerequisites(self):
+        self._training("Intro")
+        self._training("Laser 2", level=self.level2, certification_type=self.laser)
+        self._training("Any 2", level=self.level2)
+
+        listed = self._listed()
+        self.assertTrue(listed["Intro"].can_signup)
+        self.assertEqual(listed["Laser 2"].lock_reason, "Requires Laser level 1")
+        self.assertEqual(listed["Any 2"].lock_reason, "Requires level 1")
+
+        Certification.objects.create(profile=self.profile, type=self.printer, level=self.level1)
+        listed = self._listed()
+        self.assertFalse(listed["Laser 2"].meets_prereq)
+        self.assertTrue(listed["Any 2"].can_signup)
+
+        Certification.objects.create(profile=self.profile, type=self.laser, level=self.level1)
+        self.assertTrue(self._listed()["Laser 2"].can_signup)
+
+    def test_seat_and_waitlist_state(self):
+        booked = self._training("Booked")
+        invited = self._training("Invited")
+        waiting = self._training("Waiting")
+        booking.claim_training(booked, self.profile)
+        entry = TrainingWaitlist.objects.create(training=invited, profile=self.profile, status="invited")
+        TrainingWaitlist.objects.create(training=waiting, profile=self.profile)
+
+        listed = self._listed()
+        self.assertTrue(listed["Booked"].is_mine)
+        self.assertEqual(listed["Booked"].lock_reason, "You're registered")
+        self.assertTrue(listed["Invited"].invited_for_me)
+        self.assertEqual(listed["Invited"].waitlist_entry_id, entry.pk)
+        self.assertFalse(listed["Invited"].can_signup)
+        self.assertEqual(listed["Waiting"].waitlist_status, "waiting")
+        self.assertEqual(listed["Waiting"].lock_reason, "You're on the waitlist")
+
+    @override_settings(TIME_ZONE="America/New_York")
+    def test_unpublished_weeks_lock_their_trainings(self):
+        today = timezone.localdate()
+        monday = today + timedelta(days=7 - today.weekday())
+        ScheduleWeek.objects.create(week_start=monday)
+        ScheduleWeek.objects.create(week_start=monday + timedelta(days=7), status=ScheduleWeek.Status.PUBLISHED)
+        tz = timezone.get_current_timezone()
+        # Late Sunday local time is already Monday in UTC, but belongs to the week before.
+        self._training("Sunday night", time=timezone.make_aware(datetime.combine(monday, datetime.min.time()), tz) - timedelta(minutes=30))
+        self._training("Draft week", time=timezone.make_aware(datetime.combine(monday + timedelta(days=6), datetime.min.time()), tz) + timedelta(hours=23))
+        self._training("Published week", time=timezone.make_aware(datetime.combine(monday + timedelta(days=7), datetime.min.time()), tz))
+
+        listed = self._listed()
+        self.assertTrue(listed["Sunday night"].can_signup)
+        self.assertEqual(listed["Draft week"].lock_reason, "Schedule not published")
+        self.assertTrue(listed["Published week"].can_signup)
+
+    def test_page_is_one_training_query(self):
+        for number in range(5):
+            training = self._training(f"Training {number}", capacity=30)
+            for waiting in range(number * 3):
+                user = get_user_model().objects.create_user(username=f"waiting-{number}-{waiting}")
+                TrainingWaitlist.objects.create(training=training, profile=user.profile)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(len(self._listed()), 5)
+        training_queries = [query for query in queries.captured_queries if 'FROM "pct_training"' in query["sql"]]
+        self.assertEqual(len(training_queries), 1)
+
+    def test_paging(self):
+        start = timezone.now() + timedelta(days=1)
+        for number in range(5):
+            self._training(f"Training {number}", time=start + timedelta(hours=number))
+
+        with mock.patch.object(training_eligibility, "PAGE_SIZE", 2):
+            first = self.client.get(reverse("training-list"))
+            last = self.client.get(reverse("training-list"), {"page": 3})
+
+        self.assertEqual([training.name for training in first.context["trainings"]], ["Training 0", "Training 1"])
+        self.assertTrue(first.context["has_next"])
+        self.assertEqual([training.name for training in last.context["trainings"]], ["Training 4"])
+        self.assertFalse(last.context["has_next"])
@@ -0,0 +1,96 @@
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from pct import user_search
+
+
+class UserSearchTests(TestCase):
+    def setUp(self):
+        user_search.reset_backend()
+        self.addCleanup(user_search.reset_backend)
+        User = get_user_model()
+        self.staff = User.objects.create_user(username="staff")
+        self.staff.profile.role = "staff"
+        self.staff.profile.save()
+        self.alice = self._student("asmith", "Alice", "Smith", "alice.smith@bc.edu")
+        self._student("bjones", "Bob", "Jones", "bob.jones@bc.edu")
+        self._student("smithers", "Waylon", "Smithers", "waylon@bc.edu")
+        self.client = Client()
+        self.client.force_login(self.staff)
+
+    def _student(self, username, first_name, last_name, email):
+        user = get_user_model().objects.create_user(
+            username=username, first_name=first_name, last_name=last_name, email=email
+        )
+        user.profile.role = "student"
+        user.profile.save()
+        return user
+
+    def _search(self, query):
+        response = self.client.get(reverse("search_users_api"), {"q": query})
+        return [user["username"] for user in response.json()["users"]]
+
+    def test_document_is_deduplicated_lowercase_words(self):
+        self.assertEqual(
+            user_search.document(self.alice, self.alice.profile),
+            "asmith alice smith bc edu",
+        )
+
+    def _assert_matches(self):
+        self.assertEqual(self._search("ali smi"), ["asmith"])
+        self.assertCountEqual(self._search("smith"), ["asmith", "smithers"])
+        self.assertEqual(self._search("waylon@"), ["smithers"])
+        self.assertEqual(self._search("jones bob"), ["bjones"])
+        self.assertEqual(self._search("carol"), [])
+        self.assertEqual(len(self._search("")), 3)
+
+    def test_prefix_matches(self):
+        self._assert_matches()
+
+    @override_settings(USER_SEARCH_BACKEND="pct.user_search.ContainsBackend")
+    def test_fallback_backend_matches_the_same_users(self):
+        user_search.reset_backend()
+        self._assert_matches()
+
+    def test_index_follows_user_and_profile_changes(self):
+        self.alice.last_name = "Carter"
+        self.alice.email = "alice.carter@bc.edu"
+        self.alice.save()
+        self.assertEqual(self._search("smi"), ["smithers"])
+        self.assertEqual(self._search("carter"), ["asmith"])
+
+        profile = self.alice.profile
+        profile.first_name = "Ally"
+        profile.save()
+        self.assertEqual(self._search("ally"), ["asmith"])
+
+        self.alice.delete()
+        self.assertEqual(self._search("carter"), [])
+
+    def test_ranked_page_is_one_query(self):
+        users = get_user_model().objects.all()
+        with self.assertNumQueries(1):
+            found = list(user_search.search(users, "smi")[:1])
+        self.assertEqual(len(found), 1)
+
+    def test_query_uses_the_search_index(self):
+        users = get_user_model().objects.all()
+        if connection.vendor == "postgresql":
+            # Empty test tables make a sequential scan cheapest; take it off the table.
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            self.assertIn("pct_profile_search_gin", user_search.search(users, "smi").explain())
+        else:
+            self.assertIn("VIRTUAL TABLE INDEX", user_search.search(users, "smi").explain())
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "Ranks with PostgreSQL full-text search")
+    def test_postgresql_backend_ranks_matches(self):
+        self.assertIsInstance(user_search.get_backend(), user_search.PostgreSQLBackend)
+        # Two of this user's words start with "smi", so they rank ahead of the others.
+        self._student("zsmith", "Smitty", "Smith", "smitty@bc.edu")
+        self.assertEqual(self._search("smi"), ["zsmith", "asmith", "smithers"])
+        self.assertEqual(self._search("smitty smi"), ["zsmith"])
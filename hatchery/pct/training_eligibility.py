@@ -0,0 +1,100 @@
+"""
+What a profile can do with each training, computed by the database.
+
+for_profile() annotates a Training queryset with everything the training list
+needs to know about one profile, as Exists/Subquery expressions:
+
+    meets_prereq           holds the previous level (of the training's track, if it has one)
+    is_mine                has a seat
+    waitlist_status        status of the profile's waitlist entry, "accepted" ones aside
+    waitlist_entry_id      that entry's id (for accepting or declining an invitation)
+    is_schedule_published  the training's week isn't an unpublished ScheduleWeek
+
+so a page of trainings is one query however long the waitlists are.
+describe() then derives the flags and lock reason the templates show from
+those annotations, without touching the database.
+"""
+
+from django.db.models import BooleanField, Case, DateField, Exists, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import TruncWeek
+
+from .models import Certification, ScheduleWeek, TrainingSeat, TrainingWaitlist
+
+PAGE_SIZE = 24
+
+
+def requirement_text(training, prereq_level):
+    if training.certification_type:
+        return f"{training.certification_type.name} level {prereq_level}"
+    return f"level {prereq_level}"
+
+
+def for_profile(trainings, profile):
+    """Annotate the Training queryset trainings with profile's state for each row."""
+    prerequisite = Certification.objects.filter(profile=profile, level__level=OuterRef("level__level") - 1)
+    entry = TrainingWaitlist.objects.filter(profile=profile, training=OuterRef("pk")).exclude(status="accepted")
+    unpublished_week = ScheduleWeek.objects.filter(week_start=OuterRef("week_start")).exclude(
+        status=ScheduleWeek.Status.PUBLISHED
+    )
+    return trainings.annotate(
+        # Monday of the training's week in the current time zone, like _week_start_for_datetime.
+        week_start=TruncWeek("time", output_field=DateField()),
+    ).annotate(
+        meets_prereq=Case(
+            When(level__level__lte=1, then=Value(True)),
+            When(Q(certification_type__isnull=True) & Exists(prerequisite), then=Value(True)),
+            When(Exists(prerequisite.filter(type_id=OuterRef("certification_type_id"))), then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField(),
+        ),
+        is_mine=Exists(TrainingSeat.objects.filter(profile=profile, training=OuterRef("pk"))),
+        waitlist_status=Subquery(entry.values("status")[:1]),
+        waitlist_entry_id=Subquery(entry.values("pk")[:1]),
+        is_schedule_published=~Exists(unpublished_week),
+    )
+
+
+def page(trainings, number, size=None):
+    """Return (trainings on page number, whether another page follows) in one query."""
+    size = size or PAGE_SIZE
+    offset = (number - 1) * size
+    rows = list(trainings[offset:offset + size + 1])
+    return rows[:size], len(rows) > size
+
+
+def describe(training):
+    """Set the display flags and lock_reason on an annotated training."""
+    level_value = training.level.level
+    prereq_level = level_value - 1 if level_value > 1 else None
+    training.prereq_level = prereq_level
+    training.prereq_type = training.certification_type
+    training.requirement_text = requirement_text(training, prereq_level) if prereq_level else None
+
+    training.is_waitlisted = training.waitlist_status is not None
+    training.invited_for_me = training.waitlist_status == "invited"
+    training.is_full = training.open_seats == 0
+    training.can_signup = (
+        training.meets_prereq
+        and not training.is_full
+        and not training.is_mine
+        and training.is_schedule_published
+        and not training.is_waitlisted
+    )
+
+    training.lock_reason = None
+    if training.is_mine:
+        training.lock_reason = "You're registered"
+    elif training.is_full:
+        training.lock_reason = (
+            "Fully booked" if training.seats_taken >= training.capacity
+            else "Remaining seats are reserved for invited students"
+        )
+    elif not training.meets_prereq and training.requirement_text:
+        training.lock_reason = f"Requires {training.requirement_text}"
+    elif training.time and not training.is_schedule_published:
+        training.lock_reason = "Schedule not published"
+    elif training.invited_for_me:
+        training.lock_reason = "You have an invitation for this training"
+    elif training.is_waitlisted:
+        training.lock_reason = "You're on the waitlist"
+    return training
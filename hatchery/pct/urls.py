@@ -14,9 +14,14 @@ urlpatterns = [
     path('view-student-profile/<int:user_id>/', views.view_student_profile, name='view_student_profile'),
     path('api/search-certifications/', views.search_certifications_api, name='search_certifications_api'),
     path('api/search-users/', views.search_users_api, name='search_users_api'),
+    path('api/bulk-certify/', views.bulk_certify_api, name='bulk_certify_api'),
+    path('api/room-free-slots/', views.room_free_slots_api, name='room_free_slots_api'),
+    path('api/reservations/<int:reservation_id>/moderate/', views.moderate_reservation_api, name='moderate_reservation_api'),
     path('api/create-certification/', views.create_certification_api, name='create_certification_api'),
     path('api/update-certification/<int:cert_id>/', views.update_certification_api, name='update_certification_api'),
     path('api/remove-certification/<int:user_id>/<int:cert_id>/', views.remove_certification_api, name='remove_certification_api'),
+    path('api/request-metrics/', views.request_metrics_api, name='request_metrics_api'),
+    path('api/schedule-coverage/', views.schedule_coverage_api, name='schedule_coverage_api'),
     path('reports/', views.reports_view, name='reports'),
     path('submit-report/', views.submit_report_view, name='submit_report'),
     path('admin-log/', views.admin_log_view, name='admin_log'),
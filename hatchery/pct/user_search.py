@@ -0,0 +1,157 @@
+"""
+Ranked, prefix-matched search over users for the staff autocompletes.
+
+Each Profile keeps a search_text column: username, names and email addresses
+lowercased and split into words (see pct.signals, which refreshes it whenever
+one of those fields changes). A query matches users having a word that starts
+with each of the query's words, so "ali smi" finds Alice Smith.
+
+The backend is picked per database, or by USER_SEARCH_BACKEND (a dotted path):
+
+* PostgreSQLBackend matches a prefix tsquery against pct_profile.search_vector,
+  a column PostgreSQL generates from search_text and indexes with GIN (it is
+  created by migration 0018 and isn't a model field), and orders by ts_rank.
+* SQLiteBackend matches the pct_profile_search FTS5 table, whose rows the
+  signals keep in step with search_text, and orders by bm25.
+* ContainsBackend filters search_text with one icontains per word; it's the
+  fallback when neither index exists.
+
+Both indexed backends rank and sort in the one search query; callers slice
+the queryset, so the database only keeps the best rows (ORDER BY ... LIMIT).
+"""
+
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import Profile
+
+FTS_TABLE = "pct_profile_search"
+SEARCH_VECTOR = "search_vector"
+
+_WORDS = re.compile(r"[^\W_]+")
+
+
+def words(text):
+    return _WORDS.findall((text or "").lower())
+
+
+def document(user, profile):
+    """The search_text for a user and their profile."""
+    parts = [
+        user.username,
+        user.first_name,
+        user.last_name,
+        user.email,
+        profile.first_name,
+        profile.last_name,
+        profile.email,
+    ]
+    seen = []
+    for word in words(" ".join(part for part in parts if part)):
+        if word not in seen:
+            seen.append(word)
+    return " ".join(seen)
+
+
+class ContainsBackend:
+    def search(self, users, query):
+        for word in words(query):
+            users = users.filter(profile__search_text__icontains=word)
+        return users.order_by("username")
+
+    def index(self, user_id, text):
+        pass
+
+    def remove(self, user_id):
+        pass
+
+    def rebuild(self):
+        """Re-index every profile's search_text (after bulk writes that skip signals)."""
+
+
+class PostgreSQLBackend(ContainsBackend):
+    def search(self, users, query):
+        terms = words(query)
+        if not terms:
+            return users.order_by("username")
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        # The join on profile__search_text puts the profile table in the query under its own name.
+        vector = f"{connection.ops.quote_name(Profile._meta.db_table)}.{SEARCH_VECTOR}"
+        users = users.filter(profile__search_text__isnull=False).filter(
+            RawSQL(f"{vector} @@ to_tsquery('simple', %s)", [tsquery], output_field=BooleanField())
+        )
+        rank = RawSQL(f"ts_rank({vector}, to_tsquery('simple', %s))", [tsquery])
+        return users.annotate(search_rank=rank).order_by("-search_rank", "username")
+
+
+class SQLiteBackend(ContainsBackend):
+    def search(self, users, query):
+        terms = words(query)
+        if not terms:
+            return users.order_by("username")
+        match = " ".join(f'"{term}"*' for term in terms)
+        matches = RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+        # bm25 of the user's own row; FTS5 looks it up by rowid.
+        rank = RawSQL(
+            f'SELECT rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = "auth_user"."id"', [match]
+        )
+        return users.filter(pk__in=matches).annotate(search_rank=rank).order_by("search_rank", "username")
+
+    def index(self, user_id, text):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [user_id])
+            cursor.execute(f"INSERT INTO {FTS_TABLE} (rowid, document) VALUES (%s, %s)", [user_id, text])
+
+    def remove(self, user_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [user_id])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(f"INSERT INTO {FTS_TABLE} (rowid, document) SELECT user_id, search_text FROM pct_profile")
+
+
+_backend = None
+
+
+def _default_backend():
+    if connection.vendor == "postgresql":
+        return PostgreSQLBackend()
+    if connection.vendor == "sqlite" and FTS_TABLE in connection.introspection.table_names():
+        return SQLiteBackend()
+    return ContainsBackend()
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        path = getattr(settings, "USER_SEARCH_BACKEND", None)
+        _backend = import_string(path)() if path else _default_backend()
+    return _backend
+
+
+def reset_backend():
+    """Forget the chosen backend (after the setting or the schema changes)."""
+    global _backend
+    _backend = None
+
+
+def search(users, query):
+    """Narrow the User queryset users to matches for query, best first."""
+    return get_backend().search(users, query)
+
+
+def refresh(user):
+    """Recompute a user's search_text after their User row changed."""
+    profile = Profile.objects.filter(user=user).only("first_name", "last_name", "email").first()
+    if profile is None:
+        return
+    text = document(user, profile)
+    Profile.objects.filter(pk=profile.pk).update(search_text=text)
+    get_backend().index(user.pk, text)
@@ -1,27 +1,35 @@
 from collections import defaultdict
-from datetime import timedelta, datetime, date
+from datetime import timedelta, datetime, date, time
 from django.shortcuts import render, redirect, get_object_or_404
+from django.template.loader import render_to_string
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.contrib.auth import logout
 from django.contrib.auth.models import User
-from .models import Profile, Certification, CertificationType, CertificationLevel, School, Major, Minor, Training, WorkBlock, RoomReservation, TrainingWaitlist, Report, ActivityLog, Availability, ScheduleWeek, Shift, ShiftSwapRequest, Semester, OpenHour, Holiday
+from .models import Profile, Certification, CertificationTemplate, CertificationType, CertificationLevel, School, Major, Minor, Training, WorkBlock, RoomReservation, TrainingWaitlist, Report, ActivityLog, Availability, ScheduleWeek, Shift, ShiftSwapRequest, Semester, OpenHour, Holiday
 from django.core.exceptions import ValidationError
 from .models import Profile, Certification, CertificationType, CertificationLevel, School, Major, Minor, Training, TrainingCancellationRequest, WorkBlock, RoomReservation, Availability, ScheduleWeek, Shift, ShiftSwapRequest, Semester, OpenHour, Holiday
-from django.db.models import Q, F
+from django.db import IntegrityError, transaction
+from django.db.models import DateTimeField, ExpressionWrapper, Q, F
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
+from django.utils.cache import get_conditional_response, patch_cache_control
 import json
 from django.http import HttpResponseRedirect, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
-from django.contrib.auth.decorators import login_required, user_passes_test
+from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from urllib.parse import urlencode
 from django.urls import reverse_lazy, reverse
 from django.views.generic import CreateView
+from .auth import profile_for, role_required
+from . import activity, auto_approval, availability_replication, booking, certification_catalog, certification_grants, coverage, reservation_queue, reservation_series, room_availability, room_timeline, semester_calendar, shift_solver, training_eligibility, user_search
 from .forms import (
     TrainingForm,
     RoomReservationForm,
+    RoomReservationSeriesForm,
     ReportForm,
     AvailabilityForm,
     ShiftForm,
@@ -31,19 +39,15 @@ from .forms import (
     HolidayForm,
 )
 from django.views import View
+from django.conf import settings
+from hatchery import request_metrics
 
 VALID_ROLES = {"student", "staff", "admin", "team_member"}
 
 
-def _certificate_level_cache(profile):
-    """Return (any_level_set, per_type_level_sets) for quick prerequisite checks."""
-    per_type = defaultdict(set)
-    any_levels = set()
-    for cert_type_id, level_value in profile.certificates.values_list("type_id", "level__level"):
-        any_levels.add(level_value)
-        if cert_type_id:
-            per_type[cert_type_id].add(level_value)
-    return any_levels, per_type
+def _certificates(profile):
+    """The profile's certifications with their type and level, for display."""
+    return list(profile.certificates.select_related("type", "level").order_by("type__name", "level__level"))
 
 
 def _student_has_prerequisite(profile, training):
@@ -59,10 +63,12 @@ def _student_has_prerequisite(profile, training):
     return qs.exists()
 
 
-def _format_prereq_label(training, prereq_level):
-    if training.certification_type:
-        return f"{training.certification_type.name} level {prereq_level}"
-    return f"level {prereq_level}"
+def _announce_invitations(request, training, entries):
+    for entry in entries:
+        messages.info(
+            request,
+            f"{entry.profile.get_full_name()} has been invited to join {training.name}.",
+        )
 
 
 def _week_start_from_param(param):
@@ -77,6 +83,14 @@ def _week_start_from_param(param):
     return base - timedelta(days=base.weekday())
 
 
+def _date_param(value):
+    """Parse a YYYY-MM-DD query param, returning None when it is missing or invalid."""
+    try:
+        return parse_date(value) if value else None
+    except ValueError:
+        return None
+
+
 def _ensure_schedule_week(week_start: date, creator: Profile | None):
     schedule_week, _ = ScheduleWeek.objects.get_or_create(
         week_start=week_start, defaults={"created_by": creator}
@@ -98,42 +112,23 @@ def _schedule_week_for_datetime(dt):
     week_start = _week_start_for_datetime(dt)
     if not week_start:
         return None
-    return ScheduleWeek.objects.filter(week_start=week_start).first()
+    return _schedule_weeks_for_datetimes([dt]).get(week_start)
 
 
-def _active_semester_for_date(target_date: date):
-    if not target_date:
-        return None
-    return Semester.objects.filter(start_date__lte=target_date, end_date__gte=target_date, is_active=True).order_by("-start_date").first()
-
-
-def _is_holiday(semester: Semester, target_date: date):
-    if not semester:
-        return False
-    return semester.holidays.filter(date=target_date).exists()
+def _schedule_weeks_for_datetimes(datetimes):
+    """Return a {week_start: ScheduleWeek} map for the weeks containing the datetimes.
 
+    Resolves every week in a single query so publication checks over a list of
+    trainings don't cost one lookup per row. Weeks without a ScheduleWeek are absent.
+    """
+    week_starts = {_week_start_for_datetime(dt) for dt in datetimes if dt}
+    if not week_starts:
+        return {}
+    return {
+        week.week_start: week
+        for week in ScheduleWeek.objects.filter(week_start__in=week_starts)
+    }
 
-def _within_open_hours(semester: Semester, start_dt, end_dt):
-    """Check if start/end fall within configured open hours for the weekday."""
-    if not semester:
-        return True
-    weekday = start_dt.weekday()
-    hours = semester.open_hours.filter(weekday=weekday)
-    if not hours.exists():
-        return False
-    for window in hours:
-        if window.open_time <= start_dt.time() and window.close_time >= end_dt.time():
-            return True
-    return False
-
-
-def _invite_next_waitlisted(training):
-    """Promote the next waiting user to invited for the given training."""
-    next_entry = training.waitlist.filter(status="waiting").order_by("created_at").first()
-    if next_entry:
-        next_entry.status = "invited"
-        next_entry.save(update_fields=["status"])
-    return next_entry
 
 def google_login_with_role(request, role: str):
     role = (role or "").lower()
@@ -157,7 +152,7 @@ def reports_view(request):
 
 @login_required
 def submit_report_view(request):
-    profile, created = Profile.objects.get_or_create(user=request.user)
+    profile = profile_for(request)
     
     if request.method == 'POST':
         form = ReportForm(request.POST)
@@ -167,11 +162,7 @@ def submit_report_view(request):
             report.save()
             
             # Log activity
-            ActivityLog.objects.create(
-                user=request.user,
-                action='other',
-                description=f'Submitted report: {report.title}'
-            )
+            activity.record(request.user, 'other', f'Submitted report: {report.title}')
             
             messages.success(request, 'Report submitted successfully!')
             return redirect('submit_report')
@@ -190,7 +181,7 @@ def submit_report_view(request):
 
 @login_required
 def admin_log_view(request):
-    profile, created = Profile.objects.get_or_create(user=request.user)
+    profile = profile_for(request)
     
     if not profile.role == 'admin':
         messages.error(request, 'Access denied. Admin only.')
@@ -199,8 +190,24 @@ def admin_log_view(request):
     # Get open reports (not resolved or closed)
     reports = Report.objects.filter(status='open')
     
-    # Get recent activity logs
-    activity_logs = ActivityLog.objects.all()[:50]  # Last 50 activities
+    # Activity log feed, filtered and paged with a keyset cursor
+    log_filters = {
+        'user': request.GET.get('user', '').strip(),
+        'action': request.GET.get('action', ''),
+        'from': request.GET.get('from', ''),
+        'to': request.GET.get('to', ''),
+    }
+    log_user_id = None
+    if log_filters['user']:
+        log_user_id = User.objects.filter(username=log_filters['user']).values_list('id', flat=True).first() or 0
+    activity_logs, next_cursor = activity.feed(
+        user_id=log_user_id,
+        action=log_filters['action'] if log_filters['action'] in dict(ActivityLog.ACTION_CHOICES) else None,
+        date_from=_date_param(log_filters['from']),
+        date_to=_date_param(log_filters['to']),
+        cursor=request.GET.get('cursor'),
+    )
+    log_query = urlencode({key: value for key, value in log_filters.items() if value})
     
     # Handle report actions
     if request.method == 'POST':
@@ -226,6 +233,11 @@ def admin_log_view(request):
     context = {
         'reports': reports,
         'activity_logs': activity_logs,
+        'log_filters': log_filters,
+        'log_actions': ActivityLog.ACTION_CHOICES,
+        'log_query': log_query,
+        'next_cursor': next_cursor,
+        'is_first_page': not request.GET.get('cursor'),
     }
     return render(request, 'pct/admin_log.html', context)
 
@@ -261,7 +273,7 @@ def ban_error_view(request):
 
 @login_required
 def home_view(request):
-    profile, created = Profile.objects.get_or_create(user=request.user)
+    profile = profile_for(request)
     
     # Check if user was banned during login (from signal)
     if 'user_banned' in request.session:
@@ -291,25 +303,7 @@ def home_view(request):
         
         return redirect(f'/ban-error/?{urlencode(params)}')
     
-    # Check if user is banned (for already logged-in users)
-    if profile.is_currently_banned():
-        ban_type = profile.ban_type or 'permanent'
-        ban_expires_at = profile.ban_expires_at
-        ban_reason = profile.ban_reason or ''
-        
-        # Logout the user
-        logout(request)
-        
-        # Build redirect URL with ban information
-        from urllib.parse import urlencode
-        params = {
-            'ban_type': ban_type,
-            'ban_reason': ban_reason
-        }
-        if ban_expires_at:
-            params['ban_expires_at'] = ban_expires_at.isoformat()
-        
-        return redirect(f'/ban-error/?{urlencode(params)}')
+    # Signed-in users who are banned never get here; see pct.bans.BanMiddleware.
     
     # Check if there's a role mismatch (user tried to login with different role)
     if 'role_mismatch' in request.session:
@@ -352,12 +346,13 @@ def home_view(request):
 
     elif role == "staff":
         student_trainings = (
-            Training.objects.filter(student=profile)
+            Training.objects.filter(seats__profile=profile)
             .select_related("staff", "level")
         )
         staff_trainings = (
             Training.objects.filter(staff=profile)
-            .select_related("student", "level")
+            .select_related("level")
+            .prefetch_related("seats__profile__user")
         )
         context = {
             "profile": profile,
@@ -375,7 +370,7 @@ def home_view(request):
 
     else:  # student
         student_trainings = (
-            Training.objects.filter(student=profile)
+            Training.objects.filter(seats__profile=profile)
             .select_related("staff", "level")
         )
         context = {
@@ -392,7 +387,7 @@ def home_view(request):
 
 @login_required
 def reservations_view(request):
-    profile, created = Profile.objects.get_or_create(user=request.user)
+    profile = profile_for(request)
 
     if 'role_mismatch' in request.session:
         existing_role = request.session.get('existing_role', profile.role or 'student')
@@ -408,27 +403,25 @@ def reservations_view(request):
 
     role = (profile.role or "student").lower()
     room_reservation_form = RoomReservationForm()
+    room_series_form = RoomReservationSeriesForm()
+    series_conflicts = []
     my_room_reservations = (
         profile.room_reservations.all()
         .select_related("reviewed_by__user")
         .order_by("-start_time", "-created_at")
     )
     staff_can_moderate_reservations = role in {"staff", "admin"}
-    pending_room_reservations = RoomReservation.objects.none()
-    all_room_reservations = RoomReservation.objects.none()
-    if staff_can_moderate_reservations:
-        pending_room_reservations = (
-            RoomReservation.objects.filter(
-                status=RoomReservation.StatusChoices.PENDING
-            )
-            .select_related("requester__user")
-            .order_by("start_time")
-        )
-        all_room_reservations = (
-            RoomReservation.objects.select_related("requester__user", "reviewed_by__user")
-            .order_by("-start_time", "-created_at")
-        )
-
+    pending_room_reservations, next_pending_cursor = [], None
+    all_room_reservations, next_history_cursor = [], None
+    # Moderation queues, filtered and paged with keyset cursors
+    queue_filters = {
+        'room': request.GET.get('room', ''),
+        'status': request.GET.get('status', ''),
+        'requester': request.GET.get('requester', '').strip(),
+        'from': request.GET.get('from', ''),
+        'to': request.GET.get('to', ''),
+    }
+    queue_query = urlencode({key: value for key, value in queue_filters.items() if value})
     if request.method == "POST":
         form_type = request.POST.get("form_type")
         if form_type == "room_request":
@@ -436,55 +429,192 @@ def reservations_view(request):
             if room_reservation_form.is_valid():
                 reservation = room_reservation_form.save(commit=False)
                 reservation.requester = profile
-                reservation.save()
-                messages.success(
-                    request,
-                    "Room reservation request submitted! The staff will review it shortly.",
-                )
-                return redirect("reservations")
+                # is_valid() ran RoomReservation.clean, which checked the room timeline.
+                auto_approved = auto_approval.apply(reservation, role, conflicts_checked=True)
+                try:
+                    # The database rejects overlapping bookings on PostgreSQL.
+                    with transaction.atomic():
+                        reservation.save()
+                except IntegrityError:
+                    room_reservation_form.add_error(
+                        None, "This room is already reserved during the selected time."
+                    )
+                else:
+                    if auto_approved:
+                        messages.success(request, "Room reservation approved! The room is yours.")
+                    else:
+                        messages.success(
+                            request,
+                            "Room reservation request submitted! The staff will review it shortly.",
+                        )
+                    return redirect("reservations")
             messages.error(
                 request,
                 "Please correct the errors below to submit your room reservation request.",
             )
-        elif form_type in {"approve_reservation", "deny_reservation"}:
+        elif form_type == "room_series":
+            room_series_form = RoomReservationSeriesForm(request.POST)
+            if room_series_form.is_valid():
+                data = room_series_form.cleaned_data
+                try:
+                    result = reservation_series.book(
+                        profile,
+                        data["room"],
+                        data["weekdays"],
+                        data["start_time"],
+                        data["end_time"],
+                        data["first_date"],
+                        data["last_date"],
+                        data["affiliation"],
+                        semester=data["semester"],
+                        is_exclusive_request=data["is_exclusive_request"],
+                        skip_conflicts=data["skip_conflicts"],
+                    )
+                except reservation_series.SeriesConflict as error:
+                    series_conflicts = sorted(error.conflicts.items())
+                    room_series_form.add_error(None, str(error))
+                except reservation_series.SeriesError as error:
+                    room_series_form.add_error(None, str(error))
+                else:
+                    message = f"Recurring request submitted for {result.created} dates."
+                    if result.conflicts:
+                        message += f" {len(result.conflicts)} dates were already taken and were left out."
+                    messages.success(request, message)
+                    return redirect("reservations")
+            messages.error(
+                request,
+                "Please correct the errors below to submit your recurring request.",
+            )
+        elif form_type in {"approve_series", "deny_series"}:
             if not staff_can_moderate_reservations:
                 messages.error(request, "You do not have permission to moderate reservations.")
                 return redirect("reservations")
 
             reservation = get_object_or_404(
-                RoomReservation, pk=request.POST.get("reservation_id")
+                RoomReservation.objects.select_related("series"),
+                pk=request.POST.get("reservation_id"),
+                series__isnull=False,
             )
-            new_status = (
-                RoomReservation.StatusChoices.APPROVED
-                if form_type == "approve_reservation"
-                else RoomReservation.StatusChoices.DENIED
+            approve = form_type == "approve_series"
+            changed = reservation_series.moderate(reservation.series, approve, profile)
+            messages.success(
+                request,
+                f"Series {'approved' if approve else 'denied'} ({changed} dates updated).",
             )
-
-            if reservation.status == new_status:
-                messages.info(request, "This reservation is already up to date.")
+            return redirect("reservations")
+        elif form_type in {"approve_reservation", "deny_reservation"}:
+            if not staff_can_moderate_reservations:
+                messages.error(request, "You do not have permission to moderate reservations.")
                 return redirect("reservations")
 
-            reservation.status = new_status
-            reservation.reviewed_by = profile
-            reservation.reviewed_at = timezone.now()
-            reservation.save()
-            if new_status == RoomReservation.StatusChoices.APPROVED:
+            reservation = get_object_or_404(
+                RoomReservation, pk=request.POST.get("reservation_id")
+            )
+            approve = form_type == "approve_reservation"
+            try:
+                changed = reservation_queue.moderate(reservation, approve, profile)
+            except reservation_queue.ModerationError as error:
+                messages.error(request, str(error))
+                return redirect("reservations")
+            if not changed:
+                messages.info(request, "This reservation is already up to date.")
+            elif approve:
                 messages.success(request, "Reservation approved.")
             else:
                 messages.success(request, "Reservation denied.")
             return redirect("reservations")
 
+    # Only built for pages that render: a GET, or a POST whose form came back with errors.
+    if staff_can_moderate_reservations:
+        requester_id = None
+        if queue_filters['requester']:
+            requester_id = User.objects.filter(username=queue_filters['requester']).values_list('id', flat=True).first() or 0
+        shared_filters = {
+            'room': queue_filters['room'] if queue_filters['room'] in RoomReservation.RoomChoices.values else None,
+            'requester_id': requester_id,
+            'date_from': _date_param(queue_filters['from']),
+            'date_to': _date_param(queue_filters['to']),
+        }
+        pending_room_reservations, next_pending_cursor = reservation_queue.page(
+            status=RoomReservation.StatusChoices.PENDING,
+            cursor=request.GET.get('pending_cursor'),
+            newest_first=False,
+            **shared_filters,
+        )
+        all_room_reservations, next_history_cursor = reservation_queue.page(
+            status=queue_filters['status'] if queue_filters['status'] in RoomReservation.StatusChoices.values else None,
+            cursor=request.GET.get('cursor'),
+            **shared_filters,
+        )
+
     context = {
         "profile": profile,
         "room_reservation_form": room_reservation_form,
+        "room_series_form": room_series_form,
+        "series_conflicts": series_conflicts,
         "my_room_reservations": my_room_reservations,
         "pending_room_reservations": pending_room_reservations,
         "all_room_reservations": all_room_reservations,
+        "next_pending_cursor": next_pending_cursor,
+        "next_history_cursor": next_history_cursor,
+        "is_first_pending_page": not request.GET.get("pending_cursor"),
+        "is_first_history_page": not request.GET.get("cursor"),
+        "queue_filters": queue_filters,
+        "queue_query": queue_query,
+        "queue_rooms": RoomReservation.RoomChoices.choices,
+        "queue_statuses": RoomReservation.StatusChoices.choices,
         "staff_can_moderate_reservations": staff_can_moderate_reservations,
     }
     return render(request, "pct/reservations.html", context)
 
 
+@login_required
+@require_http_methods(["POST"])
+def moderate_reservation_api(request, reservation_id):
+    """API endpoint for approving or denying a room reservation or its series; returns the changed cards"""
+    profile = profile_for(request)
+    if (profile.role or "student").lower() not in {"staff", "admin"}:
+        return JsonResponse({"error": "Permission denied"}, status=403)
+
+    action = request.POST.get("action")
+    if action not in {"approve", "deny"}:
+        return JsonResponse({"error": "Action must be approve or deny"}, status=400)
+
+    reservation = get_object_or_404(
+        RoomReservation.objects.select_related("requester__user", "series"), pk=reservation_id
+    )
+    if request.POST.get("scope") == "series":
+        if not reservation.series:
+            return JsonResponse({"error": "This reservation is not part of a series"}, status=400)
+        changed = reservation_series.moderate(reservation.series, action == "approve", profile)
+        # Every occurrence may have changed; send back each of their cards.
+        updated = reservation.series.occurrences.select_related("requester__user", "reviewed_by__user")
+        status = reservation.series.status
+    else:
+        try:
+            changed = reservation_queue.moderate(reservation, action == "approve", profile)
+        except reservation_queue.ModerationError as error:
+            return JsonResponse({"error": str(error)}, status=409)
+        updated = [reservation]
+        status = reservation.status
+
+    cards = {
+        str(row.pk): render_to_string(
+            "pct/partials/room_reservation_card.html",
+            {"reservation": row, "moderate": True},
+            request=request,
+        )
+        for row in updated
+    }
+    return JsonResponse({
+        "success": True,
+        "changed": changed,
+        "status": status,
+        "html": cards[str(reservation.pk)],
+        "cards": cards,
+    })
+
+
 def edit_profile(request):
     profile = request.user.profile
     schools = School.objects.all().order_by("school_name")
@@ -530,7 +660,7 @@ def edit_profile(request):
 
 @login_required
 def profile_view(request):
-    profile, created = Profile.objects.get_or_create(user=request.user)
+    profile = profile_for(request)
     context = edit_profile(request)
 
     if isinstance(context, HttpResponseRedirect):
@@ -538,6 +668,7 @@ def profile_view(request):
 
     context["profile"] = profile
     context["user"] = request.user
+    context["certificates"] = _certificates(profile)
     
     """
     Unified profile view that renders role-specific pages:
@@ -630,7 +761,7 @@ def get_majors_by_school(request):
 @login_required
 def manage_users_view(request):
     """View and manage users - Staff can manage students, Admin can manage staff and students"""
-    profile, created = Profile.objects.get_or_create(user=request.user)
+    profile = profile_for(request)
     
     # Check permissions
     if profile.role not in ['staff', 'team_member', 'admin']:
@@ -755,14 +886,14 @@ def manage_users_view(request):
 
 @login_required
 def add_certifications(request):
-    profile, created = Profile.objects.get_or_create(user=request.user)
+    profile = profile_for(request)
     
     # Check permissions - staff and team members can access
     if profile.role not in ['staff', 'team_member']:
         messages.error(request, 'You do not have permission to access this page.')
         return redirect('home')
     
-    certifications = Certification.objects.filter(profile__isnull=True)
+    certifications = CertificationTemplate.objects.select_related('type', 'level')
     # Only show students for certification assignment
     users = User.objects.filter(profile__role__in=Profile.USER_ROLES + ("staff",)).select_related('profile')
 
@@ -780,15 +911,7 @@ def add_certifications(request):
     
     # Filter users by search
     if user_search_query:
-        users = users.filter(
-            Q(username__icontains=user_search_query) |
-            Q(first_name__icontains=user_search_query) |
-            Q(last_name__icontains=user_search_query) |
-            Q(profile__first_name__icontains=user_search_query) |
-            Q(profile__last_name__icontains=user_search_query) |
-            Q(email__icontains=user_search_query) |
-            Q(profile__email__icontains=user_search_query)
-        )
+        users = user_search.search(users, user_search_query)
     
     # Handle POST requests
     if request.method == 'POST':
@@ -801,7 +924,7 @@ def add_certifications(request):
             cert_id = request.POST.get('cert_id')
             try:
                 cert_id = int(cert_id)
-                cert = Certification.objects.get(id=cert_id, profile__isnull=True)
+                cert = CertificationTemplate.objects.get(id=cert_id)
                 selected_ids = request.session.get('selected_certification_ids', [])
                 
                 if cert_id in selected_ids:
@@ -813,7 +936,7 @@ def add_certifications(request):
                 
                 request.session['selected_certification_ids'] = selected_ids
                 request.session.modified = True
-            except (Certification.DoesNotExist, ValueError):
+            except (CertificationTemplate.DoesNotExist, ValueError):
                 messages.error(request, 'Certification not found.')
         
         # Clear all selections
@@ -831,32 +954,11 @@ def add_certifications(request):
                 messages.error(request, 'Please select at least one certification first.')
             else:
                 try:
-                    target_user = User.objects.get(id=user_id)
-                    target_profile = target_user.profile
-                    certs_added = []
-                    certs_already_had = []
-                    
-                    for cert_id in selected_ids:
-                        try:
-                            cert_template = Certification.objects.get(id=cert_id, profile__isnull=True)
-                            if target_profile.certificates.filter(
-                                type=cert_template.type,
-                                level=cert_template.level,
-                            ).exists():
-                                certs_already_had.append(
-                                    f'{cert_template.type.name} - Level {cert_template.level.level}'
-                                )
-                            else:
-                                Certification.objects.create(
-                                    type=cert_template.type,
-                                    level=cert_template.level,
-                                    profile=target_profile,
-                                )
-                                certs_added.append(
-                                    f'{cert_template.type.name} - Level {cert_template.level.level}'
-                                )
-                        except Certification.DoesNotExist:
-                            continue
+                    target_profile = Profile.objects.select_related('user').get(user_id=user_id)
+                    templates = CertificationTemplate.objects.filter(id__in=selected_ids).select_related('type', 'level')
+                    result = certification_grants.grant([target_profile], templates)
+                    certs_added = result.added.get(target_profile.pk, [])
+                    certs_already_had = result.already_had.get(target_profile.pk, [])
                     
                     if certs_added:
                         messages.success(request, f'Certified {target_profile.get_full_name()} with: {", ".join(certs_added)}')
@@ -866,7 +968,7 @@ def add_certifications(request):
                     # Clear selections after certifying
                     request.session['selected_certification_ids'] = []
                     request.session.modified = True
-                except User.DoesNotExist:
+                except (Profile.DoesNotExist, ValueError):
                     messages.error(request, 'User not found.')
         
         # Change certification (remove old, select new)
@@ -880,7 +982,7 @@ def add_certifications(request):
                     target_user = User.objects.get(id=user_id)
                     target_profile = target_user.profile
                     old_cert = Certification.objects.get(id=old_cert_id, profile=target_profile)
-                    new_cert = Certification.objects.get(id=cert_id, profile__isnull=True)
+                    new_cert = CertificationTemplate.objects.get(id=cert_id)
                     
                     if target_profile.certificates.filter(
                         type=new_cert.type,
@@ -904,7 +1006,7 @@ def add_certifications(request):
                     # Clear session
                     if 'selected_user_id_for_change' in request.session:
                         del request.session['selected_user_id_for_change']
-                except (User.DoesNotExist, Certification.DoesNotExist):
+                except (User.DoesNotExist, Certification.DoesNotExist, CertificationTemplate.DoesNotExist):
                     messages.error(request, 'Error changing certification.')
         
         # Check if this is an AJAX request
@@ -931,7 +1033,7 @@ def add_certifications(request):
     # Get selected certifications for display
     selected_cert_ids = request.session.get('selected_certification_ids', [])
     selected_certs = (
-        Certification.objects.filter(id__in=selected_cert_ids, profile__isnull=True)
+        CertificationTemplate.objects.filter(id__in=selected_cert_ids).select_related('type', 'level')
         if selected_cert_ids
         else []
     )
@@ -946,10 +1048,61 @@ def add_certifications(request):
     })
 
 
+@login_required
+@require_http_methods(["POST"])
+def bulk_certify_api(request):
+    """API endpoint for granting certifications to many users at once"""
+    profile = profile_for(request)
+    
+    if profile.role not in ['staff', 'team_member']:
+        return JsonResponse({'error': 'Permission denied'}, status=403)
+    
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    
+    # Without explicit ids, grant the templates selected on the add-certifications page.
+    from_selection = data.get('certification_ids') is None
+    cert_ids = request.session.get('selected_certification_ids', []) if from_selection else data['certification_ids']
+    user_ids = data.get('user_ids') or []
+    if not isinstance(cert_ids, list) or not isinstance(user_ids, list) or not all(
+        isinstance(value, int) for value in [*cert_ids, *user_ids]
+    ):
+        return JsonResponse({'error': 'Ids must be integers'}, status=400)
+    
+    profiles = list(Profile.objects.filter(user_id__in=user_ids).select_related('user'))
+    templates = list(
+        CertificationTemplate.objects.filter(id__in=cert_ids).select_related('type', 'level')
+    )
+    if not profiles:
+        return JsonResponse({'error': 'Select at least one user'}, status=400)
+    if not templates:
+        return JsonResponse({'error': 'Select at least one certification'}, status=400)
+    
+    result = certification_grants.grant(profiles, templates)
+    if from_selection:
+        request.session['selected_certification_ids'] = []
+    
+    return JsonResponse({
+        'success': True,
+        'created': result.created,
+        'users': [
+            {
+                'id': target.user_id,
+                'name': target.get_full_name(),
+                'added': result.added.get(target.pk, []),
+                'already_had': result.already_had.get(target.pk, []),
+            }
+            for target in profiles
+        ],
+    })
+
+
 @login_required
 def view_student_profile(request, user_id):
     """View a student's profile information"""
-    profile, created = Profile.objects.get_or_create(user=request.user)
+    profile = profile_for(request)
     
     # Check permissions - only staff, team members, and admin can view student profiles
     if profile.role not in ['staff', 'team_member', 'admin']:
@@ -968,6 +1121,7 @@ def view_student_profile(request, user_id):
         return render(request, "pct/view_student_profile.html", {
             'student_profile': student_profile,
             'student_user': student_user,
+            'certificates': _certificates(student_profile),
         })
     except User.DoesNotExist:
         messages.error(request, 'Student not found.')
@@ -978,7 +1132,7 @@ def view_student_profile(request, user_id):
 @require_http_methods(["POST"])
 def remove_certification_api(request, user_id, cert_id):
     """API endpoint for removing a certification from a student"""
-    profile, _ = Profile.objects.get_or_create(user=request.user)
+    profile = profile_for(request)
     
     if profile.role not in ['staff', 'admin']:
         return JsonResponse({'error': 'Permission denied'}, status=403)
@@ -1009,39 +1163,28 @@ def remove_certification_api(request, user_id, cert_id):
 @require_http_methods(["GET"])
 def search_certifications_api(request):
     """API endpoint for real-time certification search"""
-    profile, _ = Profile.objects.get_or_create(user=request.user)
+    profile = profile_for(request)
     
     if profile.role not in ['staff', 'admin']:
         return JsonResponse({'error': 'Permission denied'}, status=403)
     
-    search_query = request.GET.get('q', '')
-    certifications = Certification.objects.filter(profile__isnull=True)
-    
-    if search_query:
-        certifications = certifications.filter(
-            Q(type__name__icontains=search_query) |
-            Q(type__description__icontains=search_query) |
-            Q(level__level__icontains=search_query)
-        )
-    
-    results = []
-    for cert in certifications[:50]:  # Limit to 50 results
-        results.append({
-            'id': cert.id,
-            'name': cert.type.name,
-            'description': cert.type.description or '',
-            'icon': cert.type.icon or 'fa-solid fa-certificate',
-            'level': cert.level.level,
-        })
-    
-    return JsonResponse({'certifications': results})
+    catalog = certification_catalog.get_catalog()
+    # The answer depends only on the catalog and q (part of the URL), so the
+    # catalog version is enough for the browser to revalidate against.
+    etag = f'"{catalog.version}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = JsonResponse({'certifications': catalog.search(request.GET.get('q', ''))})
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
 
 
 @login_required
 @require_http_methods(["GET"])
 def search_users_api(request):
     """API endpoint for real-time user search"""
-    profile, _ = Profile.objects.get_or_create(user=request.user)
+    profile = profile_for(request)
     
     if profile.role not in ['staff', 'admin']:
         return JsonResponse({'error': 'Permission denied'}, status=403)
@@ -1050,15 +1193,7 @@ def search_users_api(request):
     users = User.objects.filter(profile__role__in=Profile.USER_ROLES).select_related('profile')
     
     if search_query:
-        users = users.filter(
-            Q(username__icontains=search_query) |
-            Q(first_name__icontains=search_query) |
-            Q(last_name__icontains=search_query) |
-            Q(profile__first_name__icontains=search_query) |
-            Q(profile__last_name__icontains=search_query) |
-            Q(email__icontains=search_query) |
-            Q(profile__email__icontains=search_query)
-        )
+        users = user_search.search(users, search_query)
     
     results = []
     for user in users[:50]:  # Limit to 50 results
@@ -1076,7 +1211,7 @@ def search_users_api(request):
 @require_http_methods(["POST"])
 def create_certification_api(request):
     """API endpoint for creating a new certification"""
-    profile, _ = Profile.objects.get_or_create(user=request.user)
+    profile = profile_for(request)
     
     if profile.role not in ['staff', 'admin']:
         return JsonResponse({'error': 'Permission denied'}, status=403)
@@ -1115,7 +1250,7 @@ def create_certification_api(request):
         cert_level, _ = CertificationLevel.objects.get_or_create(level=level)
         
         # Create certification
-        cert, created = Certification.objects.get_or_create(
+        cert, created = CertificationTemplate.objects.get_or_create(
             type=cert_type,
             level=cert_level
         )
@@ -1142,19 +1277,25 @@ def create_certification_api(request):
 @require_http_methods(["POST"])
 def update_certification_api(request, cert_id):
     """API endpoint for updating a certification"""
-    profile, _ = Profile.objects.get_or_create(user=request.user)
+    profile = profile_for(request)
     
     if profile.role not in ['staff', 'admin']:
         return JsonResponse({'error': 'Permission denied'}, status=403)
     
     try:
-        cert = Certification.objects.get(id=cert_id)
+        cert = CertificationTemplate.objects.select_related('type', 'level').get(id=cert_id)
         data = json.loads(request.body)
         title = data.get('title', '').strip()
         description = data.get('description', '').strip()
         icon = data.get('icon', '').strip()
         level = data.get('level')
         
+        # The catalog holds one template per type and level.
+        if level and level in [1, 2, 3] and CertificationTemplate.objects.filter(
+            type=cert.type, level__level=level,
+        ).exclude(pk=cert.pk).exists():
+            return JsonResponse({'error': f'{cert.type.name} - Level {level} already exists'}, status=400)
+        
         if title:
             cert.type.name = title
             cert.type.save()
@@ -1184,21 +1325,87 @@ def update_certification_api(request, cert_id):
             'message': 'Certification updated successfully'
         })
         
-    except Certification.DoesNotExist:
+    except CertificationTemplate.DoesNotExist:
         return JsonResponse({'error': 'Certification not found'}, status=404)
     except json.JSONDecodeError:
         return JsonResponse({'error': 'Invalid JSON'}, status=400)
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=400)
 
+@login_required
+@require_http_methods(["GET"])
+def request_metrics_api(request):
+    """API endpoint for the rolling per-view query/timing summary"""
+    profile = profile_for(request)
+
+    if profile.role not in ['staff', 'admin']:
+        return JsonResponse({'error': 'Permission denied'}, status=403)
+
+    return JsonResponse({
+        'enabled': settings.REQUEST_METRICS_ENABLED,
+        'views': request_metrics.summarize(),
+    })
+
+
+@login_required
+@require_http_methods(["GET"])
+def schedule_coverage_api(request):
+    """API endpoint for shift candidates and hourly staffing in a schedule week"""
+    profile = profile_for(request)
+
+    if profile.role not in ['staff', 'admin']:
+        return JsonResponse({'error': 'Permission denied'}, status=403)
+
+    week_start = _week_start_from_param(request.GET.get('week_start'))
+    schedule_week = ScheduleWeek.objects.filter(week_start=week_start).first()
+    if not schedule_week:
+        return JsonResponse({'error': 'No schedule for that week'}, status=404)
+    return JsonResponse(coverage.WeekCoverage(schedule_week).as_dict())
+
+
+@login_required
+@require_http_methods(["GET"])
+def room_free_slots_api(request):
+    """API endpoint for the open gaps in one room (or every room) on a day"""
+    target_date = _date_param(request.GET.get('date'))
+    if not target_date:
+        return JsonResponse({'error': 'date must be YYYY-MM-DD'}, status=400)
+    room = request.GET.get('room') or None
+    if room == 'any':
+        room = None
+    if room and room not in RoomReservation.RoomChoices.values:
+        return JsonResponse({'error': 'Unknown room'}, status=400)
+    try:
+        minutes = int(request.GET.get('duration', 60))
+    except ValueError:
+        return JsonResponse({'error': 'duration must be a number of minutes'}, status=400)
+    if not 15 <= minutes <= 24 * 60:
+        return JsonResponse({'error': 'duration must be between 15 and 1440 minutes'}, status=400)
+
+    slots = room_availability.free_slots(target_date, timedelta(minutes=minutes), room=room)
+    return JsonResponse({
+        'date': target_date.isoformat(),
+        'slots': [
+            {
+                'room': slot.room,
+                'room_label': slot.room_label,
+                'start': slot.start.isoformat(),
+                'end': slot.end.isoformat(),
+                'start_label': slot.start.strftime('%H:%M'),
+                'end_label': slot.end.strftime('%H:%M'),
+            }
+            for slot in slots
+        ],
+    })
+
+
 class TrainingCreateView(CreateView):
     model = Training
     form_class = TrainingForm
     template_name = "pct/training_form.html"
     success_url = reverse_lazy("staff-training-list")
 
-    @method_decorator(login_required)
-    @method_decorator(user_passes_test(lambda u: getattr(u.profile, "role", "") in ["staff", "team_member"]))
+    @method_decorator(role_required("staff", "team_member"))
     def dispatch(self, request, *args, **kwargs):
         return super().dispatch(request, *args, **kwargs)
 
@@ -1208,7 +1415,14 @@ class TrainingCreateView(CreateView):
         return kwargs
 
     def form_valid(self, form):
-        response = super().form_valid(form)
+        try:
+            with transaction.atomic():
+                response = super().form_valid(form)
+        except booking.BookingError as exc:
+            # Seats filled up after the form was validated; the training isn't saved.
+            self.object = None
+            form.add_error("students", str(exc))
+            return self.form_invalid(form)
         training = self.object
         if training.time:
             week_start = _week_start_for_datetime(training.time)
@@ -1220,18 +1434,19 @@ class TrainingCreateView(CreateView):
                 schedule_week.save(update_fields=["status", "published_at", "updated_at"])
         return response
 
-@login_required
-@user_passes_test(lambda u: getattr(u.profile, "role", "") in ["staff", "team_member"])
+@role_required("staff", "team_member")
 def staff_training_list(request):
     now = timezone.now()
     my_trainings = (
         Training.objects.filter(staff=request.user.profile)
-        .select_related("level", "student")
+        .select_related("level")
+        .prefetch_related("seats__profile__user")
         .order_by(F("time").asc(nulls_last=True), "name")
     )
     available_trainings = (
         Training.objects.select_related("level", "staff")
-        .filter(student__isnull=True)
+        .prefetch_related("seats__profile__user")
+        .filter(seats_taken__lt=F("capacity"))
         .filter(Q(time__gte=now) | Q(time__isnull=True))
         .order_by(F("time").asc(nulls_last=True), "name")
     )
@@ -1245,145 +1460,80 @@ def staff_training_list(request):
         },
     )
 
-@login_required
-@user_passes_test(lambda u: getattr(u.profile, "role", "")in ["student", "staff", "team_member"])
+@role_required("student", "staff", "team_member")
 def training_list(request):
     now = timezone.now()
     profile = request.user.profile
-    any_levels, per_type_levels = _certificate_level_cache(profile)
-    trainings = (
-        Training.objects.select_related("staff", "level", "staff", "certification_type")
-        .prefetch_related("waitlist__profile")
+    try:
+        page_number = max(int(request.GET.get("page", 1)), 1)
+    except ValueError:
+        page_number = 1
+    trainings = training_eligibility.for_profile(
+        Training.objects.select_related("staff__user", "level", "certification_type")
         .filter(Q(time__gte=now) | Q(time__isnull=True))
-        .order_by(F("time").asc(nulls_last=True), "name")
+        .order_by(F("time").asc(nulls_last=True), "name", "pk"),
+        profile,
     )
-    trainings = list(trainings)
+    trainings, has_next = training_eligibility.page(trainings, page_number)
     for training in trainings:
-        level_value = training.level.level
-        prereq_level = level_value - 1 if level_value > 1 else None
-        training.prereq_level = prereq_level
-        training.prereq_type = training.certification_type
-        training.requirement_text = _format_prereq_label(training, prereq_level) if prereq_level else None
-
-        if level_value <= 1:
-            meets_prereq = True
-        elif training.certification_type_id:
-            meets_prereq = prereq_level in per_type_levels.get(training.certification_type_id, set())
-        else:
-            meets_prereq = prereq_level in any_levels
-
-        invited_entry = None
-        is_waitlisted = False
-        waitlist_status = None
-        for entry in training.waitlist.all():
-            if entry.profile_id == profile.id:
-                is_waitlisted = True
-                waitlist_status = entry.status
-            if entry.status == "invited":
-                invited_entry = entry
-                break
-
-        training.invited_entry = invited_entry
-        training.invited_for_me = bool(invited_entry and invited_entry.profile_id == profile.id)
-        waiting_for_other = bool(invited_entry and not training.invited_for_me)
-
-        training.is_full = training.student_id is not None or waiting_for_other
-        training.is_mine = training.student_id == profile.id
-        training.is_waitlisted = is_waitlisted
-        training.waitlist_status = waitlist_status
-        schedule_week = _schedule_week_for_datetime(training.time) if training.time else None
-        if training.time:
-            schedule_published = schedule_week.is_published if schedule_week else True
-        else:
-            schedule_published = True
-        training.schedule_week = schedule_week
-        training.is_schedule_published = schedule_published
-        training.can_signup = (
-            meets_prereq
-            and not training.is_full
-            and not training.is_mine
-            and schedule_published
-        )
-        if training.invited_for_me or training.is_waitlisted:
-            training.can_signup = False
-        training.lock_reason = None
-
-        if training.is_mine:
-            training.lock_reason = "You're registered"
-        elif training.is_full:
-            training.lock_reason = "Booked" if training.student_id else "Reserved for an invited student"
-        elif not meets_prereq and training.requirement_text:
-            training.lock_reason = f"Requires {training.requirement_text}"
-        elif training.time and not schedule_published:
-            training.lock_reason = "Schedule not published"
-        elif training.invited_for_me:
-            training.lock_reason = "You have an invitation for this training"
-        elif training.is_waitlisted:
-            training.lock_reason = "You're on the waitlist"
-
-    return render(request, "pct/training_list.html", {"trainings": trainings})
+        training_eligibility.describe(training)
 
+    return render(request, "pct/training_list.html", {
+        "trainings": trainings,
+        "page_number": page_number,
+        "has_next": has_next,
+    })
 
-@login_required
-@user_passes_test(lambda u: getattr(u.profile, "role", "") in ["student", "staff", "team_member"])
+
+@role_required("student", "staff", "team_member")
 def training_signup(request, pk):
     if request.method != "POST":
         messages.error(request, "Use the sign-up button to join a training.")
         return redirect("training-list")
 
     training = get_object_or_404(
-        Training.objects.select_related("student", "staff"),
+        Training.objects.select_related("staff"),
         pk=pk,
     )
     profile = request.user.profile
     required_level = training.level.level
     if required_level > 1 and not _student_has_prerequisite(profile, training):
         prerequisite_level = required_level - 1
-        prereq_label = _format_prereq_label(training, prerequisite_level)
+        prereq_label = training_eligibility.requirement_text(training, prerequisite_level)
         messages.error(
             request,
             f"You need {prereq_label} before joining a level {required_level} training.",
         )
         return redirect("training-list")
 
-    if training.student is not None:
-        messages.error(request, "That training already has a student assigned.")
-        return redirect("training-list")
-
     if training.time and training.time < timezone.now():
         messages.error(request, "That training has already taken place.")
         return redirect("training-list")
 
-    invited_entry = training.waitlist.filter(status="invited").order_by("created_at").first()
-    if invited_entry and invited_entry.profile_id != profile.id:
-        messages.error(request, "This training is reserved for another student who was invited from the waitlist.")
-        return redirect("training-list")
-
     if training.time:
         schedule_week = _schedule_week_for_datetime(training.time)
         if schedule_week and not schedule_week.is_published:
             messages.error(request, "This schedule is not published yet. Please check back after staff publishes it.")
             return redirect("training-list")
 
-    profile = request.user.profile
-    training.student = profile
-    training.save(update_fields=["student"])
-    if invited_entry and invited_entry.profile_id == profile.id:
-        TrainingWaitlist.objects.filter(pk=invited_entry.pk).update(status="accepted")
+    try:
+        booking.claim_training(training, profile)
+    except booking.BookingError as exc:
+        messages.error(request, str(exc))
+        return redirect("training-list")
 
     messages.success(request, f"You are signed up for {training.name}.")
     return redirect("training-list")
 
 
-@login_required
-@user_passes_test(lambda u: getattr(u.profile, "role", "") in ["student", "staff", "team_member"])
+@role_required("student", "staff", "team_member")
 @require_http_methods(["POST"])
 def training_cancel(request, pk):
-    training = get_object_or_404(Training.objects.select_related("student"), pk=pk)
+    training = get_object_or_404(Training, pk=pk)
     profile = request.user.profile
     redirect_target = request.POST.get("next") or "home"
 
-    if training.student_id != profile.id:
+    if not training.seats.filter(profile=profile).exists():
         messages.error(request, "You can only cancel trainings you are signed up for.")
         return redirect(redirect_target)
 
@@ -1412,14 +1562,8 @@ def training_cancel(request, pk):
             )
             return redirect(redirect_target)
 
-    training.student = None
-    training.save(update_fields=["student"])
-    invited_entry = _invite_next_waitlisted(training)
-    if invited_entry:
-        messages.info(
-            request,
-            f"{invited_entry.profile.get_full_name()} has been invited to join {training.name}.",
-        )
+    invited = booking.release_training(training, profile)
+    _announce_invitations(request, training, invited)
     messages.success(request, f"Canceled your reservation for {training.name}.")
     return redirect(redirect_target)
 
@@ -1438,7 +1582,69 @@ def is_staff(user):
     return user.is_staff
 
 
-TRAINING_BLOCK_DURATION = timedelta(hours=1)
+# Hard cap on events returned by one /calendar/events/ response. Larger windows
+# are paged with the X-Next-Cursor header.
+CALENDAR_EVENT_LIMIT = 1000
+
+# Source order used to break ties between events that share a start time.
+CALENDAR_SOURCE_RANKS = {"workblock": 0, "training": 1, "shift": 2, "reservation": 3}
+
+
+def _parse_calendar_bound(value):
+    """Parse a FullCalendar range bound (ISO date or datetime) into an aware datetime."""
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        parsed_date = parse_date(value)
+        if parsed_date is None:
+            raise ValueError(f"Invalid date: {value}")
+        parsed = datetime.combine(parsed_date, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _encode_calendar_cursor(key):
+    start, rank, pk = key
+    return f"{start.isoformat()}~{rank}~{pk}"
+
+
+def _decode_calendar_cursor(value):
+    """Return the (start, source rank, pk) key encoded in a calendar cursor."""
+    if not value:
+        return None
+    try:
+        start_str, rank, pk = value.split("~")
+        start = _parse_calendar_bound(start_str)
+        return start, int(rank), int(pk)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor.")
+
+
+def _calendar_page(queryset, start_field, source, cursor, limit):
+    """Fetch up to limit + 1 rows ordered by (start, pk) after the cursor.
+
+    Returns (rows, boundary). boundary is the key of the last row fetched when the
+    source had more rows than the limit, so the caller knows how far it has seen.
+    """
+    rank = CALENDAR_SOURCE_RANKS[source]
+    if cursor is not None:
+        cursor_start, cursor_rank, cursor_pk = cursor
+        if rank > cursor_rank:
+            queryset = queryset.filter(**{f"{start_field}__gte": cursor_start})
+        elif rank < cursor_rank:
+            queryset = queryset.filter(**{f"{start_field}__gt": cursor_start})
+        else:
+            queryset = queryset.filter(
+                Q(**{f"{start_field}__gt": cursor_start})
+                | Q(**{start_field: cursor_start, "pk__gt": cursor_pk})
+            )
+    rows = list(queryset.order_by(start_field, "pk")[: limit + 1])
+    boundary = None
+    if len(rows) > limit:
+        boundary = (getattr(rows[-1], start_field), rank, rows[-1].pk)
+    return rows, boundary
 
 
 def _user_has_staff_role(user):
@@ -1495,15 +1701,33 @@ class EventsView(View):
     """
     # Fetch events
     def get(self, request):
+        try:
+            window_start = _parse_calendar_bound(request.GET.get("start"))
+            window_end = _parse_calendar_bound(request.GET.get("end"))
+            cursor = _decode_calendar_cursor(request.GET.get("cursor"))
+        except ValueError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+        if window_start and window_end and window_end <= window_start:
+            return JsonResponse({"error": "end must be after start."}, status=400)
+        limit = CALENDAR_EVENT_LIMIT
+
         staff_view = request.GET.get("staff_view") == "1"
         if staff_view and _user_has_staff_role(request.user):
             events = WorkBlock.objects.all()
         else:
             events = WorkBlock.objects.filter(user=request.user)
-
-        event_list = []
+        if window_start:
+            events = events.filter(end__gt=window_start)
+        if window_end:
+            events = events.filter(start__lt=window_end)
+
+        keyed_events = []
+        boundaries = []
+        events, boundary = _calendar_page(events, "start", "workblock", cursor, limit)
+        if boundary:
+            boundaries.append(boundary)
         for event in events:
-            event_list.append({
+            keyed_events.append(((event.start, CALENDAR_SOURCE_RANKS["workblock"], event.pk), {
                 "id": _workblock_event_id(event.id),
                 "title": event.title,
                 "start": event.start.isoformat(),
@@ -1518,12 +1742,18 @@ class EventsView(View):
                     "canEdit": True,
                     "description": event.description or "",
                 },
-            })
+            }))
 
         profile = getattr(request.user, "profile", None)
         trainings = Training.objects.select_related(
-            "student__user", "staff__user", "level"
+            "staff__user", "level"
         ).filter(time__isnull=False)
+        if window_start:
+            trainings = trainings.annotate(
+                ends_at=ExpressionWrapper(F("time") + F("duration"), output_field=DateTimeField())
+            ).filter(ends_at__gt=window_start)
+        if window_end:
+            trainings = trainings.filter(time__lt=window_end)
 
         staff_only = request.GET.get("staff_only") == "1"
         if staff_only:
@@ -1534,23 +1764,25 @@ class EventsView(View):
 
         mine_only = request.GET.get("mine_only") == "1"
 
+        trainings, boundary = _calendar_page(trainings, "time", "training", cursor, limit)
+        if boundary:
+            boundaries.append(boundary)
+        schedule_weeks = _schedule_weeks_for_datetimes(training.time for training in trainings)
         for training in trainings:
-            schedule_week = _schedule_week_for_datetime(training.time)
+            schedule_week = schedule_weeks.get(_week_start_for_datetime(training.time))
             if schedule_week and not schedule_week.is_published:
                 continue
             start_dt = training.time
-            end_dt = training.time + TRAINING_BLOCK_DURATION
-            student_name = training.student.get_full_name() if training.student else None
+            end_dt = training.time + training.duration
+            seats = f"{training.seats_taken}/{training.capacity} booked"
             staff_name = training.staff.get_full_name() if training.staff else None
-            description = f"Machine: {training.machine}\nLevel {training.level.level}"
-            if student_name:
-                description += f"\nStudent: {student_name}"
+            description = f"Machine: {training.machine}\nLevel {training.level.level}\nSeats: {seats}"
             if staff_name:
                 description += f"\nStaff: {staff_name}"
 
-            color = "#16a085" if training.student else "#f39c12"
+            color = "#f39c12" if training.open_seats else "#16a085"
 
-            event_list.append({
+            keyed_events.append(((training.time, CALENDAR_SOURCE_RANKS["training"], training.pk), {
                 "id": f"training-{training.id}",
                 "title": f"Training: {training.name}",
                 "start": start_dt.isoformat(),
@@ -1565,11 +1797,12 @@ class EventsView(View):
                     "canEdit": False,
                     "machine": training.machine,
                     "description": description,
-                    "student": student_name,
+                    "seats": seats,
+                    "openSeats": training.open_seats,
                     "staff": staff_name,
                     "level": training.level.level,
                 },
-            })
+            }))
 
         # Shifts (published only)
         shifts = Shift.objects.select_related("assigned_to__user", "schedule_week").filter(
@@ -1578,6 +1811,13 @@ class EventsView(View):
         )
         if mine_only and profile:
             shifts = shifts.filter(assigned_to=profile)
+        if window_start:
+            shifts = shifts.filter(end__gt=window_start)
+        if window_end:
+            shifts = shifts.filter(start__lt=window_end)
+        shifts, boundary = _calendar_page(shifts, "start", "shift", cursor, limit)
+        if boundary:
+            boundaries.append(boundary)
         for shift in shifts:
             assigned_name = shift.assigned_to.get_full_name() if shift.assigned_to else ""
             title = f"Shift: {shift.title}"
@@ -1590,7 +1830,7 @@ class EventsView(View):
                 desc_lines.append(f"Notes: {shift.notes}")
             description = "\n".join(desc_lines)
             color = "#5e8bff" if profile and shift.assigned_to_id == profile.id else "#7a88b8"
-            event_list.append({
+            keyed_events.append(((shift.start, CALENDAR_SOURCE_RANKS["shift"], shift.pk), {
                 "id": f"shift-{shift.id}",
                 "title": title,
                 "start": shift.start.isoformat(),
@@ -1605,7 +1845,7 @@ class EventsView(View):
                     "assigned_to": assigned_name,
                     "notes": shift.notes or "",
                 },
-            })
+            }))
 
         # Room reservations (approved)
         reservations = RoomReservation.objects.select_related("requester__user").filter(
@@ -1615,8 +1855,15 @@ class EventsView(View):
             reservations = reservations.filter(requester=profile)
         elif not staff_view:
             reservations = reservations.filter(requester=request.user.profile)
+        if window_start:
+            reservations = reservations.filter(end_time__gt=window_start)
+        if window_end:
+            reservations = reservations.filter(start_time__lt=window_end)
+        reservations, boundary = _calendar_page(reservations, "start_time", "reservation", cursor, limit)
+        if boundary:
+            boundaries.append(boundary)
         for res in reservations:
-            event_list.append({
+            keyed_events.append(((res.start_time, CALENDAR_SOURCE_RANKS["reservation"], res.pk), {
                 "id": f"reservation-{res.id}",
                 "title": f"Room: {res.get_room_display()}",
                 "start": res.start_time.isoformat(),
@@ -1632,9 +1879,23 @@ class EventsView(View):
                     "requester": res.requester.get_full_name(),
                     "status": res.get_status_display(),
                 },
-            })
-
-        return JsonResponse(event_list, safe=False)
+            }))
+
+        # Merge the sources in (start, source, pk) order. A truncated source has
+        # only been read up to its boundary, so nothing past the earliest boundary
+        # can be returned yet; the cursor resumes from there on the next request.
+        keyed_events.sort(key=lambda item: item[0])
+        next_key = min(boundaries) if boundaries else None
+        if next_key is not None:
+            keyed_events = [item for item in keyed_events if item[0] <= next_key]
+        if len(keyed_events) > limit:
+            keyed_events = keyed_events[:limit]
+            next_key = keyed_events[-1][0]
+
+        response = JsonResponse([event for _, event in keyed_events], safe=False)
+        if next_key is not None:
+            response["X-Next-Cursor"] = _encode_calendar_cursor(next_key)
+        return response
 
     # Add event
     @method_decorator(csrf_exempt)
@@ -1687,15 +1948,15 @@ class EventsView(View):
         return JsonResponse({"status": "error"}, status=400)
 
 
-@login_required
-@user_passes_test(lambda u: getattr(u.profile, "role", "") in ["team_member", "staff", "admin"])
+@role_required("team_member", "staff", "admin")
 def schedule_overview(request):
     """Team members/lead/staff view: see shifts, add availability, request swaps."""
-    profile, _ = Profile.objects.get_or_create(user=request.user)
+    profile = profile_for(request)
     week_param = request.GET.get("week_start") or request.POST.get("week_start")
     week_start = _week_start_from_param(week_param)
     schedule_week = _ensure_schedule_week(week_start, profile if profile.role in ["staff", "admin"] else None)
-    semester = _active_semester_for_date(week_start)
+    calendar = semester_calendar.get_calendar()
+    semester = calendar.semester_for_date(week_start)
     week_end_date = schedule_week.week_start + timedelta(days=6)
 
     availability_form = AvailabilityForm(week=schedule_week, semester=semester)
@@ -1716,7 +1977,8 @@ def schedule_overview(request):
             time__date__gte=schedule_week.week_start,
             time__date__lt=schedule_week.week_start + timedelta(days=7),
         )
-        .select_related("level", "certification_type", "student__user")
+        .select_related("level", "certification_type")
+        .prefetch_related("seats__profile__user")
         .order_by("time", "name")
     )
     if profile.role not in ["staff", "admin"] and not schedule_week.is_published:
@@ -1743,51 +2005,38 @@ def schedule_overview(request):
                 availability.save()
                 availability_form.save_m2m()
                 # replicate across semester if requested
-                apply_semester = request.POST.get("apply_semester") == "1"
-                copied_weeks = 0
-                target_semester = semester or _active_semester_for_date(availability.start.date())
-                if apply_semester:
+                mode = request.POST.get("apply_semester")
+                mode = availability_replication.MODE_ADD if mode == "1" else mode
+                target_semester = semester or calendar.semester_for_date(availability.start.date())
+                if mode in (availability_replication.MODE_ADD, availability_replication.MODE_REPLACE):
                     if not target_semester:
                         messages.error(
                             request,
                             "Availability saved for this week, but no active semester is set to copy across.",
                         )
                         return redirect(f"{reverse('schedule')}?week_start={schedule_week.week_start}")
-                    current_start = availability.start
-                    current_end = availability.end
-                    delta = timedelta(days=7)
-                    cursor = schedule_week.week_start + delta
-                    while cursor <= target_semester.end_date:
-                        future_week = _ensure_schedule_week(cursor, profile if profile.role in ["staff", "admin"] else None)
-                        future_start = current_start + (cursor - schedule_week.week_start)
-                        future_end = current_end + (cursor - schedule_week.week_start)
-                        if _is_holiday(target_semester, future_start.date()):
-                            cursor += delta
-                            continue
-                        if not _within_open_hours(target_semester, future_start, future_end):
-                            cursor += delta
-                            continue
-                        future_availability, created = Availability.objects.get_or_create(
-                            profile=profile,
-                            week=future_week,
-                            start=future_start,
-                            end=future_end,
-                            defaults={"note": availability.note},
-                        )
-                        if created:
-                            copied_weeks += 1
-                            if availability.skills.exists():
-                                future_availability.skills.set(availability.skills.all())
-                        cursor += delta
-                    if copied_weeks:
+                    result = availability_replication.replicate(
+                        availability,
+                        target_semester,
+                        mode=mode,
+                        creator=profile if profile.role in ["staff", "admin"] else None,
+                    )
+                    skipped = []
+                    if result.skipped_closed:
+                        skipped.append(f"{result.skipped_closed} on holidays or outside open hours")
+                    if result.skipped_overlapping:
+                        skipped.append(f"{result.skipped_overlapping} overlapping your existing availability")
+                    skipped = f" Skipped {' and '.join(skipped)}." if skipped else ""
+                    if result.created:
+                        replaced = f" Replaced {result.removed} overlapping slot(s)." if result.removed else ""
                         messages.success(
                             request,
-                            f"Availability saved and applied to {copied_weeks} future week(s) in {target_semester.name}.",
+                            f"Availability saved and applied to {result.created} future week(s) in {target_semester.name}.{replaced}{skipped}",
                         )
                     else:
                         messages.success(
                             request,
-                            "Availability saved for this week. No future weeks were updated (holidays, closed hours, or duplicate slots skipped).",
+                            f"Availability saved for this week. No future weeks were updated.{skipped}",
                         )
                     return redirect(f"{reverse('schedule')}?week_start={schedule_week.week_start}")
                 messages.success(request, "Availability saved for this week.")
@@ -1812,6 +2061,16 @@ def schedule_overview(request):
             slot = get_object_or_404(
                 Availability, pk=request.POST.get("availability_id"), profile=profile, week=schedule_week
             )
+            target_semester = semester or calendar.semester_for_date(timezone.localtime(slot.start).date())
+            if request.POST.get("remove_future") == "1" and target_semester:
+                result = availability_replication.replicate(
+                    slot, target_semester, mode=availability_replication.MODE_REMOVE
+                )
+                slot.delete()
+                messages.success(
+                    request, f"Availability removed from this week and {result.removed} future week(s)."
+                )
+                return redirect(f"{reverse('schedule')}?week_start={schedule_week.week_start}")
             slot.delete()
             messages.success(request, "Availability removed.")
             return redirect(f"{reverse('schedule')}?week_start={schedule_week.week_start}")
@@ -1856,8 +2115,7 @@ def schedule_overview(request):
     return render(request, "pct/schedule_overview.html", context)
 
 
-@login_required
-@user_passes_test(lambda u: getattr(u.profile, "role", "") in ["staff", "admin"])
+@role_required("staff", "admin")
 def schedule_builder(request):
     """Staff/admin view: build weekly schedule, publish, review swaps."""
     profile = request.user.profile
@@ -1866,10 +2124,33 @@ def schedule_builder(request):
     schedule_week = _ensure_schedule_week(week_start, profile)
     shift_form = ShiftForm(week=schedule_week)
     training_form = TrainingForm(staff_user=request.user)
+    auto_assign = None
 
     if request.method == "POST":
         action = request.POST.get("action")
-        if action == "add_shift":
+        if action == "auto_assign_preview":
+            auto_assign = shift_solver.propose(schedule_week)
+            if not auto_assign.assignments and not auto_assign.unfilled:
+                messages.info(request, "Every shift this week is already assigned.")
+                auto_assign = None
+        elif action == "auto_assign_apply":
+            pairs = []
+            for value in request.POST.getlist("assign"):
+                shift_id, _, profile_id = value.partition(":")
+                if shift_id.isdigit() and profile_id.isdigit():
+                    pairs.append((int(shift_id), int(profile_id)))
+            applied, rejected = shift_solver.apply(schedule_week, pairs)
+            if applied:
+                messages.success(request, f"Assigned {applied} shift(s).")
+            if rejected:
+                messages.warning(
+                    request,
+                    f"{rejected} proposed assignment(s) no longer fit after recent changes. Preview again to refill them.",
+                )
+            if not applied and not rejected:
+                messages.info(request, "No assignments selected.")
+            return redirect(f"{reverse('schedule-builder')}?week_start={schedule_week.week_start}")
+        elif action == "add_shift":
             shift_form = ShiftForm(request.POST, week=schedule_week)
             if shift_form.is_valid():
                 shift = shift_form.save(commit=False)
@@ -1912,10 +2193,15 @@ def schedule_builder(request):
                     if training.time.date() < schedule_week.week_start or training.time.date() >= end_of_week:
                         training_form.add_error(None, "Training must be scheduled within the selected week.")
                     else:
-                        training.save()
-                        training_form.save_m2m()
-                        messages.success(request, "Training added to the schedule.")
-                        return redirect(f"{reverse('schedule-builder')}?week_start={schedule_week.week_start}")
+                        try:
+                            with transaction.atomic():
+                                training.save()
+                                training_form.save_m2m()
+                        except booking.BookingError as exc:
+                            training_form.add_error("students", str(exc))
+                        else:
+                            messages.success(request, "Training added to the schedule.")
+                            return redirect(f"{reverse('schedule-builder')}?week_start={schedule_week.week_start}")
             messages.error(request, "Please fix the errors to add the training.")
         elif action == "delete_training":
             training = get_object_or_404(
@@ -1957,18 +2243,12 @@ def schedule_builder(request):
 
             if new_status == TrainingCancellationRequest.Status.APPROVED:
                 training = request_obj.training
-                training.student = None
-                training.save(update_fields=["student"])
-                invited_entry = _invite_next_waitlisted(training)
+                invited = booking.release_training(training, request_obj.requester)
                 messages.success(
                     request,
                     f"Approved cancellation for {training.name}. Student unassigned.",
                 )
-                if invited_entry:
-                    messages.info(
-                        request,
-                        f"{invited_entry.profile.get_full_name()} has been invited to join {training.name}.",
-                    )
+                _announce_invitations(request, training, invited)
             else:
                 messages.info(request, "Cancellation request denied.")
             return redirect(f"{reverse('schedule-builder')}?week_start={schedule_week.week_start}")
@@ -2007,17 +2287,28 @@ def schedule_builder(request):
         .prefetch_related("skills")
         .order_by("start")
     )
-    week_shifts = (
+    week_shifts = list(
         Shift.objects.filter(schedule_week=schedule_week)
         .select_related("assigned_to__user")
         .prefetch_related("required_certifications")
         .order_by("start")
     )
-    week_trainings = (
-        Training.objects.select_related("student__user", "staff__user", "level", "certification_type")
+    week_coverage = coverage.WeekCoverage(schedule_week, week_shifts)
+    for shift in week_shifts:
+        shift.coverage_candidates = week_coverage.candidates_for(shift)
+    week_trainings = list(
+        Training.objects.select_related("staff__user", "level", "certification_type")
+        .prefetch_related("seats__profile__user")
         .filter(time__date__gte=schedule_week.week_start, time__date__lt=schedule_week.week_start + timedelta(days=7))
         .order_by("time", "name")
     )
+    # One batched check flags every shift and training that clashes with something in its room.
+    week_entries = week_shifts + week_trainings
+    week_slots = [room_timeline.shift_slot(shift) for shift in week_shifts] + [
+        room_timeline.training_slot(training) for training in week_trainings
+    ]
+    for entry, clashes in zip(week_entries, room_timeline.find_conflicts(week_slots)):
+        entry.room_conflicts = room_timeline.describe(clashes) if clashes else ""
     pending_swaps = (
         ShiftSwapRequest.objects.filter(shift__schedule_week=schedule_week, status=ShiftSwapRequest.Status.PENDING)
         .select_related("shift__assigned_to__user", "requester__user", "proposed_to__user")
@@ -2029,7 +2320,7 @@ def schedule_builder(request):
             training__time__date__gte=schedule_week.week_start,
             training__time__date__lte=schedule_week.week_start + timedelta(days=6),
         )
-        .select_related("training__student__user", "training__staff__user", "requester__user")
+        .select_related("training__staff__user", "requester__user")
         .order_by("-created_at")
     )
     assignable_profiles = Profile.objects.filter(role__in=["team_member", "student", "staff"]).select_related("user")
@@ -2044,6 +2335,7 @@ def schedule_builder(request):
         "week_trainings": week_trainings,
         "pending_swaps": pending_swaps,
         "pending_training_cancellations": pending_training_cancellations,
+        "auto_assign": auto_assign,
         "assignable_profiles": assignable_profiles,
         "cert_choices": cert_choices,
         "room_choices": RoomReservation.RoomChoices.choices,
@@ -2051,8 +2343,7 @@ def schedule_builder(request):
     return render(request, "pct/schedule_builder.html", context)
 
 
-@login_required
-@user_passes_test(lambda u: getattr(u.profile, "role", "") in ["staff", "admin"])
+@role_required("staff", "admin")
 def semester_settings(request):
     active_semester = Semester.objects.filter(is_active=True).order_by("-start_date").first()
     semester_form = SemesterForm()
@@ -2067,6 +2358,7 @@ def semester_settings(request):
                 semester = semester_form.save()
                 if semester.is_active:
                     Semester.objects.exclude(pk=semester.pk).update(is_active=False)
+                    semester_calendar.invalidate()
                 messages.success(request, "Semester saved.")
                 return redirect("semester-settings")
             messages.error(request, "Please fix the errors for the semester.")
@@ -2074,7 +2366,7 @@ def semester_settings(request):
             semester = get_object_or_404(Semester, pk=request.POST.get("semester_id"))
             Semester.objects.exclude(pk=semester.pk).update(is_active=False)
             semester.is_active = True
-            semester.save(update_fields=["is_active"])
+            semester.save(update_fields=["is_active"])  # signal invalidates the semester calendar
             messages.success(request, f"{semester.name} set as active.")
             return redirect("semester-settings")
         elif action == "unset_active":
@@ -2145,12 +2437,16 @@ class RegisterTrainingView(TrainingWaitlistBase):
         training = self.get_training(training_id)
         profile = self.get_profile(request)
 
-        if training.student:
+        try:
+            booking.claim_training(training, profile)
+        except booking.BookingError:
+            if training.seats.filter(profile=profile).exists():
+                messages.info(request, "You’re already registered for this training.")
+                return redirect("home")
             TrainingWaitlist.objects.get_or_create(training=training, profile=profile)
+            booking.fill_open_seats(training)
             messages.info(request, "Training is full. You’ve been added to the waitlist.")
         else:
-            training.student = profile
-            training.save()
             messages.success(request, "You’re registered for the training!")
 
         return redirect("home")
@@ -2161,15 +2457,9 @@ def cancel_training(request, training_id):
     training = get_object_or_404(Training, id=training_id)
     profile = request.user.profile
 
-    if training.student == profile:
-        training.student = None
-        training.save()
-        invited_entry = _invite_next_waitlisted(training)
-        if invited_entry:
-            messages.info(
-                request,
-                f"{invited_entry.profile.get_full_name()} has been invited to join {training.name}.",
-            )
+    if training.seats.filter(profile=profile).exists():
+        invited = booking.release_training(training, profile)
+        _announce_invitations(request, training, invited)
         messages.success(request, "Your reservation has been cancelled.")
     return redirect("home")
 
@@ -2181,13 +2471,12 @@ class ConfirmTrainingView(TrainingWaitlistBase):
         training = self.get_training(training_id)
         profile = self.get_profile(request, profile_id)
 
-        if not training.student:
-            training.student = profile
-            training.save()
-            TrainingWaitlist.objects.filter(training=training, profile=profile).update(status="accepted")
-            messages.success(request, "You’re now registered!")
-        else:
+        try:
+            booking.claim_training(training, profile)
+        except booking.BookingError:
             messages.error(request, "Sorry, the spot was already taken.")
+        else:
+            messages.success(request, "You’re now registered!")
 
         return redirect("home")
 
@@ -2195,7 +2484,12 @@ class ConfirmTrainingView(TrainingWaitlistBase):
 @method_decorator(login_required, name="dispatch")
 class DeclineTrainingView(TrainingWaitlistBase):
     def post(self, request, training_id, profile_id):
-        TrainingWaitlist.objects.filter(training_id=training_id, profile_id=profile_id).update(status="declined")
+        entry = TrainingWaitlist.objects.filter(training_id=training_id, profile_id=profile_id).first()
+        if entry:
+            try:
+                booking.respond_to_invitation(entry, accept=False)
+            except booking.BookingError:
+                TrainingWaitlist.objects.filter(pk=entry.pk).update(status="declined")
         messages.info(request, "You declined the training invitation.")
         return redirect("home")
 
@@ -2219,22 +2513,13 @@ def leave_waitlist(request, training_id):
     training = get_object_or_404(Training, id=training_id)
     profile = request.user.profile
 
-    entry = TrainingWaitlist.objects.filter(training=training, profile=profile).first()
-    if not entry:
+    left, invited = booking.leave_waitlist(training, profile)
+    if not left:
         messages.info(request, "You are not on the waitlist for this training.")
         return redirect("home")
 
-    was_invited = entry.status == "invited"
-    entry.delete()
     messages.success(request, f"You have left the waitlist for {training.name}.")
-
-    if was_invited:
-        next_entry = _invite_next_waitlisted(training)
-        if next_entry:
-            messages.info(
-                request,
-                f"{next_entry.profile.get_full_name()} has been invited to join {training.name}.",
-            )
+    _announce_invitations(request, training, invited)
 
     return redirect("home")
 
@@ -2247,28 +2532,21 @@ def respond_invitation(request, waitlist_id):
         return redirect("home")
 
     response = request.POST.get("response")
+    if response not in ("accept", "decline"):
+        return redirect("home")
+
+    training = entry.training
+    try:
+        invited = booking.respond_to_invitation(entry, accept=response == "accept")
+    except booking.BookingError as exc:
+        messages.error(request, str(exc))
+        return redirect("home")
+
     if response == "accept":
-        # Assign training to user if still available
-        training = entry.training
-        if not training.is_full():
-            training.student = entry.profile
-            training.save()
-            entry.status = "accepted"
-            messages.success(request, f"You are now booked for {training.name}.")
-        else:
-            messages.error(request, "Sorry, the training is already full.")
-    elif response == "decline":
-        entry.status = "declined"
-        messages.info(request, f"You declined the invitation for {entry.training.name}.")
-
-    entry.save()
-    if entry.status == "declined":
-        invited_entry = _invite_next_waitlisted(entry.training)
-        if invited_entry:
-            messages.info(
-                request,
-                f"{invited_entry.profile.get_full_name()} has been invited to join {entry.training.name}.",
-            )
+        messages.success(request, f"You are now booked for {training.name}.")
+    else:
+        messages.info(request, f"You declined the invitation for {training.name}.")
+        _announce_invitations(request, training, invited)
     return redirect("home")
 
 @login_required
@@ -2284,25 +2562,18 @@ def user_home(request):
     )
 
     # All upcoming trainings (not just ones booked by this user)
-    upcoming_trainings = (
-        Training.objects.filter(time__gte=now)
-        .select_related("staff", "level")
-        .prefetch_related("waitlist__profile")
-        .order_by("time")
+    upcoming_trainings = list(
+        training_eligibility.for_profile(
+            Training.objects.filter(time__gte=now)
+            .select_related("staff__user", "level", "certification_type")
+            .order_by("time"),
+            profile,
+        )
     )
     for training in upcoming_trainings:
-        has_invited_hold = False
-        is_waitlisted = False
-        waitlist_status = None
-        for entry in training.waitlist.all():
-            if entry.status == "invited":
-                has_invited_hold = True
-            if entry.profile_id == profile.id:
-                is_waitlisted = True
-                waitlist_status = entry.status
-        training.is_full_for_display = bool(training.student_id or has_invited_hold)
-        training.is_waitlisted_for_user = is_waitlisted
-        training.waitlist_status_for_user = waitlist_status
+        training.is_full_for_display = training.is_full()
+        training.is_waitlisted_for_user = training.waitlist_status is not None
+        training.waitlist_status_for_user = training.waitlist_status
 
     # Past trainings
     past_trainings = (
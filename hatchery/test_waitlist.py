@@ -11,6 +11,7 @@ from django.contrib.auth.models import User
 from django.urls import reverse
 from django.contrib.messages import get_messages
 from django.utils import timezone
+from pct import booking
 from pct.models import (
     Training,
     Profile,
@@ -76,8 +77,7 @@ class TrainingWaitlistFlowTest(TestCase):
     def test_register_cancel_invite_flow(self):
         # Alice registers
         self.alice_client.post(reverse("register_training", args=[self.training.id]))
-        self.training.refresh_from_db()
-        self.assertEqual(self.training.student, self.alice_profile)
+        self.assertEqual(list(self.training.students.all()), [self.alice_profile])
 
         # Bob joins waitlist
         self.bob_client.get(reverse("join_waitlist", args=[self.training.id]))
@@ -88,19 +88,19 @@ class TrainingWaitlistFlowTest(TestCase):
         self.alice_client.post(reverse("cancel_training", args=[self.training.id]))
         self.training.refresh_from_db()
         waitlist_entry.refresh_from_db()
-        self.assertIsNone(self.training.student)
+        self.assertFalse(self.training.seats.exists())
         self.assertEqual(waitlist_entry.status, "invited")
 
         # Bob confirms
         self.bob_client.post(reverse("confirm_training", args=[self.training.id, self.bob_profile.id]))
-        self.training.refresh_from_db()
         waitlist_entry.refresh_from_db()
-        self.assertEqual(self.training.student, self.bob_profile)
+        self.assertEqual(list(self.training.students.all()), [self.bob_profile])
         self.assertEqual(waitlist_entry.status, "accepted")
 
     def test_decline_invitation(self):
         # Bob invited
-        TrainingWaitlist.objects.create(training=self.training, profile=self.bob_profile, status="invited")
+        TrainingWaitlist.objects.create(training=self.training, profile=self.bob_profile)
+        booking.fill_open_seats(self.training)
 
         # Bob declines
         self.bob_client.post(reverse("decline_training", args=[self.training.id, self.bob_profile.id]))
@@ -108,8 +108,7 @@ class TrainingWaitlistFlowTest(TestCase):
         self.assertEqual(entry.status, "declined")
 
         # Slot empty
-        self.training.refresh_from_db()
-        self.assertIsNone(self.training.student)
+        self.assertFalse(self.training.seats.exists())
 
         # Charlie joins waitlist
         self.charlie_client.get(reverse("join_waitlist", args=[self.training.id]))
@@ -126,8 +125,8 @@ class TrainingWaitlistFlowTest(TestCase):
     def test_user_home_shows_waitlist_button(self):
         # Training is full and scheduled in the future
         self.training.time = timezone.now() + timezone.timedelta(days=1)
-        self.training.student = self.alice_profile
         self.training.save()
+        booking.claim_training(self.training, self.alice_profile)
 
         response = self.bob_client.get(reverse("user_home"), follow=True)
 
@@ -144,8 +143,8 @@ class TrainingWaitlistFlowTest(TestCase):
     def test_staff_home_shows_waitlist_button(self):
         # Training is full and scheduled in the future
         self.training.time = timezone.now() + timezone.timedelta(days=1)
-        self.training.student = self.alice_profile
         self.training.save()
+        booking.claim_training(self.training, self.alice_profile)
 
         response = self.staff_client.get(reverse("user_home"), follow=True)
 